@@ -1,5 +1,6 @@
 import json
 import os
+import time
 
 import uvicorn
 from fastapi import FastAPI, Request
@@ -7,13 +8,29 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from fastapi.templating import Jinja2Templates
 
+from scania.blob_storage_operations.client_registry import close_client_registry
 from scania.model.load_production_model import Load_Prod_Model
+from scania.mongo_db_operations.mongo_client import (
+    close_mongo_client,
+    get_mongo_client_registry,
+)
+from scania.model.model_cache import get_prod_model_cache
 from scania.model.prediction_from_model import Prediction
 from scania.model.training_model import Train_Model
 from scania.validation_insertion.prediction_validation_insertion import Pred_Validation
 from scania.validation_insertion.train_validation_insertion import Train_Validation
 from utils.create_containers import Azure_Container
+from utils.log_sink import close_log_sink
+from utils.metrics import (
+    REQUEST_LATENCY,
+    get_metrics_output,
+    mark_process_dead,
+    track_job,
+    track_stage,
+)
 from utils.read_params import read_params
+from utils.run_context import run_context
+from utils.tracer import export_tracer, get_tracer
 
 os.putenv("LANG", "en_US.UTF-8")
 os.putenv("LC_ALL", "en_US.UTF-8")
@@ -34,6 +51,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+timed_routes = set(config["metrics"]["routes"])
+
+
+@app.middleware("http")
+async def time_request(request: Request, call_next):
+    start = time.perf_counter()
+
+    try:
+        return await call_next(request)
+
+    finally:
+        if request.url.path in timed_routes:
+            REQUEST_LATENCY.labels(route=request.url.path).observe(
+                time.perf_counter() - start
+            )
+
+
+@app.on_event("startup")
+async def warm_model_cache():
+    get_prod_model_cache().refresh_in_background()
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    close_client_registry()
+
+    export_tracer()
+
+    close_log_sink()
+
+    close_mongo_client()
+
+    mark_process_dead()
+
 
 @app.get("/")
 async def index(request: Request):
@@ -57,46 +108,89 @@ async def create_containers():
 
 @app.get("/train")
 async def trainRouteClient():
-    try:
-        raw_data_train_container_name = config["container"]["scania_raw_data"]
+    with run_context("train") as run_id:
+        try:
+            raw_data_train_container_name = config["container"]["scania_raw_data"]
 
-        train_val = Train_Validation(container_name=raw_data_train_container_name)
+            with track_job("train"):
+                train_val = Train_Validation(
+                    container_name=raw_data_train_container_name
+                )
 
-        train_val.training_validation()
+                with track_stage("train_validation"):
+                    train_val.training_validation()
 
-        train_model = Train_Model()
+                train_model = Train_Model()
 
-        num_clusters = train_model.training_model()
+                with track_stage("train_model"):
+                    num_clusters = train_model.training_model()
 
-        load_prod_model = Load_Prod_Model(num_clusters=num_clusters)
+                load_prod_model = Load_Prod_Model(num_clusters=num_clusters)
 
-        load_prod_model.load_production_model()
+                with track_stage("load_prod_model"):
+                    load_prod_model.load_production_model()
 
-    except Exception as e:
-        return Response(f"Error Occurred : {e}")
+        except Exception as e:
+            return Response(f"Error Occurred : {e}", headers={"X-Run-Id": run_id})
 
-    return Response("Training successfull!!")
+        return Response("Training successfull!!", headers={"X-Run-Id": run_id})
 
 
 @app.get("/predict")
 async def predictRouteClient():
-    try:
-        raw_data_pred_container_name = config["container"]["scania_raw_data_container"]
+    with run_context("predict") as run_id:
+        try:
+            raw_data_pred_container_name = config["container"][
+                "scania_raw_data_container"
+            ]
 
-        pred_val = Pred_Validation(raw_data_pred_container_name)
+            with track_job("predict"):
+                pred_val = Pred_Validation(raw_data_pred_container_name)
 
-        pred_val.prediction_validation()
+                with track_stage("pred_validation"):
+                    pred_val.prediction_validation()
 
-        pred = Prediction()
+                pred = Prediction()
 
-        container, filename, json_Predictions = pred.predict_from_model()
+                with track_stage("prediction"):
+                    container, filename, json_Predictions = pred.predict_from_model()
 
-        return Response(
-            f"Prediction file created in {container} container with filename as {filename}, and few of the Predictions are {str(json.loads(json_Predictions))}"
-        )
+            return Response(
+                f"Prediction file created in {container} container with filename as {filename}, and few of the Predictions are {str(json.loads(json_Predictions))}",
+                headers={"X-Run-Id": run_id},
+            )
 
-    except Exception as e:
-        return Response(f"Error Occurred : {e}")
+        except Exception as e:
+            return Response(f"Error Occurred : {e}", headers={"X-Run-Id": run_id})
+
+
+@app.get("/metrics")
+async def metrics():
+    data, content_type = get_metrics_output()
+
+    return Response(data, media_type=content_type)
+
+
+@app.get("/stats/model_cache")
+async def model_cache_stats():
+    return Response(
+        json.dumps(get_prod_model_cache().get_stats()), media_type="application/json"
+    )
+
+
+@app.get("/stats/mongo_client")
+async def mongo_client_stats():
+    return Response(
+        json.dumps(get_mongo_client_registry().get_stats()),
+        media_type="application/json",
+    )
+
+
+@app.get("/stats/spans")
+async def span_stats():
+    return Response(
+        json.dumps(get_tracer().get_histograms()), media_type="application/json"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,351 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from azure.core import MatchConditions
+from utils.metrics import BLOB_BYTES
+from utils.read_params import read_params
+
+
+class Cached_Blob_Object:
+    """
+    Description :   This class shall be used as a file backed stand in for a blob download, exposing the same
+                    readall and chunks methods
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, path, name, etag, size, chunk_size):
+        self.path = path
+
+        self.name = name
+
+        self.etag = etag
+
+        self.size = size
+
+        self.chunk_size = chunk_size
+
+    def readall(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def chunks(self):
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+
+                if not chunk:
+                    break
+
+                yield chunk
+
+    def __repr__(self):
+        return f"Cached_Blob_Object({self.name}, {self.etag})"
+
+
+class Blob_Cache:
+    """
+    Description :   This class shall be used for caching blob contents on local disk keyed by container, blob
+                    and etag, evicting the least recently used files above the byte budget of the cache dir
+                    shared by the processes of the host
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.enabled = self.config["blob_cache"]["enabled"]
+
+        self.cache_dir = self.config["blob_cache"]["dir"]
+
+        self.max_bytes = self.config["blob_cache"]["max_bytes"]
+
+        self.max_object_size = self.config["blob_cache"]["max_object_size"]
+
+        self.ttl = self.config["blob_cache"]["ttl"]
+
+        self.validate = self.config["blob_cache"]["validate"]
+
+        self.chunk_size = self.config["blob_cache"]["chunk_size"]
+
+        self.entries = OrderedDict()
+
+        self.total_bytes = 0
+
+        self.lock = threading.RLock()
+
+        self.stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "evictions": 0}
+
+        if self.enabled is True:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            self.load_index()
+
+    def get_key(self, container_name, blob_name):
+        return hashlib.sha1(f"{container_name}/{blob_name}".encode()).hexdigest()
+
+    def get_path(self, key, etag):
+        return os.path.join(self.cache_dir, key + "." + etag.strip('"'))
+
+    def is_writer_alive(self, tmp_name):
+        try:
+            pid = int(tmp_name.rsplit(".", 3)[1])
+
+        except (IndexError, ValueError):
+            return False
+
+        try:
+            os.kill(pid, 0)
+
+        except ProcessLookupError:
+            return False
+
+        except PermissionError:
+            return True
+
+        return True
+
+    def scan(self):
+        """
+        Method Name :   scan
+        Description :   This method returns the access time, name, path and size of every file in the cache dir,
+                        written by any process sharing it, oldest access first, and removes the partial
+                        downloads left by processes which are no longer running
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        found = []
+
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+
+                    if entry.name.endswith(".tmp"):
+                        if not self.is_writer_alive(entry.name):
+                            os.remove(entry.path)
+
+                        continue
+
+                    stat = entry.stat()
+
+                except FileNotFoundError:
+                    continue
+
+                found.append((stat.st_atime, entry.name, entry.path, stat.st_size))
+
+        return sorted(found)
+
+    def load_index(self):
+        """
+        Method Name :   load_index
+        Description :   This method rebuilds the in memory index from the cache dir, oldest access first, the
+                        entries are validated on first use since their blobs may have changed since
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        for _, name, path, size in self.scan():
+            key, _, etag = name.partition(".")
+
+            self.entries[key] = {
+                "etag": etag,
+                "path": path,
+                "size": size,
+                "checked": float("-inf"),
+            }
+
+        self.evict()
+
+    def evict(self):
+        """
+        Method Name :   evict
+        Description :   This method removes the least recently used files of the cache dir until the files of
+                        every process sharing it fit in the byte budget, keeping the latest one
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        found = self.scan()
+
+        total_bytes, removed = sum(size for _, _, _, size in found), set()
+
+        for _, _, path, size in found[:-1]:
+            if total_bytes <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+
+            except FileNotFoundError:
+                pass
+
+            total_bytes -= size
+
+            removed.add(path)
+
+            self.stats["evictions"] += 1
+
+        for key, entry in list(self.entries.items()):
+            if entry["path"] in removed:
+                del self.entries[key]
+
+        self.total_bytes = total_bytes
+
+    def remove_entry(self, entry):
+        try:
+            os.remove(entry["path"])
+
+        except FileNotFoundError:
+            pass
+
+    def get_hit(self, key, entry, blob_name):
+        self.entries.move_to_end(key)
+
+        try:
+            os.utime(entry["path"])
+
+        except FileNotFoundError:
+            pass
+
+        self.stats["hits"] += 1
+
+        self.stats["bytes_saved"] += entry["size"]
+
+        return Cached_Blob_Object(
+            path=entry["path"],
+            name=blob_name,
+            etag=entry["etag"],
+            size=entry["size"],
+            chunk_size=self.chunk_size,
+        )
+
+    def get(self, blob_client, container_name, blob_name):
+        """
+        Method Name :   get
+        Description :   This method returns the cached blob when its etag is unchanged, validated with a head
+                        request or within the ttl, otherwise downloads it into the cache
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        key = self.get_key(container_name, blob_name)
+
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if (
+                entry is not None
+                and self.validate == "ttl"
+                and now - entry["checked"] < self.ttl
+                and os.path.exists(entry["path"])
+            ):
+                return self.get_hit(key, entry, blob_name)
+
+        props = blob_client.get_blob_properties()
+
+        etag = props.etag.strip('"')
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if (
+                entry is not None
+                and entry["etag"] == etag
+                and os.path.exists(entry["path"])
+            ):
+                entry["checked"] = now
+
+                return self.get_hit(key, entry, blob_name)
+
+            self.stats["misses"] += 1
+
+        if props.size > self.max_object_size:
+            BLOB_BYTES.labels(direction="in").inc(props.size)
+
+            return blob_client.download_blob()
+
+        path = self.get_path(key, etag)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        downloader = blob_client.download_blob(
+            etag=props.etag, match_condition=MatchConditions.IfNotModified
+        )
+
+        size = 0
+
+        with open(tmp_path, "wb") as f:
+            for chunk in downloader.chunks():
+                size += f.write(chunk)
+
+        os.replace(tmp_path, path)
+
+        BLOB_BYTES.labels(direction="in").inc(size)
+
+        with self.lock:
+            old_entry = self.entries.pop(key, None)
+
+            if old_entry is not None and old_entry["path"] != path:
+                self.remove_entry(old_entry)
+
+            self.entries[key] = {
+                "etag": etag,
+                "path": path,
+                "size": size,
+                "checked": now,
+            }
+
+            self.evict()
+
+        return Cached_Blob_Object(
+            path=path,
+            name=blob_name,
+            etag=etag,
+            size=size,
+            chunk_size=self.chunk_size,
+        )
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+
+            stats["entries"] = len(self.entries)
+
+            stats["bytes_cached"] = self.total_bytes
+
+            return stats
+
+
+_cache = None
+
+_cache_lock = threading.Lock()
+
+
+def get_blob_cache():
+    """
+    Method Name :   get_blob_cache
+    Description :   This method returns the process wide blob cache
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = Blob_Cache()
+
+        return _cache
@@ -0,0 +1,174 @@
+import gzip
+import zlib
+from io import BufferedReader, BytesIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_MAGIC = {"gzip": b"\x1f\x8b", "zstd": b"\x28\xb5\x2f\xfd"}
+
+CODEC_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def check_codec(codec):
+    if codec not in CODEC_MAGIC:
+        raise Exception(f"{codec} is not a supported codec")
+
+    if codec == "zstd" and zstandard is None:
+        raise Exception("zstd codec needs the zstandard package to be installed")
+
+
+def get_codec_from_name(file_name):
+    for ext, codec in CODEC_EXTENSIONS.items():
+        if file_name.endswith(ext):
+            return codec
+
+    return None
+
+
+def detect_codec(head):
+    for codec, magic in CODEC_MAGIC.items():
+        if head.startswith(magic):
+            return codec
+
+    return None
+
+
+def peek_head(data, size=4):
+    """
+    Method Name :   peek_head
+    Description :   This method returns the first bytes of upload data without consuming them, or None when
+                    the data is an iterator which cannot be peeked
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data[:size])
+
+    if hasattr(data, "peek"):
+        return data.peek(size)[:size]
+
+    if hasattr(data, "seekable") and data.seekable():
+        pos = data.tell()
+
+        head = data.read(size)
+
+        data.seek(pos)
+
+        return head
+
+    return None
+
+
+def get_compressor(codec, level):
+    check_codec(codec)
+
+    if codec == "gzip":
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+def get_decompressor(codec):
+    check_codec(codec)
+
+    if codec == "gzip":
+        return zlib.decompressobj(31)
+
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def decompress_head(content):
+    """
+    Method Name :   decompress_head
+    Description :   This method decompresses as much as possible of the first bytes of a compressed blob,
+                    content which is not compressed is returned as it is
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    codec = detect_codec(content[:4])
+
+    if codec is None:
+        return content
+
+    return get_decompressor(codec).decompress(content)
+
+
+def open_decoded_stream(stream, buffer_size=1024 * 1024):
+    """
+    Method Name :   open_decoded_stream
+    Description :   This method wraps a buffered blob stream in a streaming decompressor when its first bytes
+                    carry a codec magic number, content which is not compressed is read as it is
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    codec = detect_codec(stream.peek(4)[:4])
+
+    if codec is None:
+        return stream
+
+    check_codec(codec)
+
+    if codec == "gzip":
+        return BufferedReader(gzip.GzipFile(fileobj=stream, mode="rb"), buffer_size)
+
+    return BufferedReader(
+        zstandard.ZstdDecompressor().stream_reader(stream), buffer_size
+    )
+
+
+class Compressed_Stream:
+    """
+    Description :   This class shall be used for compressing the data of an upload chunk by chunk, counting the
+                    bytes before and after compression
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, data, codec, level, chunk_size):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = BytesIO(data)
+
+        self.data = data
+
+        self.codec = codec
+
+        self.level = level
+
+        self.chunk_size = chunk_size
+
+        self.bytes_in = 0
+
+        self.bytes_out = 0
+
+        check_codec(codec)
+
+    def __iter__(self):
+        compressor = get_compressor(self.codec, self.level)
+
+        while True:
+            chunk = self.data.read(self.chunk_size)
+
+            if not chunk:
+                break
+
+            self.bytes_in += len(chunk)
+
+            out = compressor.compress(chunk)
+
+            if out:
+                self.bytes_out += len(out)
+
+                yield out
+
+        out = compressor.flush()
+
+        self.bytes_out += len(out)
+
+        yield out
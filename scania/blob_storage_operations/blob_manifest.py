@@ -0,0 +1,320 @@
+import json
+import threading
+import time
+
+from azure.core import MatchConditions
+from utils.read_params import read_params
+
+
+def diff_manifests(old_entries, new_entries):
+    """
+    Method Name :   diff_manifests
+    Description :   This method compares two manifests by etag and returns the added, changed and removed
+                    blob names
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    added = [name for name in new_entries if name not in old_entries]
+
+    changed = [
+        name
+        for name in new_entries
+        if name in old_entries
+        and new_entries[name]["etag"] != old_entries[name]["etag"]
+    ]
+
+    removed = [name for name in old_entries if name not in new_entries]
+
+    return {
+        "added": sorted(added),
+        "changed": sorted(changed),
+        "removed": sorted(removed),
+    }
+
+
+class Blob_Manifest:
+    """
+    Description :   This class shall be used for keeping a json index of the blobs in each tracked folder,
+                    stored next to them in the container and updated with conditional writes, so that
+                    listing a tracked folder costs one etag check instead of a paged listing, a manifest
+                    older than the max age is rebuilt from a listing to pick up writes made around it
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, backend):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.backend = backend
+
+        self.enabled = self.config["blob_manifest"]["enabled"]
+
+        self.manifest_dir = self.config["blob_manifest"]["dir"]
+
+        self.max_retries = self.config["blob_manifest"]["max_retries"]
+
+        self.max_age = self.config["blob_manifest"]["max_age"]
+
+        self.folders = self.config["blob_manifest"]["folders"] or {}
+
+        self.manifests = {}
+
+        self.lock = threading.RLock()
+
+    def get_manifest_name(self, folder):
+        return self.manifest_dir + "/" + folder + ".json"
+
+    def get_folder(self, blob_name):
+        if self.enabled is not True:
+            return None
+
+        for folder in sorted(self.folders, key=len, reverse=True):
+            if blob_name.startswith(folder + "/"):
+                return folder
+
+        return None
+
+    def get_entry(self, blob_name, size, etag, last_modified):
+        return {
+            "size": size,
+            "etag": etag,
+            "last_modified": last_modified.isoformat()
+            if hasattr(last_modified, "isoformat")
+            else last_modified,
+            "stage": self.folders.get(self.get_folder(blob_name)),
+        }
+
+    def build(self, container_name, folder):
+        entries = {}
+
+        for page in self.backend.list_pages(
+            container_name=container_name, prefix=folder + "/"
+        ):
+            for blob in page:
+                entries[blob["name"]] = self.get_entry(
+                    blob_name=blob["name"],
+                    size=blob["size"],
+                    etag=blob["etag"],
+                    last_modified=blob["last_modified"],
+                )
+
+        return entries
+
+    def is_stale(self, built_at):
+        return self.max_age is not None and time.time() - built_at > self.max_age
+
+    def fetch(self, container_name, folder):
+        """
+        Method Name :   fetch
+        Description :   This method reads the manifest of the folder along with its etag and build time,
+                        building it from a listing and storing it when the folder has no manifest yet or when
+                        it is older than the max age
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        for _ in range(self.max_retries):
+            data, etag = self.backend.read_versioned(
+                container_name=container_name,
+                blob_name=self.get_manifest_name(folder),
+            )
+
+            if data is not None:
+                manifest = json.loads(data)
+
+                built_at = manifest.get("built_at", 0)
+
+                if not self.is_stale(built_at):
+                    return manifest["entries"], etag, built_at
+
+            entries, built_at = self.build(container_name, folder), time.time()
+
+            etag = self.save(container_name, folder, entries, etag, built_at)
+
+            if etag is not None:
+                return entries, etag, built_at
+
+        raise Exception(
+            f"Could not create manifest of {folder} folder in {container_name}"
+        )
+
+    def save(self, container_name, folder, entries, etag, built_at):
+        data = json.dumps(
+            {"folder": folder, "built_at": built_at, "entries": entries},
+            separators=(",", ":"),
+        ).encode()
+
+        if etag is None:
+            conditions = {"match_condition": MatchConditions.IfMissing}
+
+        else:
+            conditions = {
+                "etag": etag,
+                "match_condition": MatchConditions.IfNotModified,
+            }
+
+        result = self.backend.put(
+            container_name=container_name,
+            blob_name=self.get_manifest_name(folder),
+            data=data,
+            length=len(data),
+            match_conditions=conditions,
+        )
+
+        return None if result is None else result["etag"]
+
+    def load(self, container_name, folder, validate=True):
+        """
+        Method Name :   load
+        Description :   This method returns the manifest of the folder, the copy kept in memory is served only
+                        while it is within the max age and, when validate is set, its etag still matches the
+                        stored manifest, so that writes made by other instances are seen on the next read
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        key = (container_name, folder)
+
+        with self.lock:
+            manifest = self.manifests.get(key)
+
+        if manifest is not None and not self.is_stale(manifest[2]):
+            if validate is not True:
+                return manifest
+
+            etag = self.backend.read_etag(
+                container_name=container_name,
+                blob_name=self.get_manifest_name(folder),
+            )
+
+            if etag == manifest[1]:
+                return manifest
+
+        manifest = self.fetch(container_name, folder)
+
+        with self.lock:
+            self.manifests[key] = manifest
+
+        return manifest
+
+    def drop(self, container_name, folder):
+        """
+        Method Name :   drop
+        Description :   This method forgets the manifest of the folder and deletes it from the container, so that
+                        the next read builds it again from a listing
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            self.manifests.pop((container_name, folder), None)
+
+        try:
+            self.backend.delete(
+                container_name=container_name,
+                blob_names=[self.get_manifest_name(folder)],
+            )
+
+        except Exception:
+            pass
+
+    def list_pages(self, container_name, prefix, results_per_page=None):
+        """
+        Method Name :   list_pages
+        Description :   This method returns pages of blob properties under the prefix from the manifest, or
+                        None when the prefix is not within a tracked folder
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        folder = self.get_folder(prefix)
+
+        if folder is None:
+            return None
+
+        entries, _, _ = self.load(container_name, folder)
+
+        blobs = [
+            {
+                "name": name,
+                "size": entry["size"],
+                "etag": entry["etag"],
+                "last_modified": entry["last_modified"],
+                "metadata": None,
+                "is_prefix": False,
+            }
+            for name, entry in sorted(entries.items())
+            if name.startswith(prefix)
+        ]
+
+        page_size = max(len(blobs), 1) if results_per_page is None else results_per_page
+
+        return [blobs[idx : idx + page_size] for idx in range(0, len(blobs), page_size)]
+
+    def update(self, container_name, changes):
+        """
+        Method Name :   update
+        Description :   This method applies the changed entries, None for a deleted blob, to the manifests of
+                        their folders, retrying on a concurrent update and dropping the manifest when it
+                        cannot be updated for any reason so that it is rebuilt on the next read, the blobs
+                        are already written so a failure here is not raised to the caller
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        by_folder = {}
+
+        for blob_name, entry in changes.items():
+            folder = self.get_folder(blob_name)
+
+            if folder is not None:
+                by_folder.setdefault(folder, {})[blob_name] = entry
+
+        for folder, folder_changes in by_folder.items():
+            try:
+                updated = self.apply(container_name, folder, folder_changes)
+
+            except Exception:
+                updated = False
+
+            if not updated:
+                self.drop(container_name, folder)
+
+    def apply(self, container_name, folder, changes):
+        key = (container_name, folder)
+
+        for _ in range(self.max_retries):
+            entries, etag, built_at = self.load(container_name, folder, validate=False)
+
+            entries = dict(entries)
+
+            for blob_name, entry in changes.items():
+                if entry is None:
+                    entries.pop(blob_name, None)
+
+                else:
+                    entries[blob_name] = entry
+
+            new_etag = self.save(container_name, folder, entries, etag, built_at)
+
+            with self.lock:
+                if new_etag is not None:
+                    self.manifests[key] = (entries, new_etag, built_at)
+
+                    return True
+
+                self.manifests.pop(key, None)
+
+        return False
+
+    def get_entries(self, container_name, folder):
+        if self.get_folder(folder + "/") != folder:
+            return None
+
+        entries, _, _ = self.load(container_name, folder)
+
+        return dict(entries)
@@ -1,21 +1,38 @@
+import csv
 import json
 import os
-import pickle
-from io import StringIO
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO, StringIO
+from uuid import uuid4
 
+import numpy as np
 import pandas as pd
-from azure.storage.blob import BlobServiceClient, ContainerClient
-from utils.logger import App_Logger
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError
+from scania.blob_storage_operations.blob_codec import (
+    Compressed_Stream,
+    decompress_head,
+    detect_codec,
+    get_codec_from_name,
+    open_decoded_stream,
+    peek_head,
+)
+from scania.blob_storage_operations.blob_manifest import Blob_Manifest, diff_manifests
+from scania.blob_storage_operations.blob_stream import open_blob_stream
+from scania.blob_storage_operations.storage_backend import get_storage_backend
+from utils.logger import App_Logger, instrumented
+from utils.metrics import BLOB_BYTES
+from utils.model_artifact import dump_artifact, load_artifact_bytes, load_artifact_file
 from utils.model_utils import Model_Utils
 from utils.read_params import read_params
+from utils.run_context import submit_with_context
 
 
 class Blob_Operation:
     def __init__(self):
         self.config = read_params()
 
-        self.connection_string = os.environ["AZURE_CONN_STR"]
-
         self.class_name = self.__class__.__name__
 
         self.log_writer = App_Logger()
@@ -24,57 +41,62 @@ class Blob_Operation:
 
         self.model_save_format = self.config["model_utils"]["save_format"]
 
-    def get_container_client(self, container_name, db_name, collection_name):
-        method_name = self.get_container_client.__name__
+        self.model_legacy_save_format = self.config["model_utils"]["legacy_save_format"]
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
+        self.model_compress = self.config["model_utils"]["compress"]
 
-        try:
-            container_client = ContainerClient.from_connection_string(
-                conn_str=self.connection_string, container_name=container_name
-            )
+        self.model_mmap_mode = self.config["model_utils"]["mmap_mode"]
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got container client from connection string",
-            )
+        self.backend = get_storage_backend()
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.manifest = Blob_Manifest(backend=self.backend)
 
-            return container_client
+        self.download_workers = self.config["blob_download"]["max_workers"]
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.header_probe_bytes = self.config["blob_download"]["header_probe_bytes"]
+
+        self.header_max_bytes = self.config["blob_download"]["header_max_bytes"]
+
+        self.upload_in_memory = self.config["blob_upload"]["in_memory"]
+
+        self.batch_workers = self.config["blob_batch"]["max_workers"]
+
+        self.parquet_compression = self.config["data_format"]["compression"]
+
+        self.float_type = self.config["data_format"]["float_type"]
+
+        self.category_cols = self.config["data_format"]["category_cols"]
+
+        self.na_values = self.config["data_format"]["na_values"]
+
+        self.codec = self.config["blob_codec"]["codec"]
+
+        self.codec_level = self.config["blob_codec"]["level"]
+
+        self.codec_extensions = tuple(self.config["blob_codec"]["extensions"])
+
+        self.codec_chunk_size = self.config["blob_codec"]["chunk_size"]
+
+    @instrumented()
+    def get_container_client(self, container_name, db_name, collection_name):
+        container_client = self.backend.get_container_client(
+            container_name=container_name
+        )
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info="Got container client from client registry",
+        )
+
+        return container_client
 
     def get_blob_client(self, blob_file_name, container_name, db_name, collection_name):
         method_name = self.get_blob_client.__name__
 
         try:
-            client = BlobServiceClient.from_connection_string(
-                conn_str=self.connection_string
-            )
-
-            blob_client = client.get_blob_client(
-                container=container_name, blob=blob_file_name
+            blob_client = self.backend.get_blob_client(
+                container_name=container_name, blob_name=blob_file_name
             )
 
             return blob_client
@@ -88,245 +110,193 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def create_container(self, container_name, db_name, collection_name):
-        method_name = self.create_container.__name__
+    @instrumented()
+    def get_client_stats(self, db_name, collection_name):
+        stats = self.backend.get_client_stats()
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Got {stats} as blob client stats",
         )
 
-        try:
-            client = ContainerClient.from_connection_string(
-                conn_str=self.connection_string,
-                container_name=container_name,
-            )
+        return stats
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got container client from connection string",
-            )
+    @instrumented()
+    def get_cache_stats(self, db_name, collection_name):
+        stats = self.backend.get_cache_stats()
 
-            if client.exists() is True:
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"{container_name} container already exists",
-                )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Got {stats} as blob cache stats",
+        )
 
-            else:
-                client.create_container()
+        return stats
 
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"{container_name} container created",
-                )
+    @instrumented()
+    def create_container(self, container_name, db_name, collection_name):
+        created = self.backend.create_container(container_name=container_name)
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+        if created is False:
+            self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
+                log_info=f"{container_name} container already exists",
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
+        else:
+            self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
+                log_info=f"{container_name} container created",
             )
 
+    @instrumented()
     def delete_container(self, container_name, db_name, collection_name):
-        method_name = self.delete_container.__name__
+        self.backend.delete_container(container_name=container_name)
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"{container_name} container is deleted",
         )
 
-        try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def load_file(self, file_name, container_name, db_name, collection_name):
+        f = self.backend.exists(container_name=container_name, blob_name=file_name)
 
-            client.delete_container()
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"{file_name} file exists is {f}",
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"{container_name} container is deleted",
-            )
+        return f
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    def get_match_conditions(self, replace, if_match, if_none_match):
+        if if_match is not None:
+            return {"etag": if_match, "match_condition": MatchConditions.IfNotModified}
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        if if_none_match == "*" or replace is False:
+            return {"match_condition": MatchConditions.IfMissing}
 
-    def load_file(self, file_name, container_name, db_name, collection_name):
-        method_name = self.load_file.__name__
+        if if_none_match is not None:
+            return {
+                "etag": if_none_match,
+                "match_condition": MatchConditions.IfModified,
+            }
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
+        return {}
 
-        try:
-            blob_client = self.get_blob_client(
-                blob_file_name=file_name,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    def get_failed_condition(self, replace, if_match, if_none_match):
+        if if_match is not None:
+            return f"its etag does not match {if_match}"
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got blob client from blob service client",
-            )
+        if if_none_match == "*":
+            return "it already exists and if_none_match is set to *"
 
-            f = blob_client.exists()
+        if replace is False:
+            return f"it already exists and replace option is set to {replace}"
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"{file_name} file exists is {f}",
-            )
+        return f"its etag still matches {if_none_match}"
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    def get_upload_codec(self, container_file_name, head=None):
+        if head is not None and detect_codec(head) is not None:
+            return None
 
-            return f
+        codec = get_codec_from_name(container_file_name)
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        if codec is not None:
+            return codec
 
-    def upload_file(
+        if self.codec != "none" and container_file_name.endswith(self.codec_extensions):
+            return self.codec
+
+        return None
+
+    def put_blob(
         self,
-        local_file_name,
+        data,
+        length,
         container_file_name,
         container_name,
         db_name,
         collection_name,
-        remove=True,
         replace=True,
+        if_match=None,
+        if_none_match=None,
     ):
-        method_name = self.upload_file.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
+        method_name = self.put_blob.__name__
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
+            conditions = self.get_match_conditions(
+                replace=replace, if_match=if_match, if_none_match=if_none_match
             )
 
-            if replace is True:
-                f = self.load_file(
-                    container_name=container_name,
-                    file=container_file_name,
-                    db_name=db_name,
-                    collection_name=collection_name,
-                )
-
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"{container_file_name} file exists is {f}, and replace option is set to {replace}..Deleting the file",
-                )
+            head = peek_head(data)
 
-                if f is True:
-                    self.delete_file(
-                        file_name=container_file_name,
-                        container_name=container_name,
-                        db_name=db_name,
-                        collection_name=collection_name,
-                    )
+            codec = self.get_upload_codec(container_file_name, head)
 
-                else:
-                    self.log_writer.log(
-                        db_name=db_name,
-                        collection_name=collection_name,
-                        log_info=f"{container_file_name} file exists is {f}",
-                    )
+            stored_codec = codec
 
-                with open(file=local_file_name, mode="rb") as f:
-                    client.upload_blob(data=f, name=container_file_name)
+            if codec is None and head is not None:
+                stored_codec = detect_codec(head)
 
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"Uploaded {local_file_name} to {container_name} container with name as {container_file_name} file",
+            if codec is not None:
+                data, length = (
+                    Compressed_Stream(
+                        data=data,
+                        codec=codec,
+                        level=self.codec_level,
+                        chunk_size=self.codec_chunk_size,
+                    ),
+                    None,
                 )
 
-            else:
+            result = self.backend.put(
+                container_name=container_name,
+                blob_name=container_file_name,
+                data=data,
+                length=length,
+                match_conditions=conditions,
+                metadata=None if stored_codec is None else {"codec": stored_codec},
+            )
+
+            if codec is not None and result is not None:
+                length = data.bytes_out
+
                 self.log_writer.log(
                     db_name=db_name,
                     collection_name=collection_name,
-                    log_info=f"Replace option is set to {replace}, not replacing the {container_file_name} file in {container_name} container",
+                    log_info=f"Compressed {container_file_name} file with {codec} codec from {data.bytes_in} to {data.bytes_out} bytes",
                 )
 
-            if remove is True:
-                os.remove(local_file_name)
-
+            if result is None:
                 self.log_writer.log(
                     db_name=db_name,
                     collection_name=collection_name,
-                    log_info=f"Remove option is set to {remove}, removed {local_file_name} from local",
+                    log_info=f"Not uploading {container_file_name} file to {container_name} container as {self.get_failed_condition(replace, if_match, if_none_match)}",
                 )
 
             else:
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"Removed option is set to {remove}, not removing the {local_file_name} from local",
+                if length:
+                    BLOB_BYTES.labels(direction="out").inc(length)
+
+                self.manifest.update(
+                    container_name=container_name,
+                    changes={
+                        container_file_name: self.manifest.get_entry(
+                            blob_name=container_file_name,
+                            size=length,
+                            etag=result["etag"],
+                            last_modified=result["last_modified"],
+                        )
+                    },
                 )
 
+            return result
+
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
@@ -336,227 +306,266 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def delete_file(self, file_name, container_name, db_name, collection_name):
-        method_name = self.delete_file.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
-
-        try:
-            client = self.get_container_client(
+    @instrumented()
+    def upload_file(
+        self,
+        local_file_name,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+        remove=True,
+        replace=True,
+        if_match=None,
+        if_none_match=None,
+    ):
+        with open(file=local_file_name, mode="rb") as f:
+            result = self.put_blob(
+                data=f,
+                length=os.path.getsize(local_file_name),
+                container_file_name=container_file_name,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
+                replace=replace,
+                if_match=if_match,
+                if_none_match=if_none_match,
             )
 
-            client.delete_blob(file_name)
-
+        if result is None:
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Deleted {file_name} file from {container_name} container",
+                log_info=f"Nothing was uploaded, not removing the {local_file_name} from local",
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+            return result
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Uploaded {local_file_name} to {container_name} container with name as {container_file_name} file and etag as {result['etag']}",
+        )
+
+        if remove is True:
+            os.remove(local_file_name)
+
+            self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
+                log_info=f"Remove option is set to {remove}, removed {local_file_name} from local",
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
+        else:
+            self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
+                log_info=f"Removed option is set to {remove}, not removing the {local_file_name} from local",
             )
 
-    def get_object(self, file_name, container_name, db_name, collection_name):
-        method_name = self.get_object.__name__
+        return result
 
-        try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def upload_bytes(
+        self,
+        data,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+        replace=True,
+        if_match=None,
+        if_none_match=None,
+    ):
+        if isinstance(data, BytesIO):
+            length = data.getbuffer().nbytes
+
+            data.seek(0)
 
-            f = client.download_blob(blob=file_name)
+        else:
+            length = len(data)
+
+        result = self.put_blob(
+            data=data,
+            length=length,
+            container_file_name=container_file_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+            replace=replace,
+            if_match=if_match,
+            if_none_match=if_none_match,
+        )
 
+        if result is not None:
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Got {file_name} info from {container_name} container",
+                log_info=f"Uploaded {length} bytes to {container_name} container with name as {container_file_name} file and etag as {result['etag']}",
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return result
 
-            return f
+    def get_temp_file_name(self, local_file_name):
+        return os.path.join(
+            tempfile.gettempdir(),
+            uuid4().hex + "_" + os.path.basename(local_file_name),
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def delete_file(self, file_name, container_name, db_name, collection_name):
+        report = self.backend.delete(
+            container_name=container_name, blob_names=[file_name]
+        )
+
+        if report[file_name] != "success":
+            raise Exception(f"Delete of {file_name} file {report[file_name]}")
+
+        self.manifest.update(container_name=container_name, changes={file_name: None})
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Deleted {file_name} file from {container_name} container",
+        )
+
+    @instrumented()
+    def get_object(self, file_name, container_name, db_name, collection_name):
+        f = self.backend.get(container_name=container_name, blob_name=file_name)
 
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Got {file_name} info from {container_name} container",
+        )
+
+        return f
+
+    @instrumented()
     def read_object(
         self, object, db_name, collection_name, decode=True, make_readable=False
     ):
-        method_name = self.read_object.__name__
+        func = lambda: object.readall().decode() if decode is True else object.readall()
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Read {object} object with decode as {decode}",
         )
 
-        try:
-            func = (
-                lambda: object.readall().decode()
-                if decode is True
-                else object.readall()
-            )
+        conv_func = lambda: StringIO(func()) if make_readable is True else func()
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Read {object} object with decode as {decode}",
-            )
+        return conv_func()
 
-            conv_func = lambda: StringIO(func()) if make_readable is True else func()
+    @instrumented()
+    def read_text(self, file_name, container_name, db_name, collection_name):
+        f_obj = self.get_object(
+            container_name=container_name,
+            file_name=file_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        content = self.read_object(
+            object=f_obj, db_name=db_name, collection_name=collection_name
+        )
 
-            return conv_func()
+        return content
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def read_json(self, file_name, container_name, db_name, collection_name):
+        f_obj = self.get_object(
+            container_name=container_name,
+            file_name=file_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-    def read_text(self, file_name, container_name, db_name, collection_name):
-        method_name = self.read_text.__name__
+        json_content = self.read_object(
+            object=f_obj, db_name=db_name, collection_name=collection_name
+        )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        dic = json.loads(json_content)
+
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Read {file_name} json file from {container_name} container",
         )
 
-        try:
-            f_obj = self.get_object(
-                container_name=container_name,
-                local_file_name=file_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return dic
 
-            content = self.read_object(
-                object=f_obj, db_name=db_name, collection_name=collection_name
-            )
+    def get_codec_hint(self, object):
+        metadata = getattr(getattr(object, "properties", None), "metadata", None)
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        if metadata and metadata.get("codec"):
+            return metadata["codec"]
 
-            return content
+        return get_codec_from_name(getattr(object, "name", "") or "") or "no"
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def get_df_from_object(self, object, db_name, collection_name, chunksize=None):
+        content = open_decoded_stream(stream=open_blob_stream(downloader=object))
 
-    def read_json(self, file_name, container_name, db_name, collection_name):
-        method_name = self.read_json.__name__
+        df = pd.read_csv(content, chunksize=chunksize)
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Got dataframe from {object} object with {self.get_codec_hint(object)} codec",
         )
 
-        try:
-            f_obj = self.get_object(
-                container_name=container_name,
-                local_file_name=file_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return df
 
-            json_content = self.read_object(
-                object=f_obj, db_name=db_name, collection_name=collection_name
-            )
+    @instrumented()
+    def get_manifest(self, folder_name, container_name, db_name, collection_name):
+        entries = self.manifest.get_entries(
+            container_name=container_name, folder=folder_name
+        )
 
-            dic = json.loads(json_content)
+        if entries is None:
+            raise Exception(f"{folder_name} folder is not tracked by a manifest")
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Read {file_name} json file from {container_name} container",
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Got manifest of {folder_name} folder from {container_name} container with {len(entries)} files",
+        )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return entries
+
+    @instrumented()
+    def diff_manifest(
+        self, old_entries, folder_name, container_name, db_name, collection_name
+    ):
+        new_entries = self.get_manifest(
+            folder_name=folder_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            return dic
+        diff = diff_manifests(old_entries=old_entries, new_entries=new_entries)
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"{folder_name} folder has {len(diff['added'])} new, {len(diff['changed'])} changed and {len(diff['removed'])} removed files",
+        )
+
+        return diff
 
-    def get_df_from_object(self, object, db_name, collection_name):
-        method_name = self.get_df_from_object.__name__
+    def iter_blob_pages(
+        self,
+        folder_name,
+        container_name,
+        db_name,
+        collection_name,
+        results_per_page=None,
+        include=None,
+        delimiter=None,
+    ):
+        method_name = self.iter_blob_pages.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -567,19 +576,39 @@ class Blob_Operation:
         )
 
         try:
-            content = self.read_object(
-                object=object,
-                make_readable=True,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+            folder = folder_name + "/"
+
+            n_pages, n_blobs = 0, 0
 
-            df = pd.read_csv(content)
+            pages = None
+
+            if delimiter is None and include is None:
+                pages = self.manifest.list_pages(
+                    container_name=container_name,
+                    prefix=folder,
+                    results_per_page=results_per_page,
+                )
+
+            if pages is None:
+                pages = self.backend.list_pages(
+                    container_name=container_name,
+                    prefix=folder,
+                    results_per_page=results_per_page,
+                    include=include,
+                    delimiter=delimiter,
+                )
+
+            for page in pages:
+                n_pages += 1
+
+                n_blobs += len(page)
+
+                yield page
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Got dataframe from {object} object",
+                log_info=f"Listed {n_blobs} blobs in {n_pages} pages from {folder_name} folder from {container_name} container",
             )
 
             self.log_writer.start_log(
@@ -590,8 +619,6 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-            return df
-
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
@@ -601,216 +628,283 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
+    def iter_blobs(
+        self,
+        folder_name,
+        container_name,
+        db_name,
+        collection_name,
+        results_per_page=None,
+        include=None,
+        delimiter=None,
+    ):
+        for page in self.iter_blob_pages(
+            folder_name=folder_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+            results_per_page=results_per_page,
+            include=include,
+            delimiter=delimiter,
+        ):
+            for blob in page:
+                yield blob
+
+    @instrumented()
     def get_files_from_folder(
         self, folder_name, container_name, db_name, collection_name
     ):
-        method_name = self.get_files_from_folder.__name__
+        folder = folder_name + "/"
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        pages = self.manifest.list_pages(container_name=container_name, prefix=folder)
+
+        if pages is None:
+            f_name_lst = self.backend.list(container_name=container_name, prefix=folder)
+
+        else:
+            f_name_lst = [blob["name"] for page in pages for blob in page]
+
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Got files from {folder_name} folder from {container_name} container",
         )
 
-        try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            folder = folder_name + "/"
+        return f_name_lst
 
-            blob_list = client.list_blobs(name_starts_with=folder)
+    @instrumented()
+    def read_csv_from_folder(
+        self, folder_name, container_name, db_name, collection_name
+    ):
+        files = self.get_files_from_folder(
+            folder_name=folder_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            f_name_lst = [f.name for f in blob_list]
+        files = [f for f in files if f.endswith(".csv")]
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got files from {folder_name} folder from {container_name} container",
-            )
+        lst = self.map_files(
+            func=self.read_csv,
+            files=files,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Downloaded {len(files)} files with {self.download_workers} workers",
+        )
 
-            return f_name_lst
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read csv files from {folder_name} folder from {container_name} container",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return lst
 
-    def read_csv_from_folder(
+    @instrumented()
+    def read_df_from_folder(
         self, folder_name, container_name, db_name, collection_name
     ):
-        method_name = self.read_csv_from_folder.__name__
+        files = self.get_files_from_folder(
+            folder_name=folder_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        lst = self.map_files(
+            func=self.read_df,
+            files=files,
+            container_name=container_name,
             db_name=db_name,
             collection_name=collection_name,
         )
-        try:
-            files = self.get_files_from_folder(
-                folder_name=folder_name,
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read {len(files)} files from {folder_name} folder from {container_name} container with {self.download_workers} workers",
+        )
+
+        return lst
+
+    def map_files(self, func, files, container_name, db_name, collection_name):
+        lst = [None] * len(files)
+
+        with ThreadPoolExecutor(
+            max_workers=max(min(self.download_workers, len(files)), 1)
+        ) as executor:
+            futures = {
+                submit_with_context(
+                    executor,
+                    func,
+                    file_name=f,
+                    container_name=container_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                ): idx
+                for idx, f in enumerate(files)
+            }
+
+            for future in as_completed(futures):
+                idx = futures[future]
+
+                f = files[idx]
+
+                lst[idx] = (future.result(), f, f.split("/")[-1])
+
+        return lst
+
+    @instrumented()
+    def read_csv_header(self, file_name, container_name, db_name, collection_name):
+        length = self.header_probe_bytes
+
+        while True:
+            raw = self.backend.get_range(
                 container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
+                blob_name=file_name,
+                offset=0,
+                length=length,
             )
 
-            lst = [
-                (
-                    self.read_csv(
-                        file_name=f,
-                        container_name=container_name,
-                        db_name=db_name,
-                        collection_name=collection_name,
-                    ),
-                    f,
-                    f.split("/")[-1],
+            content = decompress_head(raw)
+
+            if b"\n" in content or len(raw) < length:
+                break
+
+            if length >= self.header_max_bytes:
+                raise Exception(
+                    f"No header row found in first {length} bytes of {file_name} file"
                 )
-                for f in files
-            ]
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Read csv files from {folder_name} folder from {container_name} container",
-            )
+            length = min(length * 2, self.header_max_bytes)
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        header_line = content.split(b"\n", 1)[0].decode().rstrip("\r")
 
-            return lst
+        header = next(csv.reader([header_line])) if header_line else []
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read header of {file_name} file with {len(header)} columns from first {len(raw)} bytes",
+        )
 
-    def read_csv(self, file_name, container_name, db_name, collection_name):
-        method_name = self.read_csv.__name__
+        return header
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+    @instrumented()
+    def read_csv_headers_from_folder(
+        self, folder_name, container_name, db_name, collection_name
+    ):
+        files = self.get_files_from_folder(
+            folder_name=folder_name,
+            container_name=container_name,
             db_name=db_name,
             collection_name=collection_name,
         )
 
-        try:
-            csv_obj = self.get_object(
-                file_name=file_name,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        lst = self.map_files(
+            func=self.read_csv_header,
+            files=[f for f in files if f.endswith(".csv")],
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            df = self.get_df_from_object(
-                object=csv_obj, db_name=db_name, collection_name=collection_name
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read csv headers from {folder_name} folder from {container_name} container",
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Read {file_name} csv file from {container_name} container",
-            )
+        return lst
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def read_csv(
+        self, file_name, container_name, db_name, collection_name, chunksize=None
+    ):
+        csv_obj = self.get_object(
+            file_name=file_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            return df
+        df = self.get_df_from_object(
+            object=csv_obj,
+            db_name=db_name,
+            collection_name=collection_name,
+            chunksize=chunksize,
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read {file_name} csv file from {container_name} container",
+        )
 
-    def get_blob_url(self, file_name, container_name, db_name, collection_name):
-        method_name = self.get_blob_url.__name__
+        return df
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+    @instrumented()
+    def read_parquet(
+        self, file_name, container_name, db_name, collection_name, columns=None
+    ):
+        parquet_obj = self.get_object(
+            file_name=file_name,
+            container_name=container_name,
             db_name=db_name,
             collection_name=collection_name,
         )
 
-        try:
-            blob_client = self.get_blob_client(
-                blob_file_name=file_name,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
+        if hasattr(parquet_obj, "path"):
+            df = pd.read_parquet(
+                parquet_obj.path, engine="pyarrow", columns=columns, memory_map=True
             )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got {file_name} blob from {container_name} container",
+        else:
+            df = pd.read_parquet(
+                BytesIO(parquet_obj.readall()), engine="pyarrow", columns=columns
             )
 
-            f = blob_client.url
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Read {file_name} parquet file from {container_name} container",
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got {file_name} blob url",
-            )
+        return df
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def read_df(self, file_name, container_name, db_name, collection_name):
+        func = self.read_parquet if file_name.endswith(".parquet") else self.read_csv
 
-            return f
+        df = func(
+            file_name=file_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return df
 
+    @instrumented()
+    def get_blob_url(self, file_name, container_name, db_name, collection_name):
+        f = self.backend.get_url(container_name=container_name, blob_name=file_name)
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Got {file_name} blob url",
+        )
+
+        return f
+
+    @instrumented()
     def copy_data(
         self,
         from_file_name,
@@ -819,34 +913,26 @@ class Blob_Operation:
         to_container_name,
         db_name,
         collection_name,
+        wait=True,
+        size=None,
     ):
-        method_name = self.copy_data.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
+        job = self.backend.copy(
+            from_container_name=from_container_name,
+            from_blob_name=from_file_name,
+            to_container_name=to_container_name,
+            to_blob_name=to_file_name,
+            size=size,
         )
 
-        try:
-            dest_client = self.get_container_client(
-                container_name=to_container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            from_blob = self.get_blob_url(
-                container_name=from_container_name,
-                local_file_name=from_file_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        if wait is True:
+            job.wait()
 
-            to_blob = dest_client.get_blob_client(blob=to_file_name)
+            if job.status != "success":
+                raise Exception(
+                    f"Copy of {from_file_name} file ended with {job.status} status, {job.error}"
+                )
 
-            to_blob.start_copy_from_url(from_blob)
+            self.update_manifest_from_copies(jobs=[job])
 
             self.log_writer.log(
                 db_name=db_name,
@@ -854,23 +940,61 @@ class Blob_Operation:
                 log_info=f"Copied {from_file_name} file from {from_container_name} container to {to_file_name} file from {to_container_name}",
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+        else:
+            self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
+                log_info=f"Started copy of {from_file_name} file from {from_container_name} container to {to_file_name} file from {to_container_name}, status is {job.status}",
+            )
+
+        return job
+
+    def update_manifest_from_copies(self, jobs):
+        changes = {}
+
+        for job in jobs:
+            if job.status == "success":
+                container_name = job.dest_blob.container_name
+
+                changes.setdefault(container_name, {})[
+                    job.dest_blob.blob_name
+                ] = self.manifest.get_entry(
+                    blob_name=job.dest_blob.blob_name,
+                    size=job.size,
+                    etag=job.etag,
+                    last_modified=None,
+                )
+
+        for container_name, container_changes in changes.items():
+            self.manifest.update(
+                container_name=container_name, changes=container_changes
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
+    @instrumented()
+    def wait_for_copies(self, db_name, collection_name):
+        jobs = self.backend.wait_copies()
+
+        failed = [job for job in jobs if job.status != "success"]
+
+        self.update_manifest_from_copies(jobs=jobs)
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Waited for {len(jobs)} copies, {len(failed)} did not succeed",
+        )
+
+        if len(failed) > 0:
+            raise Exception(
+                "Copies did not succeed for "
+                + ", ".join(
+                    f"{job.dest_blob.blob_name} ({job.status})" for job in failed
+                )
             )
 
+        return jobs
+
+    @instrumented()
     def move_data(
         self,
         from_file_name,
@@ -880,91 +1004,178 @@ class Blob_Operation:
         db_name,
         collection_name,
     ):
-        method_name = self.move_data.__name__
+        self.copy_data(
+            from_file_name=from_file_name,
+            from_container_name=from_container_name,
+            to_file_name=to_file_name,
+            to_container_name=to_container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.delete_file(
+            file_name=from_file_name,
+            container_name=from_container_name,
             db_name=db_name,
             collection_name=collection_name,
         )
 
-        try:
-            self.copy_data(
-                from_file_name=from_file_name,
-                from_container_name=from_container_name,
-                to_file_name=to_file_name,
-                to_container_name=to_container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Moved {from_file_name} file from {from_container_name} container to {to_container_name} container,with {to_file_name} file as name",
+        )
 
-            self.delete_file(
-                file_name=from_file_name,
-                container_name=from_container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+    @instrumented()
+    def delete_files(self, file_names, container_name, db_name, collection_name):
+        report = self.backend.delete(
+            container_name=container_name, blob_names=file_names
+        )
+
+        failed = [f for f in report if report[f] != "success"]
+
+        self.manifest.update(
+            container_name=container_name,
+            changes={f: None for f in report if report[f] == "success"},
+        )
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Deleted {len(report) - len(failed)} files from {container_name} container, {len(failed)} failed",
+        )
+
+        return report
+
+    def check_report(self, report, action, db_name, collection_name):
+        """
+        Method Name :   check_report
+        Description :   This method logs every file of a move or delete report which did not succeed and raises
+                        when there is any, so that a partially moved batch does not go further
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        failed = {
+            file_name: status
+            for file_name, status in report.items()
+            if status != "success"
+        }
 
+        for file_name, status in failed.items():
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Moved {from_file_name} file from {from_container_name} container to {to_container_name} container,with {to_file_name} file as name",
+                log_info=f"{action} of {file_name} file failed with {status}",
+                level="ERROR",
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
+        if failed:
+            raise Exception(f"{action} failed for {len(failed)} of {len(report)} files")
+
+    @instrumented()
+    def move_files(self, moves, db_name, collection_name):
+        report, copied = {}, []
+
+        with ThreadPoolExecutor(
+            max_workers=max(min(self.batch_workers, len(moves)), 1)
+        ) as executor:
+            jobs = list(
+                executor.map(
+                    lambda move: self.backend.copy(
+                        from_container_name=move["from_container_name"],
+                        from_blob_name=move["from_file_name"],
+                        to_container_name=move["to_container_name"],
+                        to_blob_name=move["to_file_name"],
+                    ),
+                    moves,
+                )
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Started {len(moves)} copies, waiting for them to complete",
+        )
+
+        self.backend.wait_copies(jobs=jobs)
+
+        self.update_manifest_from_copies(jobs=jobs)
+
+        for move, job in zip(moves, jobs):
+            if job.status == "success":
+                copied.append(move)
+
+            else:
+                report[move["from_file_name"]] = f"copy {job.status}, {job.error}"
+
+        sources = {}
+
+        for move in copied:
+            sources.setdefault(move["from_container_name"], []).append(
+                move["from_file_name"]
+            )
+
+        for container_name, file_names in sources.items():
+            delete_report = self.delete_files(
+                file_names=file_names,
+                container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-    def load_model(
-        self, model_name, container_name, db_name, collection_name, model_dir=None
-    ):
-        method_name = self.load_model.__name__
+            for file_name, status in delete_report.items():
+                report[file_name] = (
+                    status if status == "success" else f"delete {status}"
+                )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Moved {len(copied)} of {len(moves)} files",
         )
 
+        return report
+
+    @instrumented()
+    def load_model(
+        self, model_name, container_name, db_name, collection_name, model_dir=None
+    ):
+        func = (
+            lambda: model_name + self.model_save_format
+            if model_dir is None
+            else model_dir + model_name + self.model_save_format
+        )
+
+        model_file = func()
+
         try:
-            func = (
-                lambda: model_name + self.model_save_format
-                if model_dir is None
-                else model_dir + model_name + self.model_save_format
+            f_obj = self.backend.get(
+                container_name=container_name, blob_name=model_file
             )
 
-            model_file = func()
+        except (ResourceNotFoundError, FileNotFoundError):
+            model_file = (
+                model_file[: -len(self.model_save_format)]
+                + self.model_legacy_save_format
+            )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got {model_file} as model file",
+            f_obj = self.backend.get(
+                container_name=container_name, blob_name=model_file
             )
 
-            f_obj = self.get_object(
-                file_name=model_file,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Got {model_file} as model file",
+        )
+
+        if hasattr(f_obj, "path"):
+            model = load_artifact_file(
+                path=f_obj.path, name=model_file, mmap_mode=self.model_mmap_mode
             )
 
+        else:
             model_content = self.read_object(
                 object=f_obj,
                 db_name=db_name,
@@ -972,81 +1183,66 @@ class Blob_Operation:
                 decode=False,
             )
 
-            model = pickle.loads(model_content)
-
-            self.log_writer.log(
-                db_name=self.class_name,
-                collection_name=collection_name,
-                log_info=f"Loaded {model_name} model from {container_name} container",
-            )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+            model = load_artifact_bytes(data=model_content, name=model_file)
 
-            return model
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Loaded {model_name} model from {container_name} container",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return model
 
+    @instrumented()
     def save_model(
         self, model, model_dir, container_name, db_name, collection_name, idx=None
     ):
-        method_name = self.save_model.__name__
+        model_name = self.model_utils.get_model_name(
+            model=model, db_name=db_name, collection_name=collection_name
+        )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        func = (
+            lambda: model_name + self.model_save_format
+            if model_name == "KMeans"
+            else model_name + str(idx) + self.model_save_format
+        )
+
+        model_file = func()
+
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Local copy of {model_name} model file name is created",
         )
 
-        try:
-            model_name = self.model_utils.get_model_name(
-                model=model, db_name=db_name, collection_name=collection_name
-            )
+        dir_func = (
+            lambda: model_dir + "/" + model_file
+            if model_dir is not None
+            else model_file
+        )
 
-            func = (
-                lambda: model_name + self.model_save_format
-                if model_name == "KMeans"
-                else model_name + str(idx) + self.model_save_format
-            )
+        container_model_file = dir_func()
 
-            model_file = func()
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Container location of {model_name} model file name is created ",
+        )
 
-            self.log_writer.log(
+        if self.upload_in_memory is True:
+            result = self.upload_bytes(
+                data=dump_artifact(model=model, compress=self.model_compress),
+                container_file_name=container_model_file,
+                container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Local copy of {model_name} model file name is created",
-            )
-
-            dir_func = (
-                lambda: model_dir + "/" + model_file
-                if model_dir is not None
-                else model_file
             )
 
-            container_model_file = dir_func()
-
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Container location of {model_name} model file name is created ",
-            )
+        else:
+            local_model_file = self.get_temp_file_name(model_file)
 
-            with open(file=model_file, mode="wb") as f:
-                pickle.dump(model, f)
+            with open(file=local_model_file, mode="wb") as f:
+                f.write(dump_artifact(model=model, compress=self.model_compress))
 
             self.log_writer.log(
                 db_name=db_name,
@@ -1054,130 +1250,172 @@ class Blob_Operation:
                 log_info=f"Saved local copy of {model_name} model",
             )
 
-            self.upload_file(
-                local_file_name=model_file,
+            result = self.upload_file(
+                local_file_name=local_model_file,
                 container_file_name=container_model_file,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return result
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
+    @instrumented()
+    def delete_folder(self, folder_name, container_name, db_name, collection_name):
+        for page in self.iter_blob_pages(
+            folder_name=folder_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+            results_per_page=self.config["blob_batch"]["max_batch_size"],
+        ):
+            self.delete_files(
+                file_names=[blob["name"] for blob in page],
+                container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-    def delete_folder(self, folder_name, container_name, db_name, collection_name):
-        method_name = self.delete_folder.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"{folder_name} folder is deleted from {container_name} container",
         )
 
-        try:
-            files = self.get_files_from_folder(
-                folder_name=folder_name,
+    @instrumented()
+    def upload_df_as_csv(
+        self,
+        dataframe,
+        local_file_name,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+    ):
+        if self.upload_in_memory is True:
+            buffer = BytesIO()
+
+            dataframe.to_csv(buffer, index=None, header=True)
+
+            result = self.upload_bytes(
+                data=buffer,
+                container_file_name=container_file_name,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            for f in files:
-                self.delete_file(
-                    file_name=f,
-                    container_name=container_name,
-                    db_name=db_name,
-                    collection_name=collection_name,
-                )
+        else:
+            local_file_name = self.get_temp_file_name(local_file_name)
+
+            dataframe.to_csv(local_file_name, index=None, header=True)
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"{folder_name} folder is deleted from {container_name} container",
+                log_info=f"Created a local copy of dataframe with name {local_file_name}",
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+            result = self.upload_file(
+                local_file_name=local_file_name,
+                container_file_name=container_file_name,
+                container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return result
 
-    def upload_df_as_csv(
+    def get_typed_df(self, dataframe):
+        df = dataframe.copy()
+
+        for col in df.columns:
+            if col in self.category_cols:
+                df[col] = df[col].astype("category")
+
+                continue
+
+            values = pd.to_numeric(df[col], errors="coerce")
+
+            invalid = values.isna() & ~(df[col].isna() | df[col].isin(self.na_values))
+
+            if invalid.any():
+                continue
+
+            values = values.astype(np.float64)
+
+            narrowed = values.astype(self.float_type)
+
+            if (narrowed.astype(np.float64) == values)[values.notna()].all():
+                values = narrowed
+
+            df[col] = values
+
+        return df
+
+    @instrumented()
+    def upload_df_as_parquet(
         self,
         dataframe,
-        local_file_name,
         container_file_name,
         container_name,
         db_name,
         collection_name,
     ):
-        method_name = self.upload_df_as_csv.__name__
+        df = self.get_typed_df(dataframe)
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        buffer = BytesIO()
+
+        df.to_parquet(
+            buffer,
+            engine="pyarrow",
+            compression=self.parquet_compression,
+            index=False,
+            use_dictionary=[col for col in self.category_cols if col in df.columns],
+        )
+
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Wrote dataframe of shape {df.shape} as {buffer.tell()} bytes of parquet",
         )
 
-        try:
-            dataframe.to_csv(local_file_name, index=None, header=True)
+        result = self.upload_bytes(
+            data=buffer,
+            container_file_name=container_file_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Created a local copy of dataframe with name {local_file_name}",
-            )
+        return result
 
-            self.upload_file(
-                local_file_name=local_file_name,
+    @instrumented()
+    def upload_df(
+        self,
+        dataframe,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+    ):
+        if container_file_name.endswith(".parquet"):
+            result = self.upload_df_as_parquet(
+                dataframe=dataframe,
                 container_file_name=container_file_name,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+        else:
+            result = self.upload_df_as_csv(
+                dataframe=dataframe,
+                local_file_name=container_file_name.split("/")[-1],
+                container_file_name=container_file_name,
+                container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return result
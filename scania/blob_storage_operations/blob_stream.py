@@ -0,0 +1,55 @@
+from io import BufferedReader, RawIOBase
+
+
+class Blob_Stream_Reader(RawIOBase):
+    """
+    Description :   This class shall be used for exposing the chunks of a blob download as a readable byte stream,
+                    so that only the chunk being parsed is held in memory
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, downloader):
+        self.chunks = iter(downloader.chunks())
+
+        self.chunk = memoryview(b"")
+
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self.pos >= len(self.chunk):
+            try:
+                self.chunk = memoryview(next(self.chunks))
+
+                self.pos = 0
+
+            except StopIteration:
+                return 0
+
+        n = min(len(b), len(self.chunk) - self.pos)
+
+        b[:n] = self.chunk[self.pos : self.pos + n]
+
+        self.pos += n
+
+        return n
+
+    def close(self):
+        self.chunk = memoryview(b"")
+
+        super().close()
+
+
+def open_blob_stream(downloader, buffer_size=1024 * 1024):
+    """
+    Method Name :   open_blob_stream
+    Description :   This method wraps the blob download in a buffered file like object for pandas
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    return BufferedReader(Blob_Stream_Reader(downloader), buffer_size=buffer_size)
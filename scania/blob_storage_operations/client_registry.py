@@ -0,0 +1,255 @@
+import os
+import threading
+
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.read_params import read_params
+
+
+class Blob_Client_Registry:
+    """
+    Description :   This class shall be used for keeping one blob service client and one container client
+                    per container for the whole process, all of them sharing a single pooled http transport
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.connection_string = os.environ["AZURE_CONN_STR"]
+
+        self.pool_connections = self.config["blob_client"]["pool_connections"]
+
+        self.pool_maxsize = self.config["blob_client"]["pool_maxsize"]
+
+        self.connection_timeout = self.config["blob_client"]["connection_timeout"]
+
+        self.read_timeout = self.config["blob_client"]["read_timeout"]
+
+        self.max_single_get_size = self.config["blob_download"]["max_single_get_size"]
+
+        self.max_chunk_get_size = self.config["blob_download"]["max_chunk_get_size"]
+
+        self.max_single_put_size = self.config["blob_upload"]["max_single_put_size"]
+
+        self.max_block_size = self.config["blob_upload"]["max_block_size"]
+
+        self.lock = threading.RLock()
+
+        self.reset()
+
+    def reset(self):
+        """
+        Method Name :   reset
+        Description :   This method drops every client held by the registry without closing them, used after fork
+                        where the sockets still belong to the parent process
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.pid = os.getpid()
+
+        self.session = None
+
+        self.service_client = None
+
+        self.container_clients = {}
+
+        self.counters = {
+            "service_clients_created": 0,
+            "container_clients_created": 0,
+            "clients_reused": 0,
+        }
+
+    def check_pid(self):
+        if self.pid != os.getpid():
+            self.reset()
+
+    def create_session(self):
+        session = Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+
+        session.mount("http://", adapter)
+
+        session.mount("https://", adapter)
+
+        return session
+
+    def get_service_client(self):
+        """
+        Method Name :   get_service_client
+        Description :   This method returns the shared blob service client, creating it with the pooled transport
+                        on first use
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            self.check_pid()
+
+            if self.service_client is not None:
+                self.counters["clients_reused"] += 1
+
+                return self.service_client
+
+            self.session = self.create_session()
+
+            transport = RequestsTransport(
+                session=self.session,
+                session_owner=False,
+                connection_timeout=self.connection_timeout,
+                read_timeout=self.read_timeout,
+            )
+
+            self.service_client = BlobServiceClient.from_connection_string(
+                conn_str=self.connection_string,
+                transport=transport,
+                max_single_get_size=self.max_single_get_size,
+                max_chunk_get_size=self.max_chunk_get_size,
+                max_single_put_size=self.max_single_put_size,
+                max_block_size=self.max_block_size,
+            )
+
+            self.counters["service_clients_created"] += 1
+
+            return self.service_client
+
+    def get_container_client(self, container_name):
+        """
+        Method Name :   get_container_client
+        Description :   This method returns the shared container client for the container, derived from the
+                        service client so that it uses the same transport
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            self.check_pid()
+
+            client = self.container_clients.get(container_name)
+
+            if client is not None:
+                self.counters["clients_reused"] += 1
+
+                return client
+
+            client = self.get_service_client().get_container_client(container_name)
+
+            self.container_clients[container_name] = client
+
+            self.counters["container_clients_created"] += 1
+
+            return client
+
+    def get_stats(self):
+        """
+        Method Name :   get_stats
+        Description :   This method returns the client counters along with the connection pool counters of the
+                        shared transport
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            stats = dict(self.counters)
+
+            connections, requests = 0, 0
+
+            if self.session is not None:
+                for adapter in set(self.session.adapters.values()):
+                    pools = adapter.poolmanager.pools
+
+                    for key in pools.keys():
+                        try:
+                            pool = pools[key]
+
+                        except KeyError:
+                            continue
+
+                        connections += pool.num_connections
+
+                        requests += pool.num_requests
+
+            stats["connections_created"] = connections
+
+            stats["requests_sent"] = requests
+
+            stats["connections_reused"] = max(requests - connections, 0)
+
+            return stats
+
+    def close(self):
+        """
+        Method Name :   close
+        Description :   This method closes the shared clients and the http session, the next call recreates them
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            if self.pid == os.getpid():
+                if self.service_client is not None:
+                    self.service_client.close()
+
+                if self.session is not None:
+                    self.session.close()
+
+            self.reset()
+
+
+_registry = None
+
+_registry_lock = threading.Lock()
+
+
+def get_client_registry():
+    """
+    Method Name :   get_client_registry
+    Description :   This method returns the process wide blob client registry
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = Blob_Client_Registry()
+
+        return _registry
+
+
+def close_client_registry():
+    """
+    Method Name :   close_client_registry
+    Description :   This method closes the process wide blob client registry if it was created
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+
+
+def _reset_registry_after_fork():
+    if _registry is not None:
+        _registry.lock = threading.RLock()
+
+        _registry.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_registry_after_fork)
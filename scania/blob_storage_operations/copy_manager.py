@@ -0,0 +1,251 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from utils.read_params import read_params
+from utils.run_context import submit_with_context
+
+
+_executor = None
+
+_executor_lock = threading.Lock()
+
+
+def get_copy_executor():
+    """
+    Method Name :   get_copy_executor
+    Description :   This method returns the process wide executor running the client side copies
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=read_params()["blob_copy"]["client_copy_workers"]
+            )
+
+        return _executor
+
+
+def _reset_executor_after_fork():
+    global _executor, _executor_lock
+
+    _executor, _executor_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+class Copy_Job:
+    """
+    Description :   This class shall be used for tracking a single blob copy until the destination is complete
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(
+        self,
+        manager,
+        source_blob,
+        dest_blob,
+        status,
+        error=None,
+        etag=None,
+        size=None,
+        future=None,
+    ):
+        self.manager = manager
+
+        self.source_blob = source_blob
+
+        self.dest_blob = dest_blob
+
+        self.status = status
+
+        self.error = error
+
+        self.etag = etag
+
+        self.size = size
+
+        self.future = future
+
+    def is_done(self):
+        return self.status != "pending"
+
+    def refresh(self):
+        if self.future is not None:
+            if self.future.done():
+                try:
+                    self.etag = self.future.result().get("etag")
+
+                    self.status = "success"
+
+                except Exception as e:
+                    self.status, self.error = "failed", str(e)
+
+            return
+
+        try:
+            props = self.dest_blob.get_blob_properties()
+
+            copy_props = props.copy
+
+            self.status = copy_props.status
+
+            self.etag, self.size = props.etag, props.size
+
+            if self.status not in ("success", "pending"):
+                self.error = copy_props.status_description
+
+        except Exception as e:
+            self.status, self.error = "failed", str(e)
+
+    def wait(self, timeout=None):
+        self.manager.wait_all(jobs=[self], timeout=timeout)
+
+        return self
+
+    def __await__(self):
+        loop = asyncio.get_event_loop()
+
+        return loop.run_in_executor(None, self.wait).__await__()
+
+
+class Blob_Copy_Manager:
+    """
+    Description :   This class shall be used for starting many blob copies at once and waiting for all of them
+                    to complete, polling the copy status with backoff
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.poll_interval = self.config["blob_copy"]["poll_interval"]
+
+        self.max_poll_interval = self.config["blob_copy"]["max_poll_interval"]
+
+        self.timeout = self.config["blob_copy"]["timeout"]
+
+        self.client_copy_max_size = self.config["blob_copy"]["client_copy_max_size"]
+
+        self.jobs = []
+
+        self.lock = threading.Lock()
+
+    def client_copy(self, source_blob, dest_blob):
+        source_props = source_blob.get_blob_properties()
+
+        return dest_blob.upload_blob(
+            data=source_blob.download_blob().chunks(),
+            overwrite=True,
+            metadata=source_props.metadata,
+            content_settings=source_props.content_settings,
+        )
+
+    def start(self, source_blob, dest_blob, size=None):
+        """
+        Method Name :   start
+        Description :   This method starts a copy and returns its pending job, small blobs of known size within
+                        the same account are streamed through the client on the copy executor, along with their
+                        metadata, instead of waiting on a server side copy
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            if (
+                size is not None
+                and size <= self.client_copy_max_size
+                and source_blob.account_name == dest_blob.account_name
+            ):
+                future = submit_with_context(
+                    get_copy_executor(), self.client_copy, source_blob, dest_blob
+                )
+
+                job = Copy_Job(
+                    self, source_blob, dest_blob, "pending", size=size, future=future
+                )
+
+            else:
+                props = dest_blob.start_copy_from_url(source_blob.url)
+
+                job = Copy_Job(
+                    self,
+                    source_blob,
+                    dest_blob,
+                    props["copy_status"],
+                    etag=props.get("etag"),
+                    size=size,
+                )
+
+        except Exception as e:
+            job = Copy_Job(self, source_blob, dest_blob, "failed", str(e))
+
+        with self.lock:
+            self.jobs.append(job)
+
+        return job
+
+    def wait_all(self, jobs=None, timeout=None):
+        """
+        Method Name :   wait_all
+        Description :   This method blocks until the given jobs, or every job started so far, are no longer
+                        pending, client copies are waited on directly and server copies are polled, jobs still
+                        pending after the timeout are marked as timed out, the waited jobs are no longer
+                        tracked so that they are not returned by a later wait
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            if jobs is None:
+                jobs, self.jobs = self.jobs, []
+
+            else:
+                waited = set(map(id, jobs))
+
+                self.jobs = [job for job in self.jobs if id(job) not in waited]
+
+        timeout = self.timeout if timeout is None else timeout
+
+        delay, deadline = self.poll_interval, time.monotonic() + timeout
+
+        futures = [job.future for job in jobs if job.future is not None]
+
+        if len(futures) > 0:
+            wait_futures(futures, timeout=timeout)
+
+        for job in jobs:
+            if job.future is not None:
+                job.refresh()
+
+        pending = [job for job in jobs if not job.is_done()]
+
+        while len(pending) > 0 and time.monotonic() < deadline:
+            time.sleep(delay)
+
+            for job in pending:
+                job.refresh()
+
+            pending = [job for job in pending if not job.is_done()]
+
+            delay = min(delay * 2, self.max_poll_interval)
+
+        for job in pending:
+            job.status, job.error = "timed out", f"copy still pending after {timeout}s"
+
+        return jobs
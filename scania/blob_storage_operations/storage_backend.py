@@ -0,0 +1,820 @@
+import base64
+import hashlib
+import mmap
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from io import BytesIO
+from urllib.parse import quote, unquote
+
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
+from azure.storage.blob import BlobPrefix
+from scania.blob_storage_operations.blob_cache import get_blob_cache
+from scania.blob_storage_operations.client_registry import get_client_registry
+from scania.blob_storage_operations.copy_manager import Blob_Copy_Manager, Copy_Job
+from utils.metrics import BLOB_BYTES
+from utils.read_params import read_params
+
+local_put_lock = threading.Lock()
+
+
+def encode_segment(segment):
+    """
+    Method Name :   encode_segment
+    Description :   This method encodes one "/" separated segment of a blob name as a file name, so that empty,
+                    "." and ".." segments are kept like in azure instead of being collapsed by the file system
+                    and names ending with .tmp are not taken for partial writes
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    if segment == "":
+        return "%"
+
+    segment = quote(segment, safe="")
+
+    if segment in (".", "..") or segment.endswith(".tmp"):
+        return segment.replace(".", "%2E")
+
+    return segment
+
+
+def decode_segment(segment):
+    return "" if segment == "%" else unquote(segment)
+
+
+class Storage_Backend(ABC):
+    """
+    Description :   This class shall be used as the interface of the storage used by Blob_Operation, every
+                    backend lists, gets, puts, copies, deletes and checks blobs by container and blob name
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    @abstractmethod
+    def get_container_client(self, container_name):
+        pass
+
+    @abstractmethod
+    def get_blob_client(self, container_name, blob_name):
+        pass
+
+    @abstractmethod
+    def create_container(self, container_name):
+        pass
+
+    @abstractmethod
+    def delete_container(self, container_name):
+        pass
+
+    def list(self, container_name, prefix):
+        return [
+            blob["name"]
+            for page in self.list_pages(container_name=container_name, prefix=prefix)
+            for blob in page
+        ]
+
+    @abstractmethod
+    def list_pages(
+        self,
+        container_name,
+        prefix,
+        results_per_page=None,
+        include=None,
+        delimiter=None,
+    ):
+        pass
+
+    @abstractmethod
+    def get(self, container_name, blob_name):
+        pass
+
+    @abstractmethod
+    def get_range(self, container_name, blob_name, offset, length):
+        pass
+
+    @abstractmethod
+    def read_versioned(self, container_name, blob_name):
+        pass
+
+    @abstractmethod
+    def read_etag(self, container_name, blob_name):
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        container_name,
+        blob_name,
+        data,
+        length,
+        match_conditions,
+        metadata=None,
+    ):
+        pass
+
+    @abstractmethod
+    def copy(
+        self,
+        from_container_name,
+        from_blob_name,
+        to_container_name,
+        to_blob_name,
+        size=None,
+    ):
+        pass
+
+    @abstractmethod
+    def wait_copies(self, jobs=None, timeout=None):
+        pass
+
+    @abstractmethod
+    def delete(self, container_name, blob_names):
+        pass
+
+    @abstractmethod
+    def exists(self, container_name, blob_name):
+        pass
+
+    @abstractmethod
+    def get_url(self, container_name, blob_name):
+        pass
+
+    def get_client_stats(self):
+        return {}
+
+    def get_cache_stats(self):
+        return {}
+
+
+class Azure_Storage_Backend(Storage_Backend):
+    """
+    Description :   This class shall be used for storing blobs in azure blob storage through the shared client
+                    registry, the local blob cache and the copy manager
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.client_registry = get_client_registry()
+
+        self.blob_cache = get_blob_cache()
+
+        self.copy_manager = Blob_Copy_Manager()
+
+        self.download_concurrency = self.config["blob_download"]["max_concurrency"]
+
+        self.upload_concurrency = self.config["blob_upload"]["max_concurrency"]
+
+        self.batch_size = self.config["blob_batch"]["max_batch_size"]
+
+        self.results_per_page = self.config["blob_list"]["results_per_page"]
+
+    def get_container_client(self, container_name):
+        return self.client_registry.get_container_client(container_name=container_name)
+
+    def get_blob_client(self, container_name, blob_name):
+        return self.client_registry.get_service_client().get_blob_client(
+            container=container_name, blob=blob_name
+        )
+
+    def create_container(self, container_name):
+        client = self.get_container_client(container_name)
+
+        if client.exists() is True:
+            return False
+
+        client.create_container()
+
+        return True
+
+    def delete_container(self, container_name):
+        self.get_container_client(container_name).delete_container()
+
+    def get_blob_props(self, blob):
+        if isinstance(blob, BlobPrefix):
+            return {
+                "name": blob.name,
+                "size": None,
+                "etag": None,
+                "last_modified": None,
+                "metadata": None,
+                "is_prefix": True,
+            }
+
+        return {
+            "name": blob.name,
+            "size": blob.size,
+            "etag": blob.etag,
+            "last_modified": blob.last_modified,
+            "metadata": blob.metadata,
+            "is_prefix": False,
+        }
+
+    def list_pages(
+        self,
+        container_name,
+        prefix,
+        results_per_page=None,
+        include=None,
+        delimiter=None,
+    ):
+        client = self.get_container_client(container_name)
+
+        if results_per_page is None:
+            results_per_page = self.results_per_page
+
+        if delimiter is None:
+            blobs = client.list_blobs(
+                name_starts_with=prefix,
+                include=include,
+                results_per_page=results_per_page,
+            )
+
+        else:
+            blobs = client.walk_blobs(
+                name_starts_with=prefix,
+                include=include,
+                delimiter=delimiter,
+                results_per_page=results_per_page,
+            )
+
+        for page in blobs.by_page():
+            yield [self.get_blob_props(blob) for blob in page]
+
+    def get(self, container_name, blob_name):
+        if self.blob_cache.enabled is True:
+            return self.blob_cache.get(
+                blob_client=self.get_blob_client(container_name, blob_name),
+                container_name=container_name,
+                blob_name=blob_name,
+            )
+
+        downloader = self.get_container_client(container_name).download_blob(
+            blob=blob_name, max_concurrency=self.download_concurrency
+        )
+
+        BLOB_BYTES.labels(direction="in").inc(downloader.size)
+
+        return downloader
+
+    def get_range(self, container_name, blob_name, offset, length):
+        content = (
+            self.get_blob_client(container_name, blob_name)
+            .download_blob(offset=offset, length=length)
+            .readall()
+        )
+
+        BLOB_BYTES.labels(direction="in").inc(len(content))
+
+        return content
+
+    def read_versioned(self, container_name, blob_name):
+        try:
+            downloader = self.get_blob_client(container_name, blob_name).download_blob()
+
+        except ResourceNotFoundError:
+            return None, None
+
+        content = downloader.readall()
+
+        BLOB_BYTES.labels(direction="in").inc(len(content))
+
+        return content, downloader.properties.etag
+
+    def read_etag(self, container_name, blob_name):
+        try:
+            return (
+                self.get_blob_client(container_name, blob_name)
+                .get_blob_properties()
+                .etag
+            )
+
+        except ResourceNotFoundError:
+            return None
+
+    def put(
+        self,
+        container_name,
+        blob_name,
+        data,
+        length,
+        match_conditions,
+        metadata=None,
+    ):
+        blob_client = self.get_blob_client(container_name, blob_name)
+
+        try:
+            result = blob_client.upload_blob(
+                data=data,
+                length=length,
+                overwrite=True,
+                max_concurrency=self.upload_concurrency,
+                metadata=metadata,
+                **match_conditions,
+            )
+
+        except (ResourceExistsError, ResourceModifiedError):
+            return None
+
+        content_md5 = result.get("content_md5")
+
+        return {
+            "etag": result.get("etag"),
+            "last_modified": result.get("last_modified"),
+            "content_md5": None
+            if content_md5 is None
+            else base64.b64encode(content_md5).decode(),
+        }
+
+    def copy(
+        self,
+        from_container_name,
+        from_blob_name,
+        to_container_name,
+        to_blob_name,
+        size=None,
+    ):
+        return self.copy_manager.start(
+            source_blob=self.get_blob_client(from_container_name, from_blob_name),
+            dest_blob=self.get_blob_client(to_container_name, to_blob_name),
+            size=size,
+        )
+
+    def wait_copies(self, jobs=None, timeout=None):
+        return self.copy_manager.wait_all(jobs=jobs, timeout=timeout)
+
+    def delete(self, container_name, blob_names):
+        client = self.get_container_client(container_name)
+
+        report = {}
+
+        for idx in range(0, len(blob_names), self.batch_size):
+            batch = blob_names[idx : idx + self.batch_size]
+
+            responses = client.delete_blobs(*batch, raise_on_any_failure=False)
+
+            for blob_name, response in zip(batch, responses):
+                report[blob_name] = (
+                    "success"
+                    if response.status_code in (200, 202)
+                    else f"failed with status {response.status_code}"
+                )
+
+        return report
+
+    def exists(self, container_name, blob_name):
+        return self.get_blob_client(container_name, blob_name).exists()
+
+    def get_url(self, container_name, blob_name):
+        return self.get_blob_client(container_name, blob_name).url
+
+    def get_client_stats(self):
+        return self.client_registry.get_stats()
+
+    def get_cache_stats(self):
+        return self.blob_cache.get_stats()
+
+
+class Local_Blob_Object:
+    """
+    Description :   This class shall be used for reading a blob of the local backend through a memory map,
+                    exposing the same readall and chunks methods as a blob download
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, path, blob_name, chunk_size, container_name=None):
+        self.path = path
+
+        self.name = blob_name
+
+        self.blob_name = blob_name
+
+        self.container_name = container_name
+
+        self.chunk_size = chunk_size
+
+    def readall(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:]
+
+    def chunks(self):
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+
+            if size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, size, self.chunk_size):
+                    yield mm[start : start + self.chunk_size]
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def __repr__(self):
+        return f"Local_Blob_Object({self.blob_name})"
+
+
+class Local_Container_Object:
+    """
+    Description :   This class shall be used as the container client of the local backend, a directory holding
+                    the blobs of the container
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, backend, container_name):
+        self.backend = backend
+
+        self.container_name = container_name
+
+        self.path = backend.get_path(container_name)
+
+    def exists(self):
+        return os.path.isdir(self.path)
+
+    def get_blob_client(self, blob):
+        return self.backend.get_blob_client(self.container_name, blob)
+
+    def list_blob_names(self, name_starts_with=""):
+        return self.backend.list(self.container_name, name_starts_with)
+
+    def __repr__(self):
+        return f"Local_Container_Object({self.container_name})"
+
+
+class Local_Storage_Backend(Storage_Backend):
+    """
+    Description :   This class shall be used for storing blobs as files under a local directory, with one sub
+                    directory per container, so that the pipeline can run and be profiled without network
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.root_dir = self.config["storage"]["local_dir"]
+
+        self.chunk_size = self.config["blob_cache"]["chunk_size"]
+
+        self.results_per_page = self.config["blob_list"]["results_per_page"]
+
+        self.jobs = []
+
+        self.lock = threading.Lock()
+
+    def get_path(self, container_name, blob_name=None):
+        if blob_name is None:
+            return os.path.join(self.root_dir, container_name)
+
+        return os.path.join(
+            self.root_dir,
+            container_name,
+            *map(encode_segment, blob_name.split("/")),
+        )
+
+    def get_container_client(self, container_name):
+        return Local_Container_Object(self, container_name)
+
+    def get_blob_client(self, container_name, blob_name):
+        return Local_Blob_Object(
+            self.get_path(container_name, blob_name),
+            blob_name,
+            self.chunk_size,
+            container_name,
+        )
+
+    def get_etag(self, path, stat=None):
+        stat = os.stat(path) if stat is None else stat
+
+        return f'"0x{stat.st_mtime_ns:x}{stat.st_size:x}"'
+
+    def create_container(self, container_name):
+        path = self.get_path(container_name)
+
+        if os.path.isdir(path):
+            return False
+
+        os.makedirs(path)
+
+        return True
+
+    def delete_container(self, container_name):
+        shutil.rmtree(self.get_path(container_name))
+
+    def walk(self, container_name, prefix, delimiter=None):
+        prefix_dir = prefix.rpartition("/")[0] if "/" in prefix else None
+
+        blobs, dirs = [], [(prefix_dir, self.get_path(container_name, prefix_dir))]
+
+        while len(dirs) > 0:
+            rel_dir, dir_path = dirs.pop()
+
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.name.endswith(".tmp"):
+                            continue
+
+                        name = decode_segment(entry.name)
+
+                        if rel_dir is not None:
+                            name = rel_dir + "/" + name
+
+                        if entry.is_dir():
+                            if delimiter is None:
+                                dirs.append((name, entry.path))
+
+                            elif (name + "/").startswith(prefix):
+                                blobs.append((name + "/", None))
+
+                        elif name.startswith(prefix):
+                            blobs.append((name, entry.path))
+
+            except FileNotFoundError:
+                continue
+
+        return sorted(blobs)
+
+    def list_pages(
+        self,
+        container_name,
+        prefix,
+        results_per_page=None,
+        include=None,
+        delimiter=None,
+    ):
+        blobs = self.walk(container_name, prefix, delimiter)
+
+        page_size = (
+            self.results_per_page if results_per_page is None else results_per_page
+        )
+
+        for idx in range(0, len(blobs), page_size):
+            page = []
+
+            for name, path in blobs[idx : idx + page_size]:
+                if path is None:
+                    page.append(
+                        {
+                            "name": name,
+                            "size": None,
+                            "etag": None,
+                            "last_modified": None,
+                            "metadata": None,
+                            "is_prefix": True,
+                        }
+                    )
+
+                    continue
+
+                try:
+                    stat = os.stat(path)
+
+                except FileNotFoundError:
+                    continue
+
+                page.append(
+                    {
+                        "name": name,
+                        "size": stat.st_size,
+                        "etag": self.get_etag(path, stat),
+                        "last_modified": stat.st_mtime,
+                        "metadata": {},
+                        "is_prefix": False,
+                    }
+                )
+
+            yield page
+
+    def get(self, container_name, blob_name):
+        path = self.get_path(container_name, blob_name)
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"{blob_name} blob not found in {container_name}")
+
+        return Local_Blob_Object(path, blob_name, self.chunk_size)
+
+    def get_range(self, container_name, blob_name, offset, length):
+        with open(self.get_path(container_name, blob_name), "rb") as f:
+            f.seek(offset)
+
+            return f.read(length)
+
+    def read_versioned(self, container_name, blob_name):
+        try:
+            with open(self.get_path(container_name, blob_name), "rb") as f:
+                return f.read(), self.get_etag(f.name, os.fstat(f.fileno()))
+
+        except FileNotFoundError:
+            return None, None
+
+    def read_etag(self, container_name, blob_name):
+        try:
+            return self.get_etag(self.get_path(container_name, blob_name))
+
+        except FileNotFoundError:
+            return None
+
+    def is_match(self, path, match_conditions):
+        match_condition = match_conditions.get("match_condition")
+
+        if match_condition is None:
+            return True
+
+        etag = match_conditions.get("etag")
+
+        exists = os.path.isfile(path)
+
+        condition = match_condition.name
+
+        if condition == "IfMissing":
+            return not exists
+
+        if condition == "IfNotModified":
+            return exists and self.get_etag(path) == etag
+
+        if condition == "IfModified":
+            return not exists or self.get_etag(path) != etag
+
+        return True
+
+    def put(
+        self,
+        container_name,
+        blob_name,
+        data,
+        length,
+        match_conditions,
+        metadata=None,
+    ):
+        path = self.get_path(container_name, blob_name)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        md5 = hashlib.md5()
+
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = BytesIO(data)
+
+        with open(tmp_path, "wb") as f:
+            if hasattr(data, "read"):
+                while True:
+                    chunk = data.read(self.chunk_size)
+
+                    if not chunk:
+                        break
+
+                    md5.update(chunk)
+
+                    f.write(chunk)
+
+            else:
+                for chunk in data:
+                    md5.update(chunk)
+
+                    f.write(chunk)
+
+        with local_put_lock:
+            if not self.is_match(path, match_conditions):
+                os.remove(tmp_path)
+
+                return None
+
+            os.replace(tmp_path, path)
+
+            stat = os.stat(path)
+
+        return {
+            "etag": self.get_etag(path, stat),
+            "last_modified": stat.st_mtime,
+            "content_md5": base64.b64encode(md5.digest()).decode(),
+        }
+
+    def copy(
+        self,
+        from_container_name,
+        from_blob_name,
+        to_container_name,
+        to_blob_name,
+        size=None,
+    ):
+        source = self.get_path(from_container_name, from_blob_name)
+
+        dest = self.get_path(to_container_name, to_blob_name)
+
+        dest_blob = Local_Blob_Object(
+            dest, to_blob_name, self.chunk_size, to_container_name
+        )
+
+        try:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+            tmp_path = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+            try:
+                os.link(source, tmp_path)
+
+            except OSError:
+                shutil.copyfile(source, tmp_path)
+
+            os.replace(tmp_path, dest)
+
+            job = Copy_Job(self, source, dest_blob, "success")
+
+            stat = os.stat(dest)
+
+            job.etag, job.size = self.get_etag(dest, stat), stat.st_size
+
+        except Exception as e:
+            job = Copy_Job(self, source, dest_blob, "failed", str(e))
+
+        with self.lock:
+            self.jobs.append(job)
+
+        return job
+
+    def wait_copies(self, jobs=None, timeout=None):
+        return self.wait_all(jobs=jobs, timeout=timeout)
+
+    def wait_all(self, jobs=None, timeout=None):
+        with self.lock:
+            if jobs is None:
+                jobs, self.jobs = self.jobs, []
+
+            else:
+                waited = set(map(id, jobs))
+
+                self.jobs = [job for job in self.jobs if id(job) not in waited]
+
+        return jobs
+
+    def delete(self, container_name, blob_names):
+        report = {}
+
+        for blob_name in blob_names:
+            try:
+                os.remove(self.get_path(container_name, blob_name))
+
+                report[blob_name] = "success"
+
+            except FileNotFoundError:
+                report[blob_name] = "failed with status 404"
+
+            except Exception as e:
+                report[blob_name] = f"failed with {e}"
+
+        return report
+
+    def exists(self, container_name, blob_name):
+        return os.path.isfile(self.get_path(container_name, blob_name))
+
+    def get_url(self, container_name, blob_name):
+        return "file://" + os.path.abspath(self.get_path(container_name, blob_name))
+
+
+def get_storage_backend():
+    """
+    Method Name :   get_storage_backend
+    Description :   This method returns the storage backend selected in params.yaml
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    config = read_params()
+
+    backend = config["storage"]["backend"]
+
+    if backend == "azure":
+        return Azure_Storage_Backend()
+
+    elif backend == "local":
+        return Local_Storage_Backend()
+
+    else:
+        raise Exception(f"{backend} is not a supported storage backend")
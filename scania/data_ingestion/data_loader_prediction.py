@@ -48,7 +48,7 @@ class Data_Getter_Pred:
         )
 
         try:
-            df = self.blob.read_csv(
+            df = self.blob.read_df(
                 file_name=self.pred_file,
                 container_name=self.input_files_container,
                 db_name=self.db_name,
@@ -48,7 +48,7 @@ class Data_Getter_Train:
         )
 
         try:
-            df = self.blob.read_csv(
+            df = self.blob.read_df(
                 file_name=self.train_csv_file,
                 container_name=self.input_files_container,
                 db_name=self.db_name,
@@ -3,7 +3,7 @@ import pandas as pd
 from scania.blob_storage_operations.blob_operations import Blob_Operation
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
-from utils.logger import App_Logger
+from utils.logger import App_Logger, instrumented
 from utils.model_utils import Model_Utils
 from utils.read_params import read_params
 
@@ -36,6 +36,7 @@ class Preprocessor:
 
         self.blob = Blob_Operation()
 
+    @instrumented(db="db_name", collection="collection_name")
     def remove_columns(self, data, columns):
         """
         Method Name :   remove_columns
@@ -45,48 +46,21 @@ class Preprocessor:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.remove_columns.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=self.db_name,
-            collection_name=self.collection_name,
-        )
-
         self.data = data
 
         self.columns = columns
 
-        try:
-            self.useful_data = self.data.drop(labels=self.columns, axis=1)
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info=f"Dropped {columns} from {data}",
-            )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        self.useful_data = self.data.drop(labels=self.columns, axis=1)
 
-            return self.useful_data
+        self.log_writer.log(
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+            log_info=f"Dropped {columns} from {data}",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        return self.useful_data
 
+    @instrumented(db="db_name", collection="collection_name")
     def separate_label_feature(self, data, label_column_name):
         """
         Method Name :   separate_label_feature
@@ -96,45 +70,17 @@ class Preprocessor:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.separate_label_feature.__name__
+        self.X = data.drop(labels=label_column_name, axis=1)
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.Y = data[label_column_name]
+
+        self.log_writer.log(
             db_name=self.db_name,
             collection_name=self.collection_name,
+            log_info=f"Separated {label_column_name} from {data}",
         )
 
-        try:
-            self.X = data.drop(labels=label_column_name, axis=1)
-
-            self.Y = data[label_column_name]
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info=f"Separated {label_column_name} from {data}",
-            )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
-
-            return self.X, self.Y
-
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        return self.X, self.Y
 
     def replace_invalid_values(self, data):
         """
@@ -179,6 +125,7 @@ class Preprocessor:
                 collection_name=self.collection_name,
             )
 
+    @instrumented(db="db_name", collection="collection_name")
     def is_null_present(self, data):
         """
         Method Name :   is_null_present
@@ -189,99 +136,71 @@ class Preprocessor:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.is_null_present.__name__
+        null_present = False
+
+        cols_with_missing_values = []
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        cols = data.columns
+
+        self.null_counts = data.isna().sum()
+
+        self.log_writer.log(
             db_name=self.db_name,
             collection_name=self.collection_name,
+            log_info=f"Null values count is : {self.null_counts}",
         )
 
-        null_present = False
-
-        cols_with_missing_values = []
+        for i in range(len(self.null_counts)):
+            if self.null_counts[i] > 0:
+                null_present = True
 
-        cols = data.columns
+                cols_with_missing_values.append(cols[i])
 
-        try:
-            self.null_counts = data.isna().sum()
+        self.log_writer.log(
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+            log_info="created cols with missing values",
+        )
 
+        if null_present:
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
-                log_info=f"Null values count is : {self.null_counts}",
+                log_info="null values were found the columns...preparing dataframe with null values",
             )
 
-            for i in range(len(self.null_counts)):
-                if self.null_counts[i] > 0:
-                    null_present = True
+            self.dataframe_with_null = pd.DataFrame()
+
+            self.dataframe_with_null["columns"] = data.columns
 
-                    cols_with_missing_values.append(cols[i])
+            self.dataframe_with_null["missing values count"] = np.asarray(
+                data.isna().sum()
+            )
 
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
-                log_info="created cols with missing values",
+                log_info="Created dataframe with null values",
             )
 
-            if null_present:
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.collection_name,
-                    log_info="null values were found the columns...preparing dataframe with null values",
-                )
-
-                self.dataframe_with_null = pd.DataFrame()
-
-                self.dataframe_with_null["columns"] = data.columns
-
-                self.dataframe_with_null["missing values count"] = np.asarray(
-                    data.isna().sum()
-                )
-
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.collection_name,
-                    log_info="Created dataframe with null values",
-                )
-
-                self.blob.upload_df_as_csv(
-                    dataframe=self.dataframe_with_null,
-                    local_file_name=self.null_values_file,
-                    container_file_name=self.input_files_container,
-                    container_name=self.input_files_container,
-                    db_name=self.db_name,
-                    collection_name=self.collection_name,
-                )
-
-            else:
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.collection_name,
-                    log_info="No null values are present in cols. Skipped the creation of dataframe",
-                )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
+            self.blob.upload_df_as_csv(
+                dataframe=self.dataframe_with_null,
+                local_file_name=self.null_values_file,
+                container_file_name=self.input_files_container,
+                container_name=self.input_files_container,
                 db_name=self.db_name,
                 collection_name=self.collection_name,
             )
 
-            return null_present
-
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
+        else:
+            self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
+                log_info="No null values are present in cols. Skipped the creation of dataframe",
             )
 
+        return null_present
+
     def encode_target_cols(self, data):
         """
         Method Name :   encode_target_cols
@@ -444,6 +363,7 @@ class Preprocessor:
                 collection_name=self.collection_name,
             )
 
+    @instrumented(db="db_name", collection="collection_name")
     def scale_numerical_columns(self, data):
         """
         Method Name : scale_numerical_columns
@@ -454,64 +374,37 @@ class Preprocessor:
         Version     : 1.2
         Revisions   : moved setup to cloud
         """
-        method_name = self.scale_numerical_columns.__name__
+        self.data = data
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.scaler = StandardScaler()
+
+        self.log_writer.log(
             db_name=self.db_name,
             collection_name=self.collection_name,
+            log_info=f"Initialized {self.scaler.__class__.__name__}",
         )
 
-        self.data = data
-
-        try:
-            self.scaler = StandardScaler()
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info=f"Initialized {self.scaler.__class__.__name__}",
-            )
-
-            self.scaled_data = self.scaler.fit_transform(self.data)
+        self.scaled_data = self.scaler.fit_transform(self.data)
 
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info=f"Transformed data using {self.scaler.__class__.__name__}",
-            )
-
-            self.scaled_num_df = pd.DataFrame(
-                data=self.scaled_data, columns=self.data.columns, index=self.data.index
-            )
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info="Converted transformed data to dataframe",
-            )
+        self.log_writer.log(
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+            log_info=f"Transformed data using {self.scaler.__class__.__name__}",
+        )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        self.scaled_num_df = pd.DataFrame(
+            data=self.scaled_data, columns=self.data.columns, index=self.data.index
+        )
 
-            return self.scaled_num_df
+        self.log_writer.log(
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+            log_info="Converted transformed data to dataframe",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        return self.scaled_num_df
 
+    @instrumented(db="db_name", collection="collection_name")
     def get_columns_with_zero_std_deviation(self, data):
         """
         Method Name :   get_columns_with_zero_std_deviation
@@ -522,42 +415,14 @@ class Preprocessor:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.get_columns_with_zero_std_deviation.__name__
+        data_n = data.describe()
+
+        cols_to_drop = [x for x in data.columns if data_n[x]["std"] == 0]
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=self.db_name,
             collection_name=self.collection_name,
+            log_info="Got cols with zero standard deviation",
         )
 
-        try:
-            data_n = data.describe()
-
-            cols_to_drop = [x for x in data.columns if data_n[x]["std"] == 0]
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info="Got cols with zero standard deviation",
-            )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
-
-            return cols_to_drop
-
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-            )
+        return cols_to_drop
@@ -47,7 +47,7 @@ class Data_Transform_Pred:
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
+            lst = self.blob.read_df_from_folder(
                 folder_name=self.good_pred_data_dir,
                 container_name=self.pred_data_container,
                 db_name=self.db_name,
@@ -75,9 +75,8 @@ class Data_Transform_Pred:
                     log_info=f"Quotes added for the file {file}",
                 )
 
-                self.blob.upload_df_as_csv(
+                self.blob.upload_df(
                     dataframe=df,
-                    local_file_name=abs_f,
                     container_file_name=file,
                     container_name=self.pred_data_container,
                     db_name=self.db_name,
@@ -55,7 +55,7 @@ class DB_Operation_Train:
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
+            lst = self.blob.read_df_from_folder(
                 folder_name=self.good_data_train_dir,
                 container_name=self.train_data_container,
                 db_name=self.db_name,
@@ -67,22 +67,22 @@ class DB_Operation_Train:
 
                 file = f[2]
 
-                if file.endswith(".csv"):
-                    self.mongo.insert_dataframe_as_record(
+                if file.endswith((".csv", ".parquet")):
+                    result = self.mongo.insert_dataframe_as_record(
                         data_frame=df,
                         db_name=good_data_db_name,
                         collection_name=good_data_collection_name,
                     )
 
+                    self.log_writer.log(
+                        db_name=self.db_name,
+                        collection_name=self.train_db_insert_log,
+                        log_info=f"Inserted {result['documents']} records of {file} file in {result['chunks']} chunks at {result['docs_per_sec']:.0f} docs/s",
+                    )
+
                 else:
                     pass
 
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.train_db_insert_log,
-                    log_info="Inserted dataframe as collection record in mongodb",
-                )
-
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -121,9 +121,8 @@ class DB_Operation_Train:
                 collection_name=good_data_collection_name,
             )
 
-            self.blob.upload_df_as_csv(
+            self.blob.upload_df(
                 dataframe=df,
-                local_file_name=self.train_export_csv_file,
                 container_file_name=self.train_export_csv_file,
                 container_name=self.input_files_container,
                 db_name=self.db_name,
@@ -648,6 +648,8 @@ class MLFlow_Operation:
 
             current_version = model_version
 
+            job = None
+
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
@@ -691,7 +693,7 @@ class MLFlow_Operation:
                     log_info=f"Transitioned {model_name} to {stage} in mlflow",
                 )
 
-                self.blob.copy_data(
+                job = self.blob.copy_data(
                     from_file_name=trained_model_file,
                     from_container_name=from_container_name,
                     to_file_name=prod_model_file,
@@ -715,7 +717,7 @@ class MLFlow_Operation:
                     log_info=f"Transitioned {model_name} to {stage} in mlflow",
                 )
 
-                self.blob.copy_data(
+                job = self.blob.copy_data(
                     from_file_name=trained_model_file,
                     from_container_name=from_container_name,
                     to_file_name=stag_model_file,
@@ -739,6 +741,8 @@ class MLFlow_Operation:
                 collection_name=self.collection_name,
             )
 
+            return job
+
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
@@ -1,6 +1,11 @@
+import json
+from datetime import datetime
+
 from scania.blob_storage_operations.blob_operations import Blob_Operation
 from scania.mlflow_utils.mlflow_operations import MLFlow_Operation
+from scania.model.model_cache import get_prod_model_cache
 from utils.logger import App_Logger
+from utils.model_utils import get_cluster_number
 from utils.read_params import read_params
 
 
@@ -31,12 +36,35 @@ class Load_Prod_Model:
 
         self.stag_model_dir = self.config["models_dir"]["stag"]
 
+        self.prod_model_manifest = self.config["models_dir"]["prod_manifest"]
+
         self.exp_name = self.config["mlflow_config"]["experiment_name"]
 
         self.blob = Blob_Operation()
 
         self.mlflow_op = MLFlow_Operation(table_name=self.load_prod_model_log)
 
+    def get_cluster_number(self, metric_name):
+        """
+        Method Name :   get_cluster_number
+        Description :   This method returns the cluster number of a metric like metrics.XGBoost1-best_score
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        if not metric_name.endswith("-best_score"):
+            return None
+
+        return get_cluster_number(metric_name)
+
+    def get_manifest_entry(self, model_name, version, job):
+        return {
+            "model": model_name,
+            "file": None if job is None else job.dest_blob.blob_name,
+            "version": str(version),
+            "etag": None if job is None else job.etag,
+        }
+
     def load_production_model(self):
         """
         Method Name :   load_production_model
@@ -129,12 +157,10 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
             """
 
             best_metrics_names = [
-                max(
-                    [
-                        (file, metrics_dict[file])[0]
-                        for file in metrics_dict
-                        if str(i) in file
-                    ]
+                next(
+                    file
+                    for file in metrics_dict
+                    if self.get_cluster_number(metric_name=file) == i
                 )
                 for i in range(0, self.num_clusters)
             ]
@@ -167,10 +193,12 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
             ## we are checking if the model name is in the top 3 model list, if present we are putting that
             ## model into production or staging
 
+            prod_models = {}
+
             for res in results:
                 for mv in res.latest_versions:
                     if mv.name in top_mn_lst:
-                        self.mlflow_op.transition_mlflow_model(
+                        job = self.mlflow_op.transition_mlflow_model(
                             model_version=mv.version,
                             stage="Production",
                             model_name=mv.name,
@@ -178,11 +206,15 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
                             to_container_name=self.model_container,
                         )
 
+                        prod_models[mv.name] = self.get_manifest_entry(
+                            model_name=mv.name, version=mv.version, job=job
+                        )
+
                     ## In the registered models, even kmeans model is present, so during prediction,
                     ## this model also needs to be in present in production, the code logic is present below
 
                     elif mv.name == "KMeans":
-                        self.mlflow_op.transition_mlflow_model(
+                        job = self.mlflow_op.transition_mlflow_model(
                             model_version=mv.version,
                             stage="Production",
                             model_name=mv.name,
@@ -190,6 +222,10 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
                             to_container_name=self.model_container,
                         )
 
+                        prod_models[mv.name] = self.get_manifest_entry(
+                            model_name=mv.name, version=mv.version, job=job
+                        )
+
                     else:
                         self.mlflow_op.transition_mlflow_model(
                             model_version=mv.version,
@@ -205,6 +241,37 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
                 log_info="Transitioning of models based on scores successfully done",
             )
 
+            manifest = {
+                "kmeans": prod_models.get("KMeans"),
+                "clusters": {
+                    str(i): prod_models.get(model_name)
+                    for i, model_name in enumerate(top_mn_lst)
+                },
+                "created_at": datetime.now().isoformat(),
+            }
+
+            self.blob.upload_bytes(
+                data=json.dumps(manifest).encode(),
+                container_file_name=self.prod_model_manifest,
+                container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.load_prod_model_log,
+            )
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.load_prod_model_log,
+                log_info=f"Wrote production manifest for {len(top_mn_lst)} clusters to {self.prod_model_manifest} file",
+            )
+
+            get_prod_model_cache().refresh_in_background()
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.load_prod_model_log,
+                log_info="Started background refresh of production model cache",
+            )
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -0,0 +1,327 @@
+import os
+import threading
+import time
+
+from scania.blob_storage_operations.blob_operations import Blob_Operation
+from utils.logger import App_Logger
+from utils.metrics import MODEL_CACHE_REQUESTS
+from utils.read_params import read_params
+
+
+class Prod_Model_Cache:
+    """
+    Description :   This class shall be used for keeping the production models in memory keyed by model name
+                    and blob etag, refreshed in the background and swapped as one snapshot so that a request
+                    always sees a consistent set of models
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.db_name = self.config["db_log"]["db_pred_log"]
+
+        self.collection_name = self.config["pred_db_log"]["model_cache"]
+
+        self.model_container = self.config["container"]["phising_model_container"]
+
+        self.prod_model_dir = self.config["models_dir"]["prod"]
+
+        self.prod_model_manifest = self.config["models_dir"]["prod_manifest"]
+
+        self.model_save_format = self.config["model_utils"]["save_format"]
+
+        self.model_legacy_save_format = self.config["model_utils"]["legacy_save_format"]
+
+        self.refresh_interval = self.config["model_cache"]["refresh_interval"]
+
+        self.log_writer = App_Logger()
+
+        self.snapshot = {"models": {}, "etags": {}, "clusters": None, "loaded_at": None}
+
+        self.lock = threading.Lock()
+
+        self.refresh_lock = threading.Lock()
+
+        self.refresh_thread = None
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "models_reused": 0,
+            "models_loaded": 0,
+            "load_seconds_total": 0.0,
+            "last_load_seconds": 0.0,
+            "last_refresh_seconds": 0.0,
+        }
+
+    def get_manifest_files(self, blob):
+        """
+        Method Name :   get_manifest_files
+        Description :   This method reads the production manifest and returns the model files with their etags
+                        along with the cluster to model mapping, or None when there is no manifest
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        if not blob.load_file(
+            file_name=self.prod_model_manifest,
+            container_name=self.model_container,
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+        ):
+            return None, None
+
+        manifest = blob.read_json(
+            file_name=self.prod_model_manifest,
+            container_name=self.model_container,
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+        )
+
+        entries = [manifest["kmeans"]] + list(manifest["clusters"].values())
+
+        files = [
+            (entry["model"], entry["file"], entry["etag"])
+            for entry in entries
+            if entry is not None and entry["file"] is not None
+        ]
+
+        clusters = {
+            cluster: entry["model"]
+            for cluster, entry in manifest["clusters"].items()
+            if entry is not None
+        }
+
+        return files, clusters
+
+    def get_listed_files(self, blob):
+        files = []
+
+        for f in blob.iter_blobs(
+            folder_name=self.prod_model_dir.rstrip("/"),
+            container_name=self.model_container,
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+        ):
+            if not f["name"].endswith(
+                (self.model_save_format, self.model_legacy_save_format)
+            ):
+                continue
+
+            files.append((f["name"].rsplit(".", 1)[0].split("/")[-1], f["name"], f["etag"]))
+
+        return files
+
+    def refresh(self):
+        """
+        Method Name :   refresh
+        Description :   This method reads the production models from the manifest, or a listing when there is
+                        none, and loads the ones whose etag changed, reusing the loaded models otherwise, then
+                        swaps in the new snapshot
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.refresh.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+        )
+
+        try:
+            with self.refresh_lock:
+                start = time.perf_counter()
+
+                blob = Blob_Operation()
+
+                current = self.snapshot
+
+                models, etags = {}, {}
+
+                hits, misses, load_seconds = 0, 0, 0.0
+
+                files, clusters = self.get_manifest_files(blob)
+
+                if files is None:
+                    files = self.get_listed_files(blob)
+
+                for model_name, file_name, etag in files:
+                    if model_name in models:
+                        continue
+
+                    if etag is not None and current["etags"].get(model_name) == etag:
+                        models[model_name] = current["models"][model_name]
+
+                        hits += 1
+
+                    else:
+                        load_start = time.perf_counter()
+
+                        models[model_name] = blob.load_model(
+                            model_name=file_name.rsplit(".", 1)[0],
+                            container_name=self.model_container,
+                            db_name=self.db_name,
+                            collection_name=self.collection_name,
+                        )
+
+                        load_seconds += time.perf_counter() - load_start
+
+                        misses += 1
+
+                    etags[model_name] = etag
+
+                self.snapshot = {
+                    "models": models,
+                    "etags": etags,
+                    "clusters": clusters,
+                    "loaded_at": time.monotonic(),
+                }
+
+                with self.lock:
+                    self.stats["refreshes"] += 1
+
+                    self.stats["models_reused"] += hits
+
+                    self.stats["models_loaded"] += misses
+
+                    self.stats["load_seconds_total"] += load_seconds
+
+                    if misses > 0:
+                        self.stats["last_load_seconds"] = load_seconds
+
+                    self.stats["last_refresh_seconds"] = time.perf_counter() - start
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+                log_info=f"Refreshed production model cache with {len(models)} models, {hits} reused and {misses} loaded in {load_seconds:.3f}s",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+            return self.snapshot
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+    def run_refresh(self):
+        try:
+            self.refresh()
+
+        except Exception:
+            pass
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refresh_thread is not None and self.refresh_thread.is_alive():
+                return self.refresh_thread
+
+            self.refresh_thread = threading.Thread(
+                target=self.run_refresh, name="prod-model-cache-refresh", daemon=True
+            )
+
+            self.refresh_thread.start()
+
+            return self.refresh_thread
+
+    def get_snapshot(self):
+        """
+        Method Name :   get_snapshot
+        Description :   This method returns the current snapshot of models and cluster mapping, loading it on
+                        first use and starting a background refresh once it is older than the refresh interval
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        snapshot = self.snapshot
+
+        if snapshot["loaded_at"] is None:
+            with self.lock:
+                self.stats["misses"] += 1
+
+            MODEL_CACHE_REQUESTS.labels(result="miss").inc()
+
+            snapshot = self.refresh()
+
+        else:
+            with self.lock:
+                self.stats["hits"] += 1
+
+            MODEL_CACHE_REQUESTS.labels(result="hit").inc()
+
+            if time.monotonic() - snapshot["loaded_at"] > self.refresh_interval:
+                self.refresh_in_background()
+
+        return snapshot
+
+    def get_models(self):
+        return self.get_snapshot()["models"]
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+
+        requests = stats["hits"] + stats["misses"]
+
+        stats["hit_rate"] = stats["hits"] / requests if requests > 0 else 0.0
+
+        stats["models"] = sorted(self.snapshot["models"])
+
+        return stats
+
+
+_cache = None
+
+_cache_lock = threading.Lock()
+
+
+def get_prod_model_cache():
+    """
+    Method Name :   get_prod_model_cache
+    Description :   This method returns the process wide production model cache
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = Prod_Model_Cache()
+
+        return _cache
+
+
+def _reset_cache_after_fork():
+    if _cache is not None:
+        _cache.lock = threading.Lock()
+
+        _cache.refresh_lock = threading.Lock()
+
+        _cache.refresh_thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_cache_after_fork)
@@ -2,7 +2,9 @@ import pandas as pd
 from scania.blob_storage_operations.blob_operations import Blob_Operation
 from scania.data_ingestion.data_loader_prediction import Data_Getter_Pred
 from scania.data_preprocessing.preprocessing import Preprocessor
+from scania.model.model_cache import get_prod_model_cache
 from utils.logger import App_Logger
+from utils.model_utils import get_cluster_number
 from utils.read_params import read_params
 
 
@@ -33,6 +35,8 @@ class Prediction:
 
         self.blob = Blob_Operation()
 
+        self.model_cache = get_prod_model_cache()
+
         self.data_getter_pred = Data_Getter_Pred(
             db_name=self.db_name, collection_name=self.pred_log
         )
@@ -107,10 +111,11 @@ class Prediction:
                 collection_name=self.pred_log,
             )
 
-    def find_correct_model_file(self, cluster_number, container_name):
+    def find_correct_model_file(self, cluster_number, snapshot):
         """
         Method Name :   find_correct_model_file
-        Description :   This method is used for finding the correct model file during prediction
+        Description :   This method is used for finding the model of the cluster from the production manifest,
+                        searching the cached model names for production models without a manifest
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
@@ -126,27 +131,27 @@ class Prediction:
         )
 
         try:
-            list_of_files = self.blob.get_files_from_folder(
-                folder_name=self.prod_model_dir,
-                container_name=container_name,
-                db_name=self.db_name,
-                collection_name=container_name,
-            )
+            if snapshot["clusters"] is not None:
+                model_name = snapshot["clusters"][str(int(cluster_number))]
 
-            for file in list_of_files:
-                try:
-                    if file.index(str(cluster_number)) != -1:
-                        model_name = file
+            else:
+                model_names = [
+                    name
+                    for name in snapshot["models"]
+                    if get_cluster_number(name) == int(cluster_number)
+                ]
 
-                except:
-                    continue
+                if len(model_names) != 1:
+                    raise Exception(
+                        f"Found {len(model_names)} production models for {cluster_number} cluster"
+                    )
 
-            model_name = model_name.split(".")[0]
+                model_name = model_names[0]
 
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.pred_log,
-                log_info=f"Got {model_name} from {self.prod_model_dir} folder in {container_name} container",
+                log_info=f"Got {model_name} from production model cache",
             )
 
             self.log_writer.start_log(
@@ -208,13 +213,11 @@ class Prediction:
 
             X = self.preprocessor.apply_pca_transform(X_scaled_data=X)
 
-            kmeans = self.blob.load_model(
-                model_name="KMeans",
-                container_name=self.model_container,
-                model_dir=self.prod_model_dir,
-                db_name=self.db_name,
-                collection_name=self.pred_log,
-            )
+            snapshot = self.model_cache.get_snapshot()
+
+            models = snapshot["models"]
+
+            kmeans = models["KMeans"]
 
             clusters = kmeans.predict(data)
 
@@ -232,17 +235,10 @@ class Prediction:
                 cluster_data = cluster_data.drop(["clusters"], axis=1)
 
                 crt_model_name = self.find_correct_model_file(
-                    cluster_number=i,
-                    container_name=self.model_container,
+                    cluster_number=i, snapshot=snapshot
                 )
 
-                model = self.blob.load_model(
-                    model_name=crt_model_name,
-                    container_name=self.model_container,
-                    model_dir=self.prod_model_dir,
-                    db_name=self.db_name,
-                    collection_name=self.pred_log,
-                )
+                model = models[crt_model_name]
 
                 result = list(model.predict(cluster_data))
 
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+
+from pymongo import MongoClient, monitoring
+from utils.read_params import read_params
+
+
+class Pool_Wait_Listener(monitoring.ConnectionPoolListener):
+    """
+    Description :   This class shall be used for measuring how long the threads of the process wait to check out
+                    a connection from the mongodb connection pool
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+
+        self.lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+        self.stats = {
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "checkout_wait_total": 0.0,
+            "checkout_wait_max": 0.0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "pools_cleared": 0,
+        }
+
+    def end_checkout(self, key):
+        start = getattr(self.local, "checkout_start", None)
+
+        wait = 0.0 if start is None else time.perf_counter() - start
+
+        self.local.checkout_start = None
+
+        with self.lock:
+            self.stats[key] += 1
+
+            self.stats["checkout_wait_total"] += wait
+
+            self.stats["checkout_wait_max"] = max(self.stats["checkout_wait_max"], wait)
+
+    def connection_check_out_started(self, event):
+        self.local.checkout_start = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self.end_checkout("checkouts")
+
+    def connection_check_out_failed(self, event):
+        self.end_checkout("checkout_failures")
+
+    def connection_created(self, event):
+        with self.lock:
+            self.stats["connections_created"] += 1
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.stats["connections_closed"] += 1
+
+    def pool_cleared(self, event):
+        with self.lock:
+            self.stats["pools_cleared"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+
+        requests = stats["checkouts"] + stats["checkout_failures"]
+
+        stats["checkout_wait_avg"] = (
+            stats["checkout_wait_total"] / requests if requests > 0 else 0.0
+        )
+
+        return stats
+
+
+class Mongo_Client_Registry:
+    """
+    Description :   This class shall be used for keeping one mongodb client for the whole process, created on
+                    first use with the pool, timeout and compression settings of params.yaml and recreated in
+                    forked children
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.DB_URL = os.environ["MONGODB_URL"]
+
+        self.max_pool_size = self.config["mongo_client"]["max_pool_size"]
+
+        self.min_pool_size = self.config["mongo_client"]["min_pool_size"]
+
+        self.max_idle_time_ms = self.config["mongo_client"]["max_idle_time_ms"]
+
+        self.wait_queue_timeout_ms = self.config["mongo_client"]["wait_queue_timeout_ms"]
+
+        self.connect_timeout_ms = self.config["mongo_client"]["connect_timeout_ms"]
+
+        self.socket_timeout_ms = self.config["mongo_client"]["socket_timeout_ms"]
+
+        self.server_selection_timeout_ms = self.config["mongo_client"][
+            "server_selection_timeout_ms"
+        ]
+
+        self.compressors = self.config["mongo_client"]["compressors"] or []
+
+        self.listener = Pool_Wait_Listener()
+
+        self.lock = threading.RLock()
+
+        self.reset()
+
+    def reset(self):
+        """
+        Method Name :   reset
+        Description :   This method drops the client without closing it, used after fork where its sockets and
+                        monitor threads still belong to the parent process
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.pid = os.getpid()
+
+        self.client = None
+
+        self.counters = {"clients_created": 0, "clients_reused": 0}
+
+        self.listener.reset()
+
+    def get_client(self):
+        """
+        Method Name :   get_client
+        Description :   This method returns the shared mongodb client, creating it on first use
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+
+            if self.client is not None:
+                self.counters["clients_reused"] += 1
+
+                return self.client
+
+            options = {
+                "maxPoolSize": self.max_pool_size,
+                "minPoolSize": self.min_pool_size,
+                "maxIdleTimeMS": self.max_idle_time_ms,
+                "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+                "connectTimeoutMS": self.connect_timeout_ms,
+                "socketTimeoutMS": self.socket_timeout_ms,
+                "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            }
+
+            if self.compressors:
+                options["compressors"] = ",".join(self.compressors)
+
+            self.client = MongoClient(
+                self.DB_URL, event_listeners=[self.listener], **options
+            )
+
+            self.counters["clients_created"] += 1
+
+            return self.client
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+
+        stats.update(self.listener.get_stats())
+
+        return stats
+
+    def close(self):
+        """
+        Method Name :   close
+        Description :   This method closes the shared client, the next call recreates it
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            if self.client is not None and self.pid == os.getpid():
+                self.client.close()
+
+            self.reset()
+
+
+_registry = None
+
+_registry_lock = threading.Lock()
+
+
+def get_mongo_client_registry():
+    """
+    Method Name :   get_mongo_client_registry
+    Description :   This method returns the process wide mongodb client registry
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = Mongo_Client_Registry()
+
+        return _registry
+
+
+def get_mongo_client():
+    return get_mongo_client_registry().get_client()
+
+
+def close_mongo_client():
+    """
+    Method Name :   close_mongo_client
+    Description :   This method closes the process wide mongodb client if it was created
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+
+
+def _reset_registry_after_fork():
+    if _registry is not None:
+        _registry.lock = threading.RLock()
+
+        _registry.listener.lock = threading.Lock()
+
+        _registry.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_registry_after_fork)
@@ -1,9 +1,12 @@
-import json
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
-from pymongo import MongoClient
+from scania.mongo_db_operations.mongo_client import get_mongo_client
+from utils.metrics import MONGO_INSERTS
 from utils.read_params import read_params
+from utils.run_context import submit_with_context
 
 
 class MongoDB_Operation:
@@ -19,9 +22,9 @@ class MongoDB_Operation:
 
         self.class_name = self.__class__.__name__
 
-        self.DB_URL = os.environ["MONGODB_URL"]
+        self.insert_chunk_size = self.config["mongodb"]["insert_chunk_size"]
 
-        self.client = MongoClient(self.DB_URL)
+        self.insert_workers = self.config["mongodb"]["insert_workers"]
 
     def get_database(self, db_name):
         """
@@ -32,7 +35,7 @@ class MongoDB_Operation:
         Revisions   :   moved setup to cloud
         """
         try:
-            db = self.client[db_name]
+            db = get_mongo_client()[db_name]
 
             return db
 
@@ -80,16 +83,54 @@ class MongoDB_Operation:
         except Exception as e:
             raise e
 
-    def insert_dataframe_as_record(self, data_frame, db_name, collection_name):
+    def get_column_values(self, column):
+        """
+        Method Name :   get_column_values
+        Description :   This method is used for converting a dataframe column to an array of python values, with
+                        missing values as None
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        if column.dtype == np.float32:
+            column = column.astype(np.float64)
+
+        values = column.to_numpy(dtype=object)
+
+        mask = column.isna().to_numpy()
+
+        if mask.any():
+            values[mask] = None
+
+        return values
+
+    def insert_chunk(self, collection, columns, values, start, end):
+        records = [
+            dict(zip(columns, row)) for row in zip(*[arr[start:end] for arr in values])
+        ]
+
+        collection.insert_many(records, ordered=False)
+
+        return len(records)
+
+    def insert_dataframe_as_record(
+        self, data_frame, db_name, collection_name, chunk_size=None, workers=None
+    ):
         """
         Method Name :   insert_dataframe_as_record
-        Description :   This method is used for inserting the dataframe in collection as record
+        Description :   This method is used for inserting the dataframe in collection as record, built from the
+                        column arrays and sent in unordered chunks, in parallel when more than one worker is set,
+                        and returns the documents inserted along with the documents per second
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
         try:
-            records = json.loads(data_frame.T.to_json()).values()
+            start_time = time.perf_counter()
+
+            chunk_size = chunk_size or self.insert_chunk_size
+
+            workers = workers or self.insert_workers
 
             database = self.get_database(db_name)
 
@@ -97,7 +138,53 @@ class MongoDB_Operation:
                 collection_name=collection_name, database=database
             )
 
-            collection.insert_many(records)
+            columns = [str(col) for col in data_frame.columns]
+
+            values = [
+                self.get_column_values(data_frame.iloc[:, idx])
+                for idx in range(data_frame.shape[1])
+            ]
+
+            bounds = [
+                (start, min(start + chunk_size, data_frame.shape[0]))
+                for start in range(0, data_frame.shape[0], chunk_size)
+            ]
+
+            if workers > 1 and len(bounds) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(workers, len(bounds))
+                ) as executor:
+                    futures = [
+                        submit_with_context(
+                            executor,
+                            self.insert_chunk,
+                            collection,
+                            columns,
+                            values,
+                            start,
+                            end,
+                        )
+                        for start, end in bounds
+                    ]
+
+                    documents = sum(future.result() for future in futures)
+
+            else:
+                documents = sum(
+                    self.insert_chunk(collection, columns, values, start, end)
+                    for start, end in bounds
+                )
+
+            MONGO_INSERTS.labels(db_name=db_name).inc(documents)
+
+            seconds = time.perf_counter() - start_time
+
+            return {
+                "documents": documents,
+                "chunks": len(bounds),
+                "seconds": seconds,
+                "docs_per_sec": documents / seconds if seconds > 0 else 0.0,
+            }
 
         except Exception as e:
             raise e
@@ -119,5 +206,93 @@ class MongoDB_Operation:
 
             collection.insert_one(data)
 
+            MONGO_INSERTS.labels(db_name=db_name).inc()
+
+        except Exception as e:
+            raise e
+
+    def ensure_log_collection(
+        self, db_name, collection_name, mode, ttl_seconds, capped_size, capped_max
+    ):
+        """
+        Method Name :   ensure_log_collection
+        Description :   This method creates the log collection as capped when it does not exist, or adds a ttl
+                        index on the log timestamp, along with the run id and timestamp index used to read the
+                        logs of one run
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            if mode == "capped" and collection_name not in db.list_collection_names(
+                filter={"name": collection_name}
+            ):
+                db.create_collection(
+                    collection_name, capped=True, size=capped_size, max=capped_max
+                )
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            if mode == "ttl":
+                collection.create_index(
+                    "Log_Timestamp",
+                    expireAfterSeconds=ttl_seconds,
+                    name="log_timestamp_ttl",
+                )
+
+            collection.create_index(
+                [("Run_Id", 1), ("Log_Timestamp", 1)], name="run_id_log_timestamp"
+            )
+
+        except Exception as e:
+            raise e
+
+    def get_run_records(self, db_name, collection_name, run_id):
+        """
+        Method Name :   get_run_records
+        Description :   This method is used for getting the log records of a run in the order they were written
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            return list(
+                collection.find({"Run_Id": run_id}, {"_id": 0}).sort(
+                    [("Run_Id", 1), ("Log_Timestamp", 1)]
+                )
+            )
+
+        except Exception as e:
+            raise e
+
+    def insert_records(self, db_name, collection_name, data):
+        """
+        Method Name :   insert_records
+        Description :   This method is used for inserting a batch of records in database collection
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            collection.insert_many(data, ordered=False)
+
+            MONGO_INSERTS.labels(db_name=db_name).inc(len(data))
+
         except Exception as e:
             raise e
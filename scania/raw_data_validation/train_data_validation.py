@@ -40,6 +40,8 @@ class Raw_Train_Data_Validation:
 
         self.good_train_data_dir = self.config["data"]["train"]["good"]
 
+        self.good_data_file_ext = self.config["data_format"]["good_data_file_ext"]
+
         self.bad_train_data_dir = self.config["data"]["train"]["bad"]
 
         self.train_gen_log = self.config["train_db_log"]["general"]
@@ -197,49 +199,62 @@ class Raw_Train_Data_Validation:
         )
 
         try:
-            onlyfiles = self.blob.get_files_from_folder(
+            for page in self.blob.iter_blob_pages(
                 db_name=self.db_name,
                 collection_name=self.train_name_valid_log,
                 container_name=self.raw_data_container_name,
                 folder_name=self.raw_train_data_dir,
-            )
-
-            train_batch_files = [f.split("/")[1] for f in onlyfiles]
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.train_name_valid_log,
-                log_info="Got training files with exact name",
-            )
-
-            for filename in train_batch_files:
-                raw_data_train_filename = self.raw_train_data_dir + "/" + filename
-
-                good_data_train_filename = self.good_train_data_dir + "/" + filename
-
-                bad_data_train_filename = self.bad_train_data_dir + "/" + filename
-
+            ):
                 self.log_writer.log(
                     db_name=self.db_name,
                     collection_name=self.train_name_valid_log,
-                    log_info="Created raw,good and bad data filenames",
+                    log_info=f"Got {len(page)} training files with exact name",
                 )
 
-                if re.match(regex, filename):
-                    splitAtDot = re.split(".csv", filename)
+                for blob in page:
+                    filename = blob["name"].split("/")[1]
 
-                    splitAtDot = re.split("_", splitAtDot[0])
+                    raw_data_train_filename = self.raw_train_data_dir + "/" + filename
 
-                    if len(splitAtDot[1]) == LengthOfDateStampInFile:
-                        if len(splitAtDot[2]) == LengthOfTimeStampInFile:
-                            self.blob.copy_data(
-                                from_file_name=raw_data_train_filename,
-                                from_container_name=self.raw_data_container_name,
-                                to_file_name=good_data_train_filename,
-                                to_container_name=self.train_data_container,
-                                db_name=self.db_name,
-                                collection_name=self.train_name_valid_log,
-                            )
+                    good_data_train_filename = self.good_train_data_dir + "/" + filename
+
+                    bad_data_train_filename = self.bad_train_data_dir + "/" + filename
+
+                    self.log_writer.log(
+                        db_name=self.db_name,
+                        collection_name=self.train_name_valid_log,
+                        log_info="Created raw,good and bad data filenames",
+                    )
+
+                    if re.match(regex, filename):
+                        splitAtDot = re.split(".csv", filename)
+
+                        splitAtDot = re.split("_", splitAtDot[0])
+
+                        if len(splitAtDot[1]) == LengthOfDateStampInFile:
+                            if len(splitAtDot[2]) == LengthOfTimeStampInFile:
+                                self.blob.copy_data(
+                                    from_file_name=raw_data_train_filename,
+                                    from_container_name=self.raw_data_container_name,
+                                    to_file_name=good_data_train_filename,
+                                    to_container_name=self.train_data_container,
+                                    db_name=self.db_name,
+                                    collection_name=self.train_name_valid_log,
+                                    wait=False,
+                                    size=blob["size"],
+                                )
+
+                            else:
+                                self.blob.copy_data(
+                                    from_file_name=raw_data_train_filename,
+                                    from_container_name=self.raw_data_container_name,
+                                    to_file_name=bad_data_train_filename,
+                                    to_container_name=self.train_data_container,
+                                    db_name=self.db_name,
+                                    collection_name=self.train_name_valid_log,
+                                    wait=False,
+                                    size=blob["size"],
+                                )
 
                         else:
                             self.blob.copy_data(
@@ -249,6 +264,8 @@ class Raw_Train_Data_Validation:
                                 to_container_name=self.train_data_container,
                                 db_name=self.db_name,
                                 collection_name=self.train_name_valid_log,
+                                wait=False,
+                                size=blob["size"],
                             )
 
                     else:
@@ -259,17 +276,13 @@ class Raw_Train_Data_Validation:
                             to_container_name=self.train_data_container,
                             db_name=self.db_name,
                             collection_name=self.train_name_valid_log,
+                            wait=False,
+                            size=blob["size"],
                         )
 
-                else:
-                    self.blob.copy_data(
-                        from_file_name=raw_data_train_filename,
-                        from_container_name=self.raw_data_container_name,
-                        to_file_name=bad_data_train_filename,
-                        to_container_name=self.train_data_container,
-                        db_name=self.db_name,
-                        collection_name=self.train_name_valid_log,
-                    )
+            self.blob.wait_for_copies(
+                db_name=self.db_name, collection_name=self.train_name_valid_log
+            )
 
             self.log_writer.start_log(
                 key="exit",
@@ -307,39 +320,54 @@ class Raw_Train_Data_Validation:
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
+            lst = self.blob.read_csv_headers_from_folder(
                 folder_name=self.good_train_data_dir,
                 container_name=self.train_data_container,
                 db_name=self.db_name,
                 collection_name=self.train_col_valid_log,
             )
 
+            moves = []
+
             for f in lst:
-                df = f[0]
+                header = f[0]
 
                 file = f[1]
 
                 abs_f = f[2]
 
                 if file.endswith(".csv"):
-                    if df.shape[1] == NumberofColumns:
+                    if len(header) == NumberofColumns:
                         pass
 
                     else:
                         dest_f = self.bad_train_data_dir + "/" + abs_f
 
-                        self.blob.move_data(
-                            from_file_name=file,
-                            from_container_name=self.train_data_container,
-                            to_file_name=dest_f,
-                            to_container_name=self.train_data_container,
-                            db_name=self.db_name,
-                            collection_name=self.train_col_valid_log,
+                        moves.append(
+                            {
+                                "from_file_name": file,
+                                "from_container_name": self.train_data_container,
+                                "to_file_name": dest_f,
+                                "to_container_name": self.train_data_container,
+                            }
                         )
 
                 else:
                     pass
 
+            report = self.blob.move_files(
+                moves=moves,
+                db_name=self.db_name,
+                collection_name=self.train_col_valid_log,
+            )
+
+            self.blob.check_report(
+                report=report,
+                action="Move",
+                db_name=self.db_name,
+                collection_name=self.train_col_valid_log,
+            )
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -383,6 +411,8 @@ class Raw_Train_Data_Validation:
                 collection_name=self.train_missing_value_log,
             )
 
+            moves, converted = [], []
+
             for f in lst:
                 df = f[0]
 
@@ -399,29 +429,36 @@ class Raw_Train_Data_Validation:
 
                             dest_f = self.bad_train_data_dir + "/" + abs_f
 
-                            self.blob.move_data(
-                                from_file_name=file,
-                                from_container_name=self.train_data_container,
-                                to_file_name=dest_f,
-                                to_container_name=self.train_data_container,
-                                db_name=self.db_name,
-                                collection_name=self.train_missing_value_log,
+                            moves.append(
+                                {
+                                    "from_file_name": file,
+                                    "from_container_name": self.train_data_container,
+                                    "to_file_name": dest_f,
+                                    "to_container_name": self.train_data_container,
+                                }
                             )
 
                             break
 
                     if count == 0:
-                        dest_f = self.good_train_data_dir + "/" + abs_f
+                        dest_f = (
+                            self.good_train_data_dir
+                            + "/"
+                            + abs_f[: -len(".csv")]
+                            + self.good_data_file_ext
+                        )
 
-                        self.blob.upload_df_as_csv(
+                        self.blob.upload_df(
                             dataframe=df,
-                            local_file_name=abs_f,
                             container_file_name=dest_f,
                             container_name=self.train_data_container,
                             db_name=self.db_name,
                             collection_name=self.train_missing_value_log,
                         )
 
+                        if dest_f != file:
+                            converted.append(file)
+
                 else:
                     pass
 
@@ -433,6 +470,33 @@ class Raw_Train_Data_Validation:
                     collection_name=self.train_missing_value_log,
                 )
 
+            report = self.blob.move_files(
+                moves=moves,
+                db_name=self.db_name,
+                collection_name=self.train_missing_value_log,
+            )
+
+            self.blob.check_report(
+                report=report,
+                action="Move",
+                db_name=self.db_name,
+                collection_name=self.train_missing_value_log,
+            )
+
+            report = self.blob.delete_files(
+                file_names=converted,
+                container_name=self.train_data_container,
+                db_name=self.db_name,
+                collection_name=self.train_missing_value_log,
+            )
+
+            self.blob.check_report(
+                report=report,
+                action="Delete",
+                db_name=self.db_name,
+                collection_name=self.train_missing_value_log,
+            )
+
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
@@ -0,0 +1,164 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import yaml
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RANGE_SIZE = 4 * 1024 * 1024
+
+TEST_DIR = tempfile.mkdtemp(prefix="scania-tests-")
+
+sys.path.insert(0, ROOT_DIR)
+
+
+def write_test_params():
+    """
+    Method Name :   write_test_params
+    Description :   This method writes a copy of params.yaml to a temporary folder, using the local storage
+                    backend and no tracing or log sink, so that the tests run without azure or mongodb
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    with open(os.path.join(ROOT_DIR, "params.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    config["storage"]["backend"] = "local"
+
+    config["storage"]["local_dir"] = os.path.join(TEST_DIR, "storage")
+
+    config["blob_cache"]["dir"] = os.path.join(TEST_DIR, "cache")
+
+    config["log_level"]["default"] = "ERROR"
+
+    config["log_level"]["collections"] = {}
+
+    config["log_sink"]["enabled"] = False
+
+    config["tracing"]["enabled"] = False
+
+    with open(os.path.join(TEST_DIR, "params.yaml"), "w") as f:
+        yaml.safe_dump(config, f)
+
+
+write_test_params()
+
+os.chdir(TEST_DIR)
+
+from scania.blob_storage_operations.blob_operations import Blob_Operation  # noqa: E402
+from utils.log_sink import Log_Sink  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def log_records(monkeypatch):
+    """
+    Method Name :   log_records
+    Description :   This method collects the records written to the log sink in a list instead of mongodb
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    records = []
+
+    monkeypatch.setattr(
+        Log_Sink,
+        "write",
+        lambda self, db_name, collection_name, record: records.append(
+            (db_name, collection_name, record)
+        ),
+    )
+
+    return records
+
+
+@pytest.fixture
+def blob_op():
+    return Blob_Operation()
+
+
+@pytest.fixture
+def container_name(blob_op):
+    container_name = "test-" + uuid4().hex
+
+    blob_op.backend.create_container(container_name)
+
+    return container_name
+
+
+def upload(blob_op, container_name, file_name, data=b"a,b\n1,2\n"):
+    return blob_op.upload_bytes(
+        data=data,
+        container_file_name=file_name,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+
+class Fake_Downloader:
+    """
+    Description :   This class shall be used as a stand in for a blob download, returning the stored bytes in
+                    ranges of the chunk size as the sdk does for a blob above the single get size
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, content, etag='"0x1"', chunk_size=RANGE_SIZE, metadata=None):
+        self.content = content
+
+        self.chunk_size = chunk_size
+
+        self.properties = SimpleNamespace(
+            etag=etag, size=len(content), metadata=metadata or {}
+        )
+
+    def readall(self):
+        return self.content
+
+    def chunks(self):
+        for start in range(0, len(self.content), self.chunk_size):
+            yield self.content[start : start + self.chunk_size]
+
+
+class Fake_Blob_Client:
+    """
+    Description :   This class shall be used as a stand in for an azure blob client, counting the downloads and
+                    keeping the uploads along with their keyword arguments
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self, content=b"", etag='"0x1"', metadata=None):
+        self.content = content
+
+        self.etag = etag
+
+        self.metadata = metadata or {}
+
+        self.downloads = 0
+
+        self.uploads = []
+
+    def get_blob_properties(self):
+        return SimpleNamespace(
+            etag=self.etag, size=len(self.content), metadata=self.metadata
+        )
+
+    def download_blob(self, **kwargs):
+        self.downloads += 1
+
+        return Fake_Downloader(self.content, etag=self.etag, metadata=self.metadata)
+
+    def upload_blob(self, data, **kwargs):
+        content = data if isinstance(data, bytes) else b"".join(data)
+
+        self.uploads.append((content, kwargs))
+
+        return {"etag": self.etag, "last_modified": None, "content_md5": None}
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+from conftest import Fake_Blob_Client
+from prometheus_client import REGISTRY
+from scania.blob_storage_operations.blob_cache import Blob_Cache
+
+
+def get_bytes_in():
+    return (
+        REGISTRY.get_sample_value("scania_blob_bytes_total", {"direction": "in"}) or 0
+    )
+
+
+def test_blob_bytes_are_counted_on_downloads_only():
+    cache = Blob_Cache()
+
+    blob_client = Fake_Blob_Client(os.urandom(1000))
+
+    start, bytes_cached = get_bytes_in(), cache.get_stats()["bytes_cached"]
+
+    for _ in range(3):
+        cached = cache.get(
+            blob_client=blob_client, container_name="cache", blob_name="bytes.csv"
+        )
+
+        assert cached.readall() == blob_client.content
+
+    assert blob_client.downloads == 1
+
+    assert get_bytes_in() - start == 1000
+
+    blob_client.content, blob_client.etag = os.urandom(500), '"0x2"'
+
+    cache.get(blob_client=blob_client, container_name="cache", blob_name="bytes.csv")
+
+    assert blob_client.downloads == 2
+
+    assert get_bytes_in() - start == 1500
+
+    assert cache.get_stats()["bytes_cached"] - bytes_cached == 500
+
+
+def get_cache(cache_dir, max_bytes=1024 * 1024):
+    cache = Blob_Cache()
+
+    cache.cache_dir, cache.max_bytes = str(cache_dir), max_bytes
+
+    cache.entries.clear()
+
+    cache.load_index()
+
+    return cache
+
+
+def test_partial_downloads_of_stopped_processes_are_removed(tmp_path):
+    stopped = subprocess.Popen([sys.executable, "-c", ""])
+
+    stopped.wait()
+
+    stale = tmp_path / f"key.0x1.{stopped.pid}.1.tmp"
+
+    running = tmp_path / f"key.0x2.{os.getpid()}.1.tmp"
+
+    for path in (stale, running):
+        path.write_bytes(b"partial")
+
+    cache = get_cache(tmp_path)
+
+    assert (stale.exists(), running.exists()) == (False, True)
+
+    assert cache.entries == {}
+
+
+def test_entries_read_from_disk_are_validated(tmp_path):
+    key = Blob_Cache().get_key("cache", "old.csv")
+
+    (tmp_path / f"{key}.0x1").write_bytes(b"old")
+
+    cache = get_cache(tmp_path)
+
+    cache.validate = "ttl"
+
+    assert cache.entries[key]["checked"] == float("-inf")
+
+    blob_client = Fake_Blob_Client(b"new", etag='"0x2"')
+
+    assert cache.get(blob_client, "cache", "old.csv").readall() == b"new"
+
+    assert os.listdir(tmp_path) == [f"{key}.0x2"]
+
+
+def test_byte_budget_is_shared_by_caches_of_one_dir(tmp_path):
+    first, second = get_cache(tmp_path, 1000), get_cache(tmp_path, 1000)
+
+    first_client = Fake_Blob_Client(os.urandom(600))
+
+    old = first.get(first_client, "cache", "first.csv")
+
+    os.utime(old.path, (1, 1))
+
+    new = second.get(Fake_Blob_Client(os.urandom(600)), "cache", "second.csv")
+
+    assert os.listdir(tmp_path) == [os.path.basename(new.path)]
+
+    assert second.get_stats()["bytes_cached"] == 600
+
+    assert (
+        first.get(first_client, "cache", "first.csv").readall() == first_client.content
+    )
+
+    assert first_client.downloads == 2
@@ -0,0 +1,221 @@
+import gzip
+import os
+from io import BufferedReader, BytesIO
+
+import pandas as pd
+import pytest
+from conftest import RANGE_SIZE, Fake_Blob_Client, Fake_Downloader
+from scania.blob_storage_operations.blob_cache import Blob_Cache
+from scania.blob_storage_operations.blob_codec import (
+    Compressed_Stream,
+    decompress_head,
+    open_decoded_stream,
+    zstandard,
+)
+from scania.blob_storage_operations.blob_operations import Blob_Operation
+from scania.blob_storage_operations.storage_backend import Azure_Storage_Backend
+from utils.read_params import read_params
+
+MAX_SINGLE_GET_SIZE = read_params()["blob_download"]["max_single_get_size"]
+
+
+def get_large_csv():
+    df = pd.DataFrame({"id": range(450000)})
+
+    df["value"] = [os.urandom(16).hex() for _ in range(len(df))]
+
+    return df, df.to_csv(index=False).encode()
+
+
+def compress(content, codec):
+    return b"".join(
+        Compressed_Stream(data=content, codec=codec, level=1, chunk_size=RANGE_SIZE)
+    )
+
+
+def test_default_codec_is_none():
+    assert read_params()["blob_codec"]["codec"] == "none"
+
+    blob_op = Blob_Operation()
+
+    assert blob_op.get_upload_codec("data/good.csv") is None
+
+    assert blob_op.get_upload_codec("data/good.csv.gz") == "gzip"
+
+    assert blob_op.get_upload_codec("data/good.csv.gz", head=b"a,b\n") == "gzip"
+
+    assert (
+        blob_op.get_upload_codec("data/good.csv.gz", head=b"\x1f\x8b\x08\x00") is None
+    )
+
+
+def test_compressed_content_is_not_compressed_again(blob_op, container_name, tmp_path):
+    content = compress(b"a,b\n" + b"1,2\n" * 1000, "gzip")
+
+    local_file_name = str(tmp_path / "good.csv.gz")
+
+    with open(local_file_name, "wb") as f:
+        f.write(content)
+
+    blob_op.upload_file(
+        local_file_name=local_file_name,
+        container_file_name="codec/file.csv.gz",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    blob_op.upload_bytes(
+        data=content,
+        container_file_name="codec/bytes.csv.gz",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    for file_name in ["codec/file.csv.gz", "codec/bytes.csv.gz"]:
+        assert blob_op.backend.get(container_name, file_name).readall() == content
+
+
+def test_put_records_codec_of_compressed_content(blob_op, monkeypatch):
+    puts = []
+
+    monkeypatch.setattr(
+        blob_op.backend, "put", lambda **kwargs: puts.append(kwargs) or None
+    )
+
+    for data in [compress(b"a,b\n", "gzip"), b"a,b\n"]:
+        blob_op.upload_bytes(
+            data=data,
+            container_file_name="codec/file.csv",
+            container_name="test",
+            db_name="test",
+            collection_name="test",
+        )
+
+    assert [put["metadata"] for put in puts] == [{"codec": "gzip"}, None]
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [
+        "gzip",
+        pytest.param(
+            "zstd",
+            marks=pytest.mark.skipif(zstandard is None, reason="needs zstandard"),
+        ),
+    ],
+)
+def test_codec_round_trip(codec):
+    content = b"a,b\n" + b"1,2\n" * 100000
+
+    stream = Compressed_Stream(data=content, codec=codec, level=3, chunk_size=4096)
+
+    compressed = b"".join(stream)
+
+    assert stream.bytes_in == len(content)
+
+    assert stream.bytes_out == len(compressed) < len(content)
+
+    assert open_decoded_stream(BufferedReader(BytesIO(compressed))).read() == content
+
+    assert content.startswith(decompress_head(compressed[:64]))
+
+
+def test_uncompressed_stream_is_read_as_is():
+    content = b"a,b\n1,2\n"
+
+    assert open_decoded_stream(BufferedReader(BytesIO(content))).read() == content
+
+    assert decompress_head(content) == content
+
+
+def test_large_compressed_csv_round_trip():
+    df, content = get_large_csv()
+
+    blob_op = Blob_Operation()
+
+    blob_op.upload_bytes(
+        data=content,
+        container_file_name="codec/large.csv.gz",
+        container_name="test",
+        db_name="test",
+        collection_name="test",
+    )
+
+    path = blob_op.backend.get_path("test", "codec/large.csv.gz")
+
+    assert os.path.getsize(path) > MAX_SINGLE_GET_SIZE
+
+    with open(path, "rb") as f:
+        assert gzip.decompress(f.read()) == content
+
+    read_df = blob_op.read_csv(
+        file_name="codec/large.csv.gz",
+        container_name="test",
+        db_name="test",
+        collection_name="test",
+    )
+
+    pd.testing.assert_frame_equal(read_df, df)
+
+
+def test_large_blob_read_in_ranges():
+    df, content = get_large_csv()
+
+    compressed = compress(content, "gzip")
+
+    assert len(compressed) > MAX_SINGLE_GET_SIZE
+
+    blob_op = Blob_Operation()
+
+    read_df = blob_op.get_df_from_object(
+        object=Fake_Downloader(compressed), db_name="test", collection_name="test"
+    )
+
+    pd.testing.assert_frame_equal(read_df, df)
+
+
+def test_azure_put_keeps_codec_in_metadata():
+    backend = Azure_Storage_Backend.__new__(Azure_Storage_Backend)
+
+    backend.upload_concurrency = 1
+
+    blob_client = Fake_Blob_Client()
+
+    backend.get_blob_client = lambda container_name, blob_name: blob_client
+
+    backend.put(
+        container_name="test",
+        blob_name="codec/file.csv.gz",
+        data=b"content",
+        length=7,
+        match_conditions={},
+        metadata={"codec": "gzip"},
+    )
+
+    _, kwargs = blob_client.uploads[0]
+
+    assert kwargs["metadata"] == {"codec": "gzip"}
+
+    assert "content_settings" not in kwargs
+
+
+def test_blob_cache_counts_stored_bytes():
+    content = compress(os.urandom(3 * RANGE_SIZE), "gzip")
+
+    cache = Blob_Cache()
+
+    bytes_cached = cache.get_stats()["bytes_cached"]
+
+    cached = cache.get(
+        blob_client=Fake_Blob_Client(content),
+        container_name="test",
+        blob_name="codec/cached.csv.gz",
+    )
+
+    assert cached.readall() == content
+
+    assert cached.size == os.path.getsize(cached.path) == len(content)
+
+    assert cache.get_stats()["bytes_cached"] - bytes_cached == len(content)
@@ -0,0 +1,181 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import upload
+from scania.blob_storage_operations.blob_manifest import Blob_Manifest, diff_manifests
+from scania.blob_storage_operations.blob_operations import Blob_Operation
+
+
+def get_entries(blob_op, container_name):
+    return blob_op.get_manifest(
+        folder_name="good/train",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+
+def test_manifest_tracks_uploads_and_deletes(blob_op, container_name):
+    upload(blob_op, container_name, "good/train/a.csv")
+
+    old_entries = get_entries(blob_op, container_name)
+
+    upload(blob_op, container_name, "good/train/a.csv", data=b"a,b\n3,4\n")
+
+    upload(blob_op, container_name, "good/train/b.csv")
+
+    assert sorted(get_entries(blob_op, container_name)) == [
+        "good/train/a.csv",
+        "good/train/b.csv",
+    ]
+
+    blob_op.delete_file(
+        file_name="good/train/b.csv",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    new_entries = get_entries(blob_op, container_name)
+
+    assert diff_manifests(old_entries, new_entries) == {
+        "added": [],
+        "changed": ["good/train/a.csv"],
+        "removed": [],
+    }
+
+    assert diff_manifests(new_entries, {}) == {
+        "added": [],
+        "changed": [],
+        "removed": ["good/train/a.csv"],
+    }
+
+
+def test_manifest_is_rebuilt_from_a_fresh_instance(blob_op, container_name):
+    upload(blob_op, container_name, "good/train/a.csv")
+
+    get_entries(blob_op, container_name)
+
+    manifest = Blob_Manifest(backend=blob_op.backend)
+
+    assert list(manifest.get_entries(container_name, "good/train")) == [
+        "good/train/a.csv"
+    ]
+
+    assert manifest.get_entries(container_name, "other") is None
+
+
+def test_failed_update_drops_the_manifest(blob_op, container_name, monkeypatch):
+    upload(blob_op, container_name, "good/train/a.csv")
+
+    get_entries(blob_op, container_name)
+
+    def fail(*args, **kwargs):
+        raise Exception("manifest write failed")
+
+    monkeypatch.setattr(blob_op.manifest, "save", fail)
+
+    result = upload(blob_op, container_name, "good/train/b.csv")
+
+    assert result is not None
+
+    monkeypatch.undo()
+
+    data, _ = blob_op.backend.read_versioned(
+        container_name, blob_op.manifest.get_manifest_name("good/train")
+    )
+
+    assert data is None
+
+    assert sorted(get_entries(blob_op, container_name)) == [
+        "good/train/a.csv",
+        "good/train/b.csv",
+    ]
+
+
+def test_stale_manifest_picks_up_outside_writes(blob_op, container_name):
+    upload(blob_op, container_name, "good/train/a.csv")
+
+    get_entries(blob_op, container_name)
+
+    blob_op.backend.put(
+        container_name=container_name,
+        blob_name="good/train/outside.csv",
+        data=b"a,b\n",
+        length=4,
+        match_conditions={},
+    )
+
+    assert list(get_entries(blob_op, container_name)) == ["good/train/a.csv"]
+
+    manifest_name = blob_op.manifest.get_manifest_name("good/train")
+
+    data, _ = blob_op.backend.read_versioned(container_name, manifest_name)
+
+    manifest = json.loads(data)
+
+    manifest["built_at"] = time.time() - blob_op.manifest.max_age - 1
+
+    blob_op.backend.put(
+        container_name=container_name,
+        blob_name=manifest_name,
+        data=json.dumps(manifest).encode(),
+        length=None,
+        match_conditions={},
+    )
+
+    blob_op.manifest.manifests.clear()
+
+    assert sorted(get_entries(blob_op, container_name)) == [
+        "good/train/a.csv",
+        "good/train/outside.csv",
+    ]
+
+
+def test_manifest_sees_writes_of_another_instance(blob_op, container_name):
+    other_op = Blob_Operation()
+
+    upload(blob_op, container_name, "good/train/a.csv")
+
+    assert list(get_entries(blob_op, container_name)) == ["good/train/a.csv"]
+
+    assert list(get_entries(other_op, container_name)) == ["good/train/a.csv"]
+
+    upload(other_op, container_name, "good/train/b.csv")
+
+    upload(blob_op, container_name, "good/train/c.csv")
+
+    expected = ["good/train/a.csv", "good/train/b.csv", "good/train/c.csv"]
+
+    assert sorted(get_entries(blob_op, container_name)) == expected
+
+    assert sorted(get_entries(other_op, container_name)) == expected
+
+
+def test_concurrent_writers_keep_every_entry(blob_op, container_name):
+    other_op = Blob_Operation()
+
+    upload(blob_op, container_name, "good/train/first.csv")
+
+    get_entries(blob_op, container_name)
+
+    get_entries(other_op, container_name)
+
+    file_names = [f"good/train/{idx}.csv" for idx in range(8)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda idx: upload(
+                    (blob_op, other_op)[idx % 2], container_name, file_names[idx]
+                ),
+                range(len(file_names)),
+            )
+        )
+
+    expected = sorted(file_names + ["good/train/first.csv"])
+
+    assert sorted(get_entries(blob_op, container_name)) == expected
+
+    assert sorted(get_entries(other_op, container_name)) == expected
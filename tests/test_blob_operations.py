@@ -0,0 +1,307 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import upload
+from sklearn.cluster import KMeans
+from utils.logger import LOG_LEVELS
+from utils.tracer import Span_Tracer
+
+
+def read_header(blob_op, container_name, file_name):
+    return blob_op.read_csv_header(
+        file_name=file_name,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+
+def test_header_probe(blob_op, container_name):
+    upload(blob_op, container_name, "short.csv", b"a,b,c\r\n1,2,3\n")
+
+    assert read_header(blob_op, container_name, "short.csv") == ["a", "b", "c"]
+
+    upload(blob_op, container_name, "no_rows.csv", b"a,b")
+
+    assert read_header(blob_op, container_name, "no_rows.csv") == ["a", "b"]
+
+    upload(blob_op, container_name, "empty.csv", b"")
+
+    assert read_header(blob_op, container_name, "empty.csv") == []
+
+
+def test_header_probe_beyond_first_range(blob_op, container_name):
+    columns = [f"col_{idx}" for idx in range(2000)]
+
+    content = (",".join(columns) + "\n" + ",".join(["1"] * 2000) + "\n").encode()
+
+    assert len(content.split(b"\n")[0]) > blob_op.header_probe_bytes
+
+    upload(blob_op, container_name, "wide.csv", content)
+
+    assert read_header(blob_op, container_name, "wide.csv") == columns
+
+    upload(blob_op, container_name, "wide.csv.gz", content)
+
+    assert read_header(blob_op, container_name, "wide.csv.gz") == columns
+
+
+def test_header_probe_gives_up_at_max_bytes(blob_op, container_name):
+    upload(
+        blob_op, container_name, "no_newline.csv", b"a" * (blob_op.header_max_bytes + 1)
+    )
+
+    with pytest.raises(Exception, match="No header row found"):
+        read_header(blob_op, container_name, "no_newline.csv")
+
+
+def load_model(blob_op, container_name, model_name):
+    return blob_op.load_model(
+        model_name=model_name,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+        model_dir="models/",
+    )
+
+
+def test_model_round_trip(blob_op, container_name):
+    model = KMeans(n_clusters=2, n_init=1, random_state=0).fit(np.random.rand(20, 3))
+
+    blob_op.save_model(
+        model=model,
+        model_dir="models",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    loaded = load_model(blob_op, container_name, "KMeans")
+
+    np.testing.assert_array_equal(loaded.cluster_centers_, model.cluster_centers_)
+
+
+def test_legacy_model_fallback(blob_op, container_name, monkeypatch, log_records):
+    def fail(*args, **kwargs):
+        raise AssertionError("load_model should not check if the model exists")
+
+    monkeypatch.setattr(blob_op.backend, "exists", fail)
+
+    monkeypatch.setattr(blob_op.log_writer, "default_level", LOG_LEVELS["INFO"])
+
+    model = {"name": "legacy", "weights": [1, 2, 3]}
+
+    upload(
+        blob_op,
+        container_name,
+        "models/Legacy" + blob_op.model_legacy_save_format,
+        pickle.dumps(model),
+    )
+
+    assert load_model(blob_op, container_name, "Legacy") == model
+
+    assert (
+        "test",
+        "test",
+        "Loaded Legacy model from " + container_name + " container",
+    ) in [
+        (db_name, collection_name, record["Log_Info"])
+        for db_name, collection_name, record in log_records
+    ]
+
+    with pytest.raises(Exception, match="Missing"):
+        load_model(blob_op, container_name, "Missing")
+
+
+def test_get_object_is_traced(blob_op, container_name):
+    upload(blob_op, container_name, "traced.csv", b"a,b\n1,2\n")
+
+    blob_op.log_writer.tracer = tracer = Span_Tracer()
+
+    blob_op.log_writer.tracing = True
+
+    blob_op.read_csv(
+        file_name="traced.csv",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    spans = {span["method_name"]: span for span in tracer.spans}
+
+    assert spans["get_object"]["parent_span_id"] == spans["read_csv"]["span_id"]
+
+    assert tracer.get_stack() == ()
+
+
+def test_failed_moves_are_logged_and_raised(blob_op, container_name, log_records):
+    upload(blob_op, container_name, "good/a.csv")
+
+    moves = [
+        {
+            "from_file_name": file_name,
+            "from_container_name": container_name,
+            "to_file_name": "bad/" + file_name.split("/")[-1],
+            "to_container_name": container_name,
+        }
+        for file_name in ("good/a.csv", "good/missing.csv")
+    ]
+
+    report = blob_op.move_files(moves=moves, db_name="test", collection_name="test")
+
+    assert report["good/a.csv"] == "success"
+
+    with pytest.raises(Exception, match="Move failed for 1 of 2 files"):
+        blob_op.check_report(
+            report=report, action="Move", db_name="test", collection_name="test"
+        )
+
+    assert [record["Log_Info"] for _, _, record in log_records] == [
+        "Move of good/missing.csv file failed with " + report["good/missing.csv"]
+    ]
+
+    blob_op.check_report(
+        report={"good/b.csv": "success"},
+        action="Delete",
+        db_name="test",
+        collection_name="test",
+    )
+
+
+def get_raw_df():
+    return pd.DataFrame(
+        {
+            "class": ["neg", "pos", "neg"],
+            "aa_000": ["1", "na", "3"],
+            "ab_000": [0.5, None, 2.25],
+            "ac_000": [0.1, 0.2, None],
+            "id": ["x1", "x2", "x3"],
+        }
+    )
+
+
+def upload_df(blob_op, container_name, file_name, df):
+    return blob_op.upload_df(
+        dataframe=df,
+        container_file_name=file_name,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+
+def read_df(blob_op, container_name, file_name):
+    return blob_op.read_df(
+        file_name=file_name,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+
+def test_typed_df_dtypes_and_na(blob_op, monkeypatch):
+    monkeypatch.setattr(blob_op, "float_type", "float32")
+
+    df = blob_op.get_typed_df(get_raw_df())
+
+    assert isinstance(df["class"].dtype, pd.CategoricalDtype)
+
+    assert list(df["class"].cat.categories) == ["neg", "pos"]
+
+    assert df["aa_000"].dtype == np.float32
+
+    assert df["aa_000"].isna().tolist() == [False, True, False]
+
+    assert df["ab_000"].dtype == np.float32
+
+    assert df["ac_000"].dtype == np.float64
+
+    assert df["ac_000"].tolist()[:2] == [0.1, 0.2]
+
+    assert not pd.api.types.is_numeric_dtype(df["id"])
+
+
+def test_parquet_round_trip(blob_op, container_name):
+    upload_df(blob_op, container_name, "data/good.parquet", get_raw_df())
+
+    stored = blob_op.backend.get(container_name, "data/good.parquet").readall()
+
+    assert stored[:4] == b"PAR1"
+
+    df = read_df(blob_op, container_name, "data/good.parquet")
+
+    pd.testing.assert_frame_equal(df, blob_op.get_typed_df(get_raw_df()))
+
+    assert isinstance(df["class"].dtype, pd.CategoricalDtype)
+
+    assert df["aa_000"].isna().tolist() == [False, True, False]
+
+    columns = blob_op.read_parquet(
+        file_name="data/good.parquet",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+        columns=["class", "ab_000"],
+    )
+
+    assert list(columns.columns) == ["class", "ab_000"]
+
+
+def test_csv_round_trip(blob_op, container_name):
+    upload_df(blob_op, container_name, "data/good.csv", get_raw_df())
+
+    stored = blob_op.backend.get(container_name, "data/good.csv").readall()
+
+    assert stored.startswith(b"class,aa_000,ab_000,ac_000,id\n")
+
+    df = read_df(blob_op, container_name, "data/good.csv")
+
+    assert list(df.columns) == list(get_raw_df().columns)
+
+    assert df["class"].tolist() == ["neg", "pos", "neg"]
+
+    assert df["aa_000"].tolist() == ["1", "na", "3"]
+
+    assert df["ab_000"].isna().tolist() == [False, True, False]
+
+    assert df["ab_000"].tolist()[::2] == [0.5, 2.25]
+
+
+def test_failed_conditional_upload_keeps_the_local_file(
+    blob_op, container_name, tmp_path, monkeypatch, log_records
+):
+    monkeypatch.setattr(blob_op.log_writer, "default_level", LOG_LEVELS["INFO"])
+
+    first = upload(blob_op, container_name, "data/a.csv")
+
+    local_file_name = str(tmp_path / "a.csv")
+
+    for kwargs, reason in [
+        ({"replace": False}, "it already exists and replace option is set to False"),
+        ({"if_none_match": "*"}, "it already exists and if_none_match is set to *"),
+        ({"if_match": '"0x0"'}, 'its etag does not match "0x0"'),
+        ({"if_none_match": first["etag"]}, f"its etag still matches {first['etag']}"),
+    ]:
+        with open(local_file_name, "wb") as f:
+            f.write(b"a,b\n3,4\n")
+
+        result = blob_op.upload_file(
+            local_file_name=local_file_name,
+            container_file_name="data/a.csv",
+            container_name=container_name,
+            db_name="test",
+            collection_name="test",
+            **kwargs,
+        )
+
+        assert result is None
+
+        assert os.path.exists(local_file_name)
+
+        assert (
+            f"Not uploading data/a.csv file to {container_name} container as {reason}"
+            in [record["Log_Info"] for _, _, record in log_records]
+        )
@@ -0,0 +1,104 @@
+import threading
+from types import SimpleNamespace
+
+from scania.blob_storage_operations.copy_manager import Blob_Copy_Manager
+from scania.blob_storage_operations.storage_backend import Local_Storage_Backend
+
+
+class Fake_Blob:
+    def __init__(self, url):
+        self.url = url
+
+        self.account_name = "account"
+
+    def start_copy_from_url(self, url):
+        return {"copy_status": "success", "etag": '"0x1"'}
+
+    def get_blob_properties(self):
+        return SimpleNamespace(
+            copy=SimpleNamespace(status="success"), etag='"0x1"', size=1
+        )
+
+
+class Fake_Client_Blob(Fake_Blob):
+    def __init__(self, url, barrier=None, metadata=None):
+        super().__init__(url)
+
+        self.barrier = barrier
+
+        self.metadata = metadata
+
+        self.uploads = []
+
+    def get_blob_properties(self):
+        return SimpleNamespace(metadata=self.metadata, content_settings=None)
+
+    def download_blob(self):
+        self.barrier.wait(timeout=5)
+
+        return SimpleNamespace(chunks=lambda: iter([b"a,b\n"]))
+
+    def upload_blob(self, data, **kwargs):
+        self.uploads.append((b"".join(data), kwargs["metadata"]))
+
+        return {"etag": '"0x2"'}
+
+
+def test_client_copies_run_concurrently_with_metadata():
+    manager = Blob_Copy_Manager()
+
+    barrier = threading.Barrier(2)
+
+    sources = [
+        Fake_Client_Blob(url, barrier, metadata={"codec": "gzip"}) for url in "ab"
+    ]
+
+    dests = [Fake_Client_Blob(url) for url in "cd"]
+
+    jobs = [manager.start(source, dest, size=4) for source, dest in zip(sources, dests)]
+
+    assert manager.wait_all(timeout=10) == jobs
+
+    assert [(job.status, job.etag) for job in jobs] == [("success", '"0x2"')] * 2
+
+    assert [dest.uploads for dest in dests] == [[(b"a,b\n", {"codec": "gzip"})]] * 2
+
+
+def test_waited_copy_jobs_are_not_waited_again():
+    manager = Blob_Copy_Manager()
+
+    first = manager.start(Fake_Blob("a"), Fake_Blob("b"))
+
+    second = manager.start(Fake_Blob("c"), Fake_Blob("d"))
+
+    assert first.wait() is first
+
+    assert manager.wait_all(jobs=[second]) == [second]
+
+    assert manager.wait_all() == []
+
+    third = manager.start(Fake_Blob("e"), Fake_Blob("f"))
+
+    assert manager.wait_all() == [third]
+
+
+def test_waited_local_copies_are_not_waited_again():
+    backend = Local_Storage_Backend()
+
+    backend.put(
+        container_name="copy",
+        blob_name="a.csv",
+        data=b"a,b\n",
+        length=4,
+        match_conditions={},
+    )
+
+    first = backend.copy("copy", "a.csv", "copy", "b.csv")
+
+    second = backend.copy("copy", "a.csv", "copy", "c.csv")
+
+    assert first.wait().status == "success"
+
+    assert backend.wait_copies(jobs=[second]) == [second]
+
+    assert backend.wait_copies() == []
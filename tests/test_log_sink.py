@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+
+from utils.log_sink import Log_Sink
+
+sink_write = Log_Sink.write
+
+
+class Fake_Mongo:
+    def __init__(self, release=None):
+        self.release = release
+
+        self.entered = threading.Event()
+
+        self.inserts = []
+
+    def ensure_log_collection(self, **kwargs):
+        pass
+
+    def insert_records(self, db_name, collection_name, data):
+        self.entered.set()
+
+        if self.release is not None:
+            self.release.wait(timeout=5)
+
+        self.inserts.append((db_name, collection_name, data))
+
+
+def get_sink(full_policy="block", queue_size=10, block_timeout=5, release=None):
+    sink = Log_Sink()
+
+    sink.enabled, sink.full_policy, sink.block_timeout = (
+        True,
+        full_policy,
+        block_timeout,
+    )
+
+    sink.queue = queue.Queue(maxsize=queue_size)
+
+    sink.mongo = Fake_Mongo(release)
+
+    return sink
+
+
+def stop_writer(sink):
+    sink.thread = threading.Thread(target=lambda: None)
+
+
+def test_drop_policy_drops_records_when_full():
+    sink = get_sink(full_policy="drop", queue_size=2)
+
+    stop_writer(sink)
+
+    for idx in range(3):
+        sink_write(sink, "db", "logs", {"idx": idx})
+
+    assert (sink.stats["queued"], sink.stats["dropped"]) == (2, 1)
+
+
+def test_block_policy_waits_for_room_then_gives_up():
+    sink = get_sink(queue_size=1, block_timeout=0.05)
+
+    stop_writer(sink)
+
+    sink_write(sink, "db", "logs", {"idx": 0})
+
+    sink_write(sink, "db", "logs", {"idx": 1})
+
+    assert (sink.stats["queued"], sink.stats["dropped"]) == (1, 1)
+
+    sink.block_timeout = 5
+
+    threading.Timer(0.05, sink.queue.get).start()
+
+    sink_write(sink, "db", "logs", {"idx": 2})
+
+    assert (sink.stats["queued"], sink.stats["dropped"]) == (2, 1)
+
+
+def test_records_are_batched_per_collection():
+    sink = get_sink()
+
+    for idx in range(4):
+        sink_write(sink, "db", ("a", "b")[idx % 2], {"idx": idx})
+
+    sink.close(timeout=5)
+
+    assert sorted(sink.mongo.inserts) == [
+        ("db", "a", [{"idx": 0}, {"idx": 2}]),
+        ("db", "b", [{"idx": 1}, {"idx": 3}]),
+    ]
+
+    assert (sink.stats["batches"], sink.stats["written"]) == (1, 4)
+
+
+def test_close_does_not_block_on_a_full_queue():
+    release = threading.Event()
+
+    sink = get_sink(queue_size=2, release=release)
+
+    sink.flush_interval = 0.01
+
+    sink_write(sink, "db", "logs", {"idx": 0})
+
+    assert sink.mongo.entered.wait(timeout=5)
+
+    for idx in range(1, 3):
+        sink_write(sink, "db", "logs", {"idx": idx})
+
+    assert sink.queue.full()
+
+    thread = sink.thread
+
+    start = time.monotonic()
+
+    sink.close(timeout=0.05)
+
+    assert time.monotonic() - start < 1
+
+    assert sink.thread is None and thread.is_alive()
+
+    release.set()
+
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+
+    written = [record["idx"] for _, _, data in sink.mongo.inserts for record in data]
+
+    assert written == [0, 1, 2]
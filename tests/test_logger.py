@@ -0,0 +1,201 @@
+import pytest
+from utils.logger import (
+    LOG_LEVELS,
+    App_Logger,
+    _sampled_calls,
+    get_value_getter,
+    instrumented,
+)
+from utils.tracer import Span_Tracer
+
+
+class Recording_Logger:
+    def __init__(self, traced=True, tracing=False):
+        self.traced = traced
+
+        self.tracing = tracing
+
+        self.tracer = Span_Tracer()
+
+        self.calls = []
+
+    def is_traced(self, collection_name):
+        return self.traced
+
+    def start_log(self, key, class_name, method_name, db_name, collection_name):
+        self.calls.append((key, method_name, db_name, collection_name))
+
+    def exception_log(self, error, class_name, method_name, db_name, collection_name):
+        self.calls.append(("error", method_name, db_name, collection_name))
+
+        raise Exception(f"{method_name} failed with {error}")
+
+
+class Traced_Class:
+    def __init__(self, traced=True, tracing=False):
+        self.class_name = self.__class__.__name__
+
+        self.log_writer = Recording_Logger(traced, tracing)
+
+        self.db_name = "attr_db"
+
+        self.collection_name = "attr_collection"
+
+    @instrumented()
+    def run(self, value, db_name, collection_name="default_collection"):
+        return value * 2
+
+    @instrumented(db="db_name", collection="collection_name")
+    def run_with_attrs(self, value):
+        if value is None:
+            raise ValueError("no value")
+
+        return value
+
+
+def method(self, value, db_name, collection_name="default"):
+    pass
+
+
+def test_value_getter_resolves_arguments():
+    get_db_name = get_value_getter(method, None, "db_name")
+
+    get_collection_name = get_value_getter(method, None, "collection_name")
+
+    assert get_db_name(None, (1, "db"), {}) == "db"
+
+    assert get_db_name(None, (1,), {"db_name": "db"}) == "db"
+
+    assert get_collection_name(None, (1, "db", "collection"), {}) == "collection"
+
+    assert get_collection_name(None, (1,), {"db_name": "db"}) == "default"
+
+    obj = Traced_Class()
+
+    assert get_value_getter(method, "db_name", "db_name")(obj, (), {}) == "attr_db"
+
+
+def test_instrumented_logs_entry_and_exit():
+    obj = Traced_Class()
+
+    assert obj.run(2, "db") == 4
+
+    assert obj.run(value=3, db_name="db", collection_name="collection") == 6
+
+    assert obj.run_with_attrs(5) == 5
+
+    assert obj.log_writer.calls == [
+        ("start", "run", "db", "default_collection"),
+        ("exit", "run", "db", "default_collection"),
+        ("start", "run", "db", "collection"),
+        ("exit", "run", "db", "collection"),
+        ("start", "run_with_attrs", "attr_db", "attr_collection"),
+        ("exit", "run_with_attrs", "attr_db", "attr_collection"),
+    ]
+
+    assert Traced_Class.run.__name__ == "run"
+
+
+def test_instrumented_raises_through_exception_log():
+    obj = Traced_Class()
+
+    with pytest.raises(Exception, match="run_with_attrs failed with no value"):
+        obj.run_with_attrs(None)
+
+    assert obj.log_writer.calls == [
+        ("start", "run_with_attrs", "attr_db", "attr_collection"),
+        ("error", "run_with_attrs", "attr_db", "attr_collection"),
+    ]
+
+
+def test_instrumented_skips_logging_when_not_traced():
+    obj = Traced_Class(traced=False)
+
+    assert obj.run(2, "db") == 4
+
+    assert obj.log_writer.calls == []
+
+
+def get_counts(tracer):
+    return {
+        h["method_name"]: (h["count"], h["errors"]) for h in tracer.get_histograms()
+    }
+
+
+def test_untraced_calls_are_timed():
+    obj = Traced_Class(traced=False)
+
+    obj.run(2, "db")
+
+    obj.run(3, "db")
+
+    with pytest.raises(Exception):
+        obj.run_with_attrs(None)
+
+    assert get_counts(obj.log_writer.tracer) == {
+        "run": (2, 0),
+        "run_with_attrs": (1, 1),
+    }
+
+    assert obj.log_writer.calls == [
+        ("error", "run_with_attrs", "attr_db", "attr_collection")
+    ]
+
+
+def test_spans_are_not_timed_twice():
+    obj = Traced_Class(tracing=True)
+
+    obj.run(2, "db")
+
+    assert get_counts(obj.log_writer.tracer) == {}
+
+
+def test_log_level_filters_records(log_records):
+    log_writer = App_Logger()
+
+    log_writer.log(db_name="db", collection_name="collection", log_info="info")
+
+    log_writer.log(
+        db_name="db", collection_name="collection", log_info="error", level="ERROR"
+    )
+
+    assert [record["Log_Info"] for _, _, record in log_records] == ["error"]
+
+
+class Sampled_Class:
+    def __init__(self):
+        self.class_name = self.__class__.__name__
+
+        self.log_writer = App_Logger()
+
+        self.log_writer.min_levels = {"debug": LOG_LEVELS["DEBUG"]}
+
+        self.log_writer.debug_sample_rate = 0.5
+
+    @instrumented()
+    def outer(self, db_name, collection_name):
+        return self.inner(db_name=db_name, collection_name=collection_name)
+
+    @instrumented()
+    def inner(self, db_name, collection_name):
+        return True
+
+
+def test_entry_and_exit_are_sampled_together(log_records):
+    obj = Sampled_Class()
+
+    for _ in range(200):
+        obj.outer(db_name="db", collection_name="debug")
+
+    messages = [record["Log_Info"] for _, _, record in log_records]
+
+    for method_name in ("outer", "inner"):
+        entered = messages.count(f"Entered {method_name} method of class Sampled_Class")
+
+        exited = messages.count(f"Exited {method_name} method of class Sampled_Class")
+
+        assert entered == exited
+
+        assert 0 < entered < 200
+
+    assert _sampled_calls.get() == ()
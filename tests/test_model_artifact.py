@@ -0,0 +1,87 @@
+import pickle
+
+import numpy as np
+import pytest
+from utils.model_artifact import (
+    TRAILER_SIZE,
+    dump_artifact,
+    load_artifact_bytes,
+    load_artifact_file,
+    read_trailer,
+)
+
+
+def get_model():
+    return {"weights": np.arange(1000, dtype=np.float64), "name": "model"}
+
+
+def check_model(model):
+    np.testing.assert_array_equal(model["weights"], np.arange(1000, dtype=np.float64))
+
+    assert model["name"] == "model"
+
+
+@pytest.mark.parametrize("compress", [0, 3])
+def test_artifact_round_trip(tmp_path, compress):
+    data = dump_artifact(get_model(), compress=compress)
+
+    assert read_trailer(data)["compressed"] is bool(compress)
+
+    assert read_trailer(data)["length"] == len(data) - TRAILER_SIZE
+
+    check_model(load_artifact_bytes(data))
+
+    path = tmp_path / "model.joblib"
+
+    path.write_bytes(data)
+
+    check_model(load_artifact_file(str(path)))
+
+    check_model(load_artifact_file(str(path), mmap_mode=None))
+
+
+def test_artifact_is_memory_mapped(tmp_path):
+    path = tmp_path / "model.joblib"
+
+    path.write_bytes(dump_artifact(get_model()))
+
+    model = load_artifact_file(str(path), mmap_mode="r")
+
+    assert isinstance(model["weights"], np.memmap)
+
+
+def test_corrupted_artifact_fails_checksum(tmp_path):
+    data = bytearray(dump_artifact(get_model()))
+
+    data[100] ^= 0xFF
+
+    with pytest.raises(Exception, match="failed checksum verification"):
+        load_artifact_bytes(bytes(data))
+
+    path = tmp_path / "model.joblib"
+
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(Exception, match="failed checksum verification"):
+        load_artifact_file(str(path))
+
+
+def test_truncated_artifact_is_rejected():
+    data = dump_artifact(get_model())
+
+    with pytest.raises(Exception):
+        load_artifact_bytes(data[:100] + data[-TRAILER_SIZE:])
+
+
+def test_legacy_pickle_fallback(tmp_path):
+    data = pickle.dumps({"name": "legacy"})
+
+    assert read_trailer(data) is None
+
+    assert load_artifact_bytes(data) == {"name": "legacy"}
+
+    path = tmp_path / "model.sav"
+
+    path.write_bytes(data)
+
+    assert load_artifact_file(str(path)) == {"name": "legacy"}
@@ -0,0 +1,92 @@
+import json
+
+from scania.model.model_cache import Prod_Model_Cache
+from sklearn.cluster import KMeans
+from sklearn.dummy import DummyClassifier
+
+
+def save_model(blob_op, container_name, model, idx=None):
+    blob_op.save_model(
+        model=model,
+        model_dir="production",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+        idx=idx,
+    )
+
+
+def get_model_cache(container_name):
+    cache = Prod_Model_Cache()
+
+    cache.model_container = container_name
+
+    return cache
+
+
+def test_models_are_reused_until_their_etag_changes(blob_op, container_name):
+    save_model(blob_op, container_name, KMeans(n_clusters=2))
+
+    save_model(blob_op, container_name, DummyClassifier(), idx=0)
+
+    cache = get_model_cache(container_name)
+
+    first = cache.refresh()
+
+    assert sorted(first["models"]) == ["DummyClassifier0", "KMeans"]
+
+    assert first["clusters"] is None
+
+    second = cache.refresh()
+
+    for model_name in first["models"]:
+        assert second["models"][model_name] is first["models"][model_name]
+
+    save_model(blob_op, container_name, DummyClassifier(strategy="uniform"), idx=0)
+
+    third = cache.refresh()
+
+    assert third["models"]["KMeans"] is first["models"]["KMeans"]
+
+    assert third["models"]["DummyClassifier0"].strategy == "uniform"
+
+    stats = cache.get_stats()
+
+    assert (stats["models_loaded"], stats["models_reused"]) == (3, 3)
+
+
+def test_clusters_are_resolved_from_the_manifest(blob_op, container_name):
+    save_model(blob_op, container_name, KMeans(n_clusters=2))
+
+    for idx in range(2):
+        save_model(blob_op, container_name, DummyClassifier(), idx=idx)
+
+    def get_entry(model_name):
+        file_name = "production/" + model_name + blob_op.model_save_format
+
+        return {
+            "model": model_name,
+            "file": file_name,
+            "etag": blob_op.backend.read_etag(container_name, file_name),
+        }
+
+    cache = get_model_cache(container_name)
+
+    manifest = {
+        "kmeans": get_entry("KMeans"),
+        "clusters": {"0": get_entry("DummyClassifier1"), "1": None},
+    }
+
+    blob_op.upload_bytes(
+        data=json.dumps(manifest).encode(),
+        container_file_name=cache.prod_model_manifest,
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    snapshot = cache.refresh()
+
+    assert snapshot["clusters"] == {"0": "DummyClassifier1"}
+
+    assert sorted(snapshot["models"]) == ["DummyClassifier1", "KMeans"]
@@ -0,0 +1,83 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from scania.mongo_db_operations.mongo_operations import MongoDB_Operation
+
+
+class Fake_Collection:
+    def __init__(self):
+        self.records = []
+
+        self.calls = []
+
+        self.lock = threading.Lock()
+
+    def insert_many(self, records, ordered=True):
+        with self.lock:
+            self.calls.append((len(records), ordered))
+
+            self.records.extend(records)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = Fake_Collection()
+
+    monkeypatch.setattr(
+        MongoDB_Operation,
+        "get_database",
+        lambda self, db_name: {"collection": collection},
+    )
+
+    return collection
+
+
+def get_df():
+    return pd.DataFrame(
+        {
+            "id": np.arange(10, dtype=np.int64),
+            "value": np.array([0.5] * 9 + [np.nan], dtype=np.float32),
+            "class": ["pos", None] * 5,
+        }
+    )
+
+
+def test_column_values():
+    mongo = MongoDB_Operation()
+
+    values = mongo.get_column_values(get_df()["value"])
+
+    assert values.dtype == object
+
+    assert values[0] == 0.5 and type(values[0]) is float
+
+    assert values[-1] is None
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dataframe_records(collection, workers):
+    df = get_df()
+
+    result = MongoDB_Operation().insert_dataframe_as_record(
+        data_frame=df,
+        db_name="db",
+        collection_name="collection",
+        chunk_size=3,
+        workers=workers,
+    )
+
+    assert result["documents"] == 10
+
+    assert result["chunks"] == 4
+
+    assert sorted(collection.calls) == [(1, False), (3, False), (3, False), (3, False)]
+
+    records = sorted(collection.records, key=lambda record: record["id"])
+
+    assert records[0] == {"id": 0, "value": 0.5, "class": "pos"}
+
+    assert records[9] == {"id": 9, "value": None, "class": None}
+
+    assert [record["id"] for record in records] == list(range(10))
@@ -0,0 +1,53 @@
+import pytest
+from scania.model.prediction_from_model import Prediction
+from utils.logger import App_Logger
+from utils.model_utils import get_cluster_number
+
+
+def get_prediction():
+    prediction = Prediction.__new__(Prediction)
+
+    prediction.class_name = Prediction.__name__
+
+    prediction.db_name, prediction.pred_log = "test", "test"
+
+    prediction.log_writer = App_Logger()
+
+    return prediction
+
+
+def test_get_cluster_number():
+    assert get_cluster_number("metrics.XGBoost1-best_score") == 1
+
+    assert get_cluster_number("RandomForest10") == 10
+
+    assert get_cluster_number("KMeans") is None
+
+
+def test_cluster_model_from_manifest():
+    snapshot = {
+        "models": {"KMeans": None, "XGBoost0": None, "RandomForest1": None},
+        "clusters": {"0": "RandomForest1", "1": "XGBoost0"},
+    }
+
+    prediction = get_prediction()
+
+    assert prediction.find_correct_model_file(0, snapshot) == "RandomForest1"
+
+    assert prediction.find_correct_model_file(1.0, snapshot) == "XGBoost0"
+
+
+def test_cluster_model_without_manifest():
+    snapshot = {
+        "models": {"KMeans": None, "XGBoost1": None, "RandomForest10": None},
+        "clusters": None,
+    }
+
+    prediction = get_prediction()
+
+    assert prediction.find_correct_model_file(1, snapshot) == "XGBoost1"
+
+    assert prediction.find_correct_model_file(10, snapshot) == "RandomForest10"
+
+    with pytest.raises(Exception, match="Found 0 production models for 2 cluster"):
+        prediction.find_correct_model_file(2, snapshot)
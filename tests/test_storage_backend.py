@@ -0,0 +1,235 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from scania.blob_storage_operations.storage_backend import (
+    Azure_Storage_Backend,
+    Local_Storage_Backend,
+    Storage_Backend,
+)
+from utils.read_params import read_params
+
+
+def put(backend, container_name, blob_name, data, match_conditions=None):
+    return backend.put(
+        container_name=container_name,
+        blob_name=blob_name,
+        data=data,
+        length=len(data),
+        match_conditions=match_conditions or {},
+    )
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        Storage_Backend()
+
+    class Partial_Backend(Storage_Backend):
+        def get(self, container_name, blob_name):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial_Backend()
+
+
+def test_local_backend_clients(blob_op, container_name):
+    assert isinstance(blob_op.backend, Local_Storage_Backend)
+
+    put(blob_op.backend, container_name, "folder/a.csv", b"a,b\n")
+
+    container_client = blob_op.get_container_client(
+        container_name=container_name, db_name="test", collection_name="test"
+    )
+
+    assert container_client.exists() is True
+
+    assert container_client.list_blob_names("folder/") == ["folder/a.csv"]
+
+    blob_client = blob_op.get_blob_client(
+        blob_file_name="folder/a.csv",
+        container_name=container_name,
+        db_name="test",
+        collection_name="test",
+    )
+
+    assert blob_client.exists() is True
+
+    assert blob_client.readall() == b"a,b\n"
+
+    assert container_client.get_blob_client("folder/b.csv").exists() is False
+
+
+def test_local_put_get_and_list(blob_op, container_name):
+    backend = blob_op.backend
+
+    result = put(backend, container_name, "folder/sub/a.csv", b"a,b\n1,2\n")
+
+    assert result["etag"] == backend.get_etag(
+        backend.get_path(container_name, "folder/sub/a.csv")
+    )
+
+    assert result["content_md5"] is not None
+
+    put(backend, container_name, "folder/b.csv", b"a,b\n")
+
+    blob = backend.get(container_name, "folder/sub/a.csv")
+
+    assert blob.readall() == b"a,b\n1,2\n"
+
+    assert b"".join(blob.chunks()) == b"a,b\n1,2\n"
+
+    assert backend.get_range(container_name, "folder/sub/a.csv", 4, 3) == b"1,2"
+
+    data, etag = backend.read_versioned(container_name, "folder/sub/a.csv")
+
+    assert (data, etag) == (b"a,b\n1,2\n", result["etag"])
+
+    assert backend.read_versioned(container_name, "folder/missing.csv") == (None, None)
+
+    assert backend.list(container_name, "folder/") == [
+        "folder/b.csv",
+        "folder/sub/a.csv",
+    ]
+
+    pages = list(backend.list_pages(container_name, "folder/", results_per_page=1))
+
+    assert [[blob["name"] for blob in page] for page in pages] == [
+        ["folder/b.csv"],
+        ["folder/sub/a.csv"],
+    ]
+
+    (page,) = backend.list_pages(container_name, "folder/", delimiter="/")
+
+    assert [(blob["name"], blob["is_prefix"]) for blob in page] == [
+        ("folder/b.csv", False),
+        ("folder/sub/", True),
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        backend.get(container_name, "folder/missing.csv")
+
+
+def test_local_blob_names_are_kept_verbatim(blob_op, container_name):
+    backend = blob_op.backend
+
+    names = [
+        "production//KMeans.joblib",
+        "production/./KMeans.joblib",
+        "production/../KMeans.joblib",
+        "production/KMeans.joblib",
+        "production/a b%20.csv",
+        "production/part.tmp",
+    ]
+
+    for idx, name in enumerate(names):
+        put(backend, container_name, name, str(idx).encode())
+
+    assert backend.list(container_name, "production/") == sorted(names)
+
+    for idx, name in enumerate(names):
+        assert backend.get(container_name, name).readall() == str(idx).encode()
+
+    assert os.listdir(backend.get_path(container_name)) == ["production"]
+
+    (page,) = backend.list_pages(container_name, "production//", delimiter="/")
+
+    assert [blob["name"] for blob in page] == ["production//KMeans.joblib"]
+
+
+def test_local_match_conditions(blob_op, container_name):
+    backend = blob_op.backend
+
+    first = put(backend, container_name, "a.csv", b"1")
+
+    no_replace = blob_op.get_match_conditions(
+        replace=False, if_match=None, if_none_match=None
+    )
+
+    assert put(backend, container_name, "a.csv", b"22", no_replace) is None
+
+    assert put(backend, container_name, "b.csv", b"1", no_replace) is not None
+
+    stale = blob_op.get_match_conditions(
+        replace=True, if_match='"0x0"', if_none_match=None
+    )
+
+    assert put(backend, container_name, "a.csv", b"22", stale) is None
+
+    current = blob_op.get_match_conditions(
+        replace=True, if_match=first["etag"], if_none_match=None
+    )
+
+    second = put(backend, container_name, "a.csv", b"22", current)
+
+    assert second is not None and second["etag"] != first["etag"]
+
+    unchanged = blob_op.get_match_conditions(
+        replace=True, if_match=None, if_none_match=second["etag"]
+    )
+
+    assert put(backend, container_name, "a.csv", b"333", unchanged) is None
+
+    assert backend.get(container_name, "a.csv").readall() == b"22"
+
+
+def test_local_copy_and_delete(blob_op, container_name):
+    backend = blob_op.backend
+
+    put(backend, container_name, "a.csv", b"a,b\n")
+
+    job = backend.copy(container_name, "a.csv", container_name, "copy/a.csv")
+
+    assert job.wait().status == "success"
+
+    assert job.size == 4
+
+    assert job.etag == backend.get_etag(backend.get_path(container_name, "copy/a.csv"))
+
+    assert backend.get(container_name, "copy/a.csv").readall() == b"a,b\n"
+
+    failed = backend.copy(container_name, "missing.csv", container_name, "b.csv")
+
+    assert failed.status == "failed"
+
+    assert backend.delete(container_name, ["a.csv", "missing.csv"]) == {
+        "a.csv": "success",
+        "missing.csv": "failed with status 404",
+    }
+
+    assert backend.exists(container_name, "a.csv") is False
+
+    assert backend.exists(container_name, "copy/a.csv") is True
+
+
+class Fake_Container_Client:
+    def __init__(self):
+        self.calls = []
+
+    def list_blobs(self, **kwargs):
+        self.calls.append(kwargs)
+
+        return SimpleNamespace(by_page=lambda: iter([]))
+
+    walk_blobs = list_blobs
+
+
+def test_azure_list_pages_uses_configured_page_size():
+    backend = Azure_Storage_Backend.__new__(Azure_Storage_Backend)
+
+    backend.results_per_page = read_params()["blob_list"]["results_per_page"]
+
+    client = Fake_Container_Client()
+
+    backend.get_container_client = lambda container_name: client
+
+    list(backend.list_pages("container", "folder/"))
+
+    list(backend.list_pages("container", "folder/", delimiter="/"))
+
+    list(backend.list_pages("container", "folder/", results_per_page=10))
+
+    assert [call["results_per_page"] for call in client.calls] == [
+        backend.results_per_page,
+        backend.results_per_page,
+        10,
+    ]
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.run_context import submit_with_context
+from utils.tracer import Span_Tracer
+
+
+def run_child(tracer, name):
+    tracer.start_span("Worker", name)
+
+    return tracer.end_span("Worker", name)
+
+
+def test_worker_spans_are_children_of_the_caller():
+    tracer = Span_Tracer()
+
+    tracer.start_span("Caller", "run")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            submit_with_context(executor, run_child, tracer, f"task_{idx}")
+            for idx in range(4)
+        ]
+
+        children = [future.result() for future in futures]
+
+        orphan = executor.submit(run_child, tracer, "orphan").result()
+
+    parent = tracer.end_span("Caller", "run")
+
+    assert tracer.get_stack() == ()
+
+    for child in children:
+        assert child["trace_id"] == parent["trace_id"]
+
+        assert child["parent_span_id"] == parent["span_id"]
+
+    assert orphan["parent_span_id"] is None
+
+    assert orphan["trace_id"] != parent["trace_id"]
+
+
+def test_end_span_drops_unclosed_children():
+    tracer = Span_Tracer()
+
+    tracer.start_span("Caller", "outer")
+
+    tracer.start_span("Caller", "inner")
+
+    tracer.set_error("Caller", "outer", ValueError("failed"))
+
+    outer = tracer.end_span("Caller", "outer")
+
+    assert outer["error"] == "failed"
+
+    assert tracer.get_stack() == ()
+
+    assert tracer.end_span("Caller", "inner") is None
+
+    (histogram,) = tracer.get_histograms()
+
+    assert (histogram["method_name"], histogram["count"], histogram["errors"]) == (
+        "outer",
+        1,
+        1,
+    )
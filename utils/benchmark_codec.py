@@ -0,0 +1,95 @@
+import argparse
+import time
+from io import BufferedReader, BytesIO
+
+import pandas as pd
+from scania.blob_storage_operations.blob_codec import (
+    Compressed_Stream,
+    open_decoded_stream,
+    zstandard,
+)
+
+
+def benchmark_codec(data, codec, level, chunk_size, bandwidth):
+    """
+    Method Name :   benchmark_codec
+    Description :   This method compresses the data with the codec, parses it back with pandas while
+                    decompressing and returns the sizes, timings and the estimated transfer time saved
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    start = time.perf_counter()
+
+    if codec == "none":
+        compressed = data
+
+    else:
+        compressed = b"".join(Compressed_Stream(data, codec, level, chunk_size))
+
+    compress_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    df = pd.read_csv(open_decoded_stream(BufferedReader(BytesIO(compressed))))
+
+    parse_time = time.perf_counter() - start
+
+    transfer_saved = (len(data) - len(compressed)) / bandwidth
+
+    return {
+        "codec": codec,
+        "level": level,
+        "bytes": len(compressed),
+        "ratio": round(len(data) / max(len(compressed), 1), 2),
+        "compress_s": round(compress_time, 4),
+        "parse_s": round(parse_time, 4),
+        "transfer_saved_s": round(transfer_saved, 4),
+        "net_saved_s": round(transfer_saved - compress_time, 4),
+        "rows": df.shape[0],
+    }
+
+
+def benchmark_codecs(file_path, levels, chunk_size, bandwidth):
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    codecs = ["gzip"] if zstandard is None else ["gzip", "zstd"]
+
+    results = [benchmark_codec(data, "none", 0, chunk_size, bandwidth)]
+
+    for codec in codecs:
+        for level in levels:
+            results.append(benchmark_codec(data, codec, level, chunk_size, bandwidth))
+
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare blob codecs on a csv batch file"
+    )
+
+    parser.add_argument("file_path")
+
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 3, 6, 9])
+
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024)
+
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=12.5 * 1024 * 1024,
+        help="bytes per second between the app and blob storage",
+    )
+
+    args = parser.parse_args()
+
+    print(
+        benchmark_codecs(
+            file_path=args.file_path,
+            levels=args.levels,
+            chunk_size=args.chunk_size,
+            bandwidth=args.bandwidth,
+        ).to_string(index=False)
+    )
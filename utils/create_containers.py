@@ -1,4 +1,3 @@
-import os
 from scania.blob_storage_operations.blob_operations import Blob_Operation
 from utils.logger import App_Logger
 from utils.read_params import read_params
@@ -8,8 +7,6 @@ class Azure_Container:
     def __init__(self):
         self.config = read_params()
 
-        self.connection_string = os.environ["AZURE_CONN_STR"]
-
         self.containers = list(self.config["container"].values())
 
         self.blob = Blob_Operation()
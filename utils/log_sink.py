@@ -0,0 +1,291 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+from scania.mongo_db_operations.mongo_operations import MongoDB_Operation
+from utils.read_params import read_params
+
+
+class Log_Sink:
+    """
+    Description :   This class shall be used for queueing the log records of the process and writing them to
+                    mongodb in batches from a background thread, flushed once the batch is full or the flush
+                    interval has passed
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.enabled = self.config["log_sink"]["enabled"]
+
+        self.queue_size = self.config["log_sink"]["queue_size"]
+
+        self.batch_size = self.config["log_sink"]["batch_size"]
+
+        self.flush_interval = self.config["log_sink"]["flush_interval"]
+
+        self.full_policy = self.config["log_sink"]["full_policy"]
+
+        self.block_timeout = self.config["log_sink"]["block_timeout"]
+
+        self.retention = self.config["log_retention"]
+
+        if self.full_policy not in ("block", "drop"):
+            raise Exception(f"{self.full_policy} is not a supported log sink policy")
+
+        self.mongo = None
+
+        self.lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+        """
+        Method Name :   reset
+        Description :   This method drops the queue and the writer thread, used after fork where the thread of
+                        the parent process does not exist
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.pid = os.getpid()
+
+        self.queue = queue.Queue(maxsize=self.queue_size)
+
+        self.thread = None
+
+        self.closing = threading.Event()
+
+        self.stats = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "provision_failed": 0,
+        }
+
+        self.provisioned = set()
+
+    def get_mongo(self):
+        if self.mongo is None:
+            self.mongo = MongoDB_Operation()
+
+        return self.mongo
+
+    def provision(self, db_name, collection_name):
+        """
+        Method Name :   provision
+        Description :   This method sets up the retention and the run index of the log collection the first time
+                        the process writes to it, a failure is counted and not retried so that logging goes on
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        key = (db_name, collection_name)
+
+        if key in self.provisioned:
+            return
+
+        self.provisioned.add(key)
+
+        try:
+            self.get_mongo().ensure_log_collection(
+                db_name=db_name,
+                collection_name=collection_name,
+                mode=self.retention["mode"],
+                ttl_seconds=self.retention["ttl_seconds"],
+                capped_size=self.retention["capped_size_bytes"],
+                capped_max=self.retention["capped_max_docs"],
+            )
+
+        except Exception:
+            self.stats["provision_failed"] += 1
+
+    def start(self):
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+
+            if self.thread is None:
+                self.closing.clear()
+
+                self.thread = threading.Thread(
+                    target=self.run, name="log-sink-writer", daemon=True
+                )
+
+                self.thread.start()
+
+    def write(self, db_name, collection_name, record):
+        """
+        Method Name :   write
+        Description :   This method queues the record for the collection, waiting for room or dropping it when
+                        the queue is full as per the configured policy, the record is inserted right away when
+                        the sink is disabled
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        if self.enabled is not True:
+            self.provision(db_name, collection_name)
+
+            self.get_mongo().insert_record(
+                db_name=db_name, collection_name=collection_name, data=record
+            )
+
+            return
+
+        if self.thread is None or self.pid != os.getpid():
+            self.start()
+
+        try:
+            if self.full_policy == "block":
+                self.queue.put(
+                    (db_name, collection_name, record), timeout=self.block_timeout
+                )
+
+            else:
+                self.queue.put_nowait((db_name, collection_name, record))
+
+            self.stats["queued"] += 1
+
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def write_batch(self, batch):
+        by_collection = {}
+
+        for db_name, collection_name, record in batch:
+            by_collection.setdefault((db_name, collection_name), []).append(record)
+
+        for (db_name, collection_name), records in by_collection.items():
+            self.provision(db_name, collection_name)
+
+            try:
+                self.get_mongo().insert_records(
+                    db_name=db_name, collection_name=collection_name, data=records
+                )
+
+                self.stats["written"] += len(records)
+
+            except Exception:
+                self.stats["failed"] += len(records)
+
+        self.stats["batches"] += 1
+
+    def run(self):
+        stop = False
+
+        while not stop:
+            batch = []
+
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    stop = True
+
+                    break
+
+                batch.append(item)
+
+            if batch:
+                self.write_batch(batch)
+
+            if self.closing.is_set() and self.queue.empty():
+                stop = True
+
+    def close(self, timeout=None):
+        """
+        Method Name :   close
+        Description :   This method writes the queued records and stops the writer thread, the thread is woken
+                        up without waiting for room in a full queue, it stops once the queue is drained and
+                        the next record starts it again
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            thread = self.thread
+
+            if thread is None or self.pid != os.getpid():
+                return
+
+            self.closing.set()
+
+            try:
+                self.queue.put_nowait(None)
+
+            except queue.Full:
+                pass
+
+            thread.join(timeout)
+
+            self.thread = None
+
+    def get_stats(self):
+        stats = dict(self.stats)
+
+        stats["pending"] = self.queue.qsize()
+
+        return stats
+
+
+_sink = None
+
+_sink_lock = threading.Lock()
+
+
+def get_log_sink():
+    """
+    Method Name :   get_log_sink
+    Description :   This method returns the process wide log sink
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _sink
+
+    with _sink_lock:
+        if _sink is None:
+            _sink = Log_Sink()
+
+        return _sink
+
+
+def close_log_sink():
+    """
+    Method Name :   close_log_sink
+    Description :   This method writes the queued records of the process wide log sink if it was created
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    if _sink is not None:
+        _sink.close()
+
+
+def _reset_sink_after_fork():
+    if _sink is not None:
+        _sink.lock = threading.Lock()
+
+        _sink.reset()
+
+
+atexit.register(close_log_sink)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_sink_after_fork)
@@ -1,23 +1,147 @@
+import contextvars
+import functools
+import inspect
+import random
+import time
 from datetime import datetime
-from scania.mongo_db_operations.mongo_operations import MongoDB_Operation
+
+from utils.log_sink import get_log_sink
+from utils.read_params import read_params
+from utils.run_context import get_run_id
+from utils.tracer import get_tracer
+
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
+
+_level_config = None
+
+_sampled_calls = contextvars.ContextVar("sampled_calls", default=())
+
+
+def get_level_config():
+    """
+    Method Name :   get_level_config
+    Description :   This method returns the minimum log level of every collection along with the sampling rate
+                    of debug records, read once per process from params.yaml
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _level_config
+
+    if _level_config is None:
+        config = read_params()["log_level"]
+
+        _level_config = {
+            "default": LOG_LEVELS[config["default"]],
+            "collections": {
+                collection_name: LOG_LEVELS[level]
+                for collection_name, level in (config["collections"] or {}).items()
+            },
+            "debug_sample_rate": config["debug_sample_rate"],
+        }
+
+    return _level_config
 
 
 class App_Logger:
     def __init__(self):
-        self.mongo = MongoDB_Operation()
+        self.sink = get_log_sink()
 
         self.class_name = self.__class__.__name__
 
-    def log(self, db_name, collection_name, log_info):
+        level_config = get_level_config()
+
+        self.default_level = level_config["default"]
+
+        self.min_levels = level_config["collections"]
+
+        self.debug_sample_rate = level_config["debug_sample_rate"]
+
+        self.tracer = get_tracer()
+
+        self.tracing = self.tracer.enabled is True
+
+    def is_enabled(self, collection_name, level):
+        """
+        Method Name :   is_enabled
+        Description :   This method checks whether a record of the level is written to the collection, debug
+                        records being sampled at the configured rate
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        level_no = LOG_LEVELS[level]
+
+        if level_no < self.min_levels.get(collection_name, self.default_level):
+            return False
+
+        if level_no == 10 and self.debug_sample_rate < 1:
+            return random.random() < self.debug_sample_rate
+
+        return True
+
+    def is_call_sampled(self, key, class_name, method_name, collection_name):
+        """
+        Method Name :   is_call_sampled
+        Description :   This method checks whether the entry and exit records of a method call are written, the
+                        sampling decision being taken once on entry and kept in the context for the exit so that
+                        both or neither record of the call are written
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        if LOG_LEVELS["DEBUG"] < self.min_levels.get(
+            collection_name, self.default_level
+        ):
+            return False
+
+        if self.debug_sample_rate >= 1:
+            return True
+
+        calls = _sampled_calls.get()
+
+        if key == "start":
+            sampled = random.random() < self.debug_sample_rate
+
+            _sampled_calls.set(calls + ((class_name, method_name, sampled),))
+
+            return sampled
+
+        for idx in range(len(calls) - 1, -1, -1):
+            if calls[idx][:2] == (class_name, method_name):
+                _sampled_calls.set(calls[:idx])
+
+                return calls[idx][2]
+
+        return random.random() < self.debug_sample_rate
+
+    def is_traced(self, collection_name):
+        return (
+            self.tracing
+            or self.min_levels.get(collection_name, self.default_level) <= 10
+        )
+
+    def get_record(self, log_info, level):
+        now = datetime.now()
+
+        return {
+            "Log_updated_date": str(now),
+            "Log_updated_time": str(now.strftime("%H:%M:%S")),
+            "Log_Timestamp": datetime.utcnow(),
+            "Run_Id": get_run_id(),
+            "Log_Level": level,
+            "Log_Info": log_info,
+        }
+
+    def log(self, db_name, collection_name, log_info, level="INFO"):
+        if not self.is_enabled(collection_name, level):
+            return
+
         try:
-            log = {
-                "Log_updated_date": str(datetime.now()),
-                "Log_updated_time": str(datetime.now().strftime("%H:%M:%S")),
-                "Log_Info": log_info,
-            }
-
-            self.mongo.insert_record(
-                db_name=db_name, collection_name=collection_name, data=log
+            log = self.get_record(log_info=log_info, level=level)
+
+            self.sink.write(
+                db_name=db_name, collection_name=collection_name, record=log
             )
 
         except Exception as e:
@@ -26,10 +150,22 @@ class App_Logger:
     def start_log(self, key, class_name, method_name, db_name, collection_name):
         """
         Method Name :   start_log
-        Description :   This method is used for logging the entry or exit of method depending on key value
+        Description :   This method is used for logging the entry or exit of method depending on key value,
+                        written at debug level with one sampling decision for both, and for opening or closing
+                        the span of the method
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
+        if self.tracing:
+            if key == "start":
+                self.tracer.start_span(class_name, method_name)
+
+            else:
+                self.tracer.end_span(class_name, method_name)
+
+        if not self.is_call_sampled(key, class_name, method_name, collection_name):
+            return
+
         start_method_name = self.start_log.__name__
 
         try:
@@ -39,7 +175,11 @@ class App_Logger:
 
             log_msg = f"{key} {method_name} method of class {class_name}"
 
-            self.log(db_name=db_name, collection_name=collection_name, log_info=log_msg)
+            self.sink.write(
+                db_name=db_name,
+                collection_name=collection_name,
+                record=self.get_record(log_info=log_msg, level="DEBUG"),
+            )
 
         except Exception as e:
             error_msg = f"Exception occured in Class : {self.class_name}, Method : {start_method_name}, Error : {str(e)}"
@@ -53,6 +193,8 @@ class App_Logger:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
+        if self.tracing:
+            self.tracer.set_error(class_name, method_name, error)
 
         self.start_log(
             key="exit",
@@ -65,7 +207,113 @@ class App_Logger:
         exception_msg = f"Exception occured in Class : {class_name}, Method : {method_name}, Error : {str(error)}"
 
         self.log(
-            db_name=db_name, collection_name=collection_name, log_info=exception_msg
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=exception_msg,
+            level="ERROR",
         )
 
         raise Exception(exception_msg)
+
+
+def get_value_getter(func, attr_name, arg_name):
+    if attr_name is not None:
+        return lambda obj, args, kwargs: getattr(obj, attr_name)
+
+    params = list(inspect.signature(func).parameters.values())
+
+    idx = [param.name for param in params].index(arg_name)
+
+    default = params[idx].default
+
+    def getter(obj, args, kwargs):
+        if arg_name in kwargs:
+            return kwargs[arg_name]
+
+        if idx - 1 < len(args):
+            return args[idx - 1]
+
+        return default
+
+    return getter
+
+
+def instrumented(db=None, collection=None):
+    """
+    Method Name :   instrumented
+    Description :   This method returns a decorator which logs the entry and exit of the method and opens its
+                    span through the log_writer of the instance, turning an exception into the one raised by
+                    exception_log. db and collection name the attributes of the instance holding the log db
+                    and collection, which are taken from the db_name and collection_name arguments of the
+                    method when not given. The call is timed into the method histogram of the tracer, by its
+                    span when tracing is enabled and directly otherwise, and when neither tracing nor debug
+                    logs are enabled for the collection no logging work is done around it
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def decorator(func):
+        method_name = func.__name__
+
+        get_db_name = get_value_getter(func, db, "db_name")
+
+        get_collection_name = get_value_getter(func, collection, "collection_name")
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            log_writer = self.log_writer
+
+            db_name = get_db_name(self, args, kwargs)
+
+            collection_name = get_collection_name(self, args, kwargs)
+
+            traced = log_writer.is_traced(collection_name)
+
+            if traced:
+                log_writer.start_log(
+                    key="start",
+                    class_name=self.class_name,
+                    method_name=method_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                )
+
+            start = time.perf_counter()
+
+            try:
+                result = func(self, *args, **kwargs)
+
+            except Exception as e:
+                if not log_writer.tracing:
+                    log_writer.tracer.record(
+                        self.class_name, method_name, time.perf_counter() - start, e
+                    )
+
+                log_writer.exception_log(
+                    error=e,
+                    class_name=self.class_name,
+                    method_name=method_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                )
+
+            if not log_writer.tracing:
+                log_writer.tracer.record(
+                    self.class_name, method_name, time.perf_counter() - start
+                )
+
+            if traced:
+                log_writer.start_log(
+                    key="exit",
+                    class_name=self.class_name,
+                    method_name=method_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                )
+
+            return result
+
+        return wrapper
+
+    return decorator
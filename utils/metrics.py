@@ -0,0 +1,116 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from utils.read_params import read_params
+
+config = read_params()
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_LATENCY = Histogram(
+    "scania_request_duration_seconds",
+    "Latency of the api requests",
+    ["route"],
+    buckets=config["metrics"]["request_buckets"],
+)
+
+STAGE_DURATION = Histogram(
+    "scania_pipeline_stage_duration_seconds",
+    "Duration of the pipeline stages",
+    ["stage"],
+    buckets=config["metrics"]["stage_buckets"],
+)
+
+JOBS_IN_PROGRESS = Gauge(
+    "scania_jobs_in_progress",
+    "Pipeline jobs currently running",
+    ["job"],
+    multiprocess_mode="livesum",
+)
+
+BLOB_BYTES = Counter(
+    "scania_blob_bytes_total",
+    "Bytes transferred to and from blob storage",
+    ["direction"],
+)
+
+MONGO_INSERTS = Counter(
+    "scania_mongo_inserted_documents_total",
+    "Documents inserted in mongodb",
+    ["db_name"],
+)
+
+MODEL_CACHE_REQUESTS = Counter(
+    "scania_model_cache_requests_total",
+    "Production model cache lookups by result",
+    ["result"],
+)
+
+
+@contextmanager
+def track_job(job):
+    """
+    Method Name :   track_job
+    Description :   This method counts the job as in progress and times it as a pipeline stage while the block
+                    runs
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    gauge = JOBS_IN_PROGRESS.labels(job=job)
+
+    gauge.inc()
+
+    try:
+        with track_stage(job):
+            yield
+
+    finally:
+        gauge.dec()
+
+
+@contextmanager
+def track_stage(stage):
+    start = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        STAGE_DURATION.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def get_metrics_output():
+    """
+    Method Name :   get_metrics_output
+    Description :   This method returns the metrics in the prometheus text format along with its content type,
+                    aggregated over every worker process when PROMETHEUS_MULTIPROC_DIR is set
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+
+        multiprocess.MultiProcessCollector(registry)
+
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,142 @@
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from io import BytesIO
+
+import joblib
+
+ARTIFACT_MAGIC = b"SCMA"
+
+ARTIFACT_VERSION = 1
+
+TRAILER_FORMAT = "<4sBBQI"
+
+TRAILER_SIZE = struct.calcsize(TRAILER_FORMAT)
+
+CHECKSUM_CHUNK_SIZE = 16 * 1024 * 1024
+
+_verified = set()
+
+
+def dump_artifact(model, compress=0):
+    """
+    Method Name :   dump_artifact
+    Description :   This method serializes the model with joblib, numpy arrays stored raw unless compressed,
+                    followed by a fixed size trailer holding the payload length and checksum, so that the
+                    payload starts at offset 0 and can be memory mapped
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    buffer = BytesIO()
+
+    joblib.dump(model, buffer, compress=compress)
+
+    payload_len = buffer.tell()
+
+    checksum = zlib.crc32(buffer.getbuffer())
+
+    buffer.write(
+        struct.pack(
+            TRAILER_FORMAT,
+            ARTIFACT_MAGIC,
+            ARTIFACT_VERSION,
+            1 if compress else 0,
+            payload_len,
+            checksum,
+        )
+    )
+
+    return buffer.getvalue()
+
+
+def read_trailer(trailer):
+    if len(trailer) < TRAILER_SIZE:
+        return None
+
+    magic, version, compressed, payload_len, checksum = struct.unpack(
+        TRAILER_FORMAT, trailer[-TRAILER_SIZE:]
+    )
+
+    if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+        return None
+
+    return {"compressed": compressed == 1, "length": payload_len, "checksum": checksum}
+
+
+def verify_payload(payload, trailer, name):
+    if len(payload) != trailer["length"]:
+        raise Exception(
+            f"{name} artifact is truncated, expected {trailer['length']} bytes but got {len(payload)}"
+        )
+
+    if zlib.crc32(payload) != trailer["checksum"]:
+        raise Exception(f"{name} artifact failed checksum verification")
+
+
+def load_artifact_bytes(data, name="model"):
+    """
+    Method Name :   load_artifact_bytes
+    Description :   This method loads a model artifact held in memory, falling back to plain pickle for
+                    models saved before the artifact format
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    trailer = read_trailer(data)
+
+    if trailer is None:
+        return pickle.loads(data)
+
+    payload = memoryview(data)[: len(data) - TRAILER_SIZE]
+
+    verify_payload(payload, trailer, name)
+
+    return joblib.load(BytesIO(payload))
+
+
+def load_artifact_file(path, name="model", mmap_mode="r"):
+    """
+    Method Name :   load_artifact_file
+    Description :   This method loads a model artifact from a local file, memory mapping its numpy arrays
+                    when it is not compressed so that processes loading the same file share its pages, the
+                    checksum is verified once per file and process
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        f.seek(max(size - TRAILER_SIZE, 0))
+
+        trailer = read_trailer(f.read())
+
+        if trailer is None:
+            f.seek(0)
+
+            return pickle.load(f)
+
+        key = (path, os.fstat(f.fileno()).st_mtime_ns, size)
+
+        if key not in _verified:
+            payload_len, checksum = size - TRAILER_SIZE, 0
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, payload_len, CHECKSUM_CHUNK_SIZE):
+                    end = min(start + CHECKSUM_CHUNK_SIZE, payload_len)
+
+                    checksum = zlib.crc32(mm[start:end], checksum)
+
+            if payload_len != trailer["length"] or checksum != trailer["checksum"]:
+                raise Exception(f"{name} artifact failed checksum verification")
+
+            _verified.add(key)
+
+    if trailer["compressed"] or mmap_mode is None:
+        with open(path, "rb") as f:
+            return joblib.load(BytesIO(f.read(trailer["length"])))
+
+    return joblib.load(path, mmap_mode=mmap_mode)
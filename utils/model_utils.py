@@ -1,10 +1,26 @@
+import re
+
 from sklearn.metrics import accuracy_score, roc_auc_score
 from sklearn.model_selection import GridSearchCV
 
-from utils.logger import App_Logger
+from utils.logger import App_Logger, instrumented
 from utils.read_params import read_params
 
 
+def get_cluster_number(name):
+    """
+    Method Name :   get_cluster_number
+    Description :   This method returns the cluster number at the end of a model name like XGBoost1 or of a
+                    metric name like metrics.XGBoost1-best_score, or None when there is no cluster number
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    match = re.search(r"(\d+)(?:-best_score)?$", name)
+
+    return None if match is None else int(match.group(1))
+
+
 class Model_Utils:
     def __init__(self):
         self.log_writer = App_Logger()
@@ -13,6 +29,7 @@ class Model_Utils:
 
         self.class_name = self.__class__.__name__
 
+    @instrumented()
     def get_model_name(self, model, db_name, collection_name):
         """
         Method Name :   get_model_name
@@ -21,44 +38,17 @@ class Model_Utils:
         Version     :   1.2
         Revisions   :   Moved to setup to cloud
         """
-        method_name = self.get_model_name.__name__
+        model_name = model.__class__.__name__
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
+        self.log_writer.log(
             db_name=db_name,
             collection_name=collection_name,
+            log_info=f"Got the {model} model_name",
         )
 
-        try:
-            model_name = model.__class__.__name__
-
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got the {model} model_name",
-            )
-
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            return model_name
-
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return model_name
 
+    @instrumented()
     def get_model_param_grid(self, model_key_name, db_name, collection_name):
         """
         Method Name :   get_model_param_grid
@@ -67,52 +57,24 @@ class Model_Utils:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.get_model_param_grid.__name__
-
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
-
-        try:
-            model_grid = {}
-
-            model_grid.__getattribute__
-
-            model_param_name = self.config["model_params"][model_key_name]
+        model_grid = {}
 
-            params_names = list(model_param_name.keys())
+        model_grid.__getattribute__
 
-            for param in params_names:
-                model_grid[param] = model_param_name[param]
+        model_param_name = self.config["model_params"][model_key_name]
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Inserted {model_key_name} params to model_grid dict",
-            )
+        params_names = list(model_param_name.keys())
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        for param in params_names:
+            model_grid[param] = model_param_name[param]
 
-            return model_grid
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Inserted {model_key_name} params to model_grid dict",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return model_grid
 
     def get_model_score(self, model, test_x, test_y, db_name, collection_name):
         """
@@ -182,6 +144,7 @@ class Model_Utils:
                 collection_name=collection_name,
             )
 
+    @instrumented()
     def get_model_params(
         self, model, model_key_name, x_train, y_train, db_name, collection_name
     ):
@@ -192,70 +155,42 @@ class Model_Utils:
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.get_model_params.__name__
+        cv = self.config["model_utils"]["cv"]
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
-
-        try:
-            cv = self.config["model_utils"]["cv"]
+        verbose = self.config["model_utils"]["verbose"]
 
-            verbose = self.config["model_utils"]["verbose"]
+        n_jobs = self.config["model_utils"]["n_jobs"]
 
-            n_jobs = self.config["model_utils"]["n_jobs"]
-
-            model_name = self.get_model_name(
-                model=model, db_name=db_name, collection_name=collection_name
-            )
-
-            model_param_grid = self.get_model_param_grid(
-                model_key_name=model_key_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            model_grid = GridSearchCV(
-                estimator=model,
-                param_grid=model_param_grid,
-                cv=cv,
-                verbose=verbose,
-                n_jobs=n_jobs,
-            )
+        model_name = self.get_model_name(
+            model=model, db_name=db_name, collection_name=collection_name
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Initialized {model_grid.__class__.__name__}  with {model_param_grid} as params",
-            )
+        model_param_grid = self.get_model_param_grid(
+            model_key_name=model_key_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
 
-            model_grid.fit(x_train, y_train)
+        model_grid = GridSearchCV(
+            estimator=model,
+            param_grid=model_param_grid,
+            cv=cv,
+            verbose=verbose,
+            n_jobs=n_jobs,
+        )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Found the best params for {model_name} model based on {model_param_grid} as params",
-            )
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Initialized {model_grid.__class__.__name__}  with {model_param_grid} as params",
+        )
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        model_grid.fit(x_train, y_train)
 
-            return model_grid.best_params_
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Found the best params for {model_name} model based on {model_param_grid} as params",
+        )
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        return model_grid.best_params_
@@ -0,0 +1,47 @@
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import uuid4
+
+run_id_var = contextvars.ContextVar("run_id", default=None)
+
+
+def new_run_id(kind):
+    return f"{kind}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid4().hex[:8]}"
+
+
+def get_run_id():
+    return run_id_var.get()
+
+
+@contextmanager
+def run_context(kind):
+    """
+    Method Name :   run_context
+    Description :   This method sets a new run id for the block, stamped on every log record written from it
+                    and from the tasks it submits through submit_with_context
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    run_id = new_run_id(kind)
+
+    token = run_id_var.set(run_id)
+
+    try:
+        yield run_id
+
+    finally:
+        run_id_var.reset(token)
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """
+    Method Name :   submit_with_context
+    Description :   This method submits the function to the executor to run in a copy of the current context,
+                    so that the worker thread logs with the run id of the caller
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
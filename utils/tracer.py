@@ -0,0 +1,354 @@
+import atexit
+import bisect
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from utils.read_params import read_params
+
+
+class Span_Tracer:
+    """
+    Description :   This class shall be used for turning the entry and exit logs of methods into timed spans,
+                    nested per context so that the tasks submitted through submit_with_context are children of
+                    the span of the caller, and keeping a latency histogram per class and method
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.enabled = self.config["tracing"]["enabled"]
+
+        self.buckets = sorted(self.config["tracing"]["buckets"])
+
+        self.max_spans = self.config["tracing"]["max_spans"]
+
+        self.export_file = self.config["tracing"]["export_file"]
+
+        self.service_name = self.config["tracing"]["service_name"]
+
+        self.lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+        self.stack_var = contextvars.ContextVar("span_stack", default=())
+
+        self.spans = deque(maxlen=self.max_spans)
+
+        self.histograms = {}
+
+        self.started_at = time.time_ns()
+
+    def get_stack(self):
+        return self.stack_var.get()
+
+    def start_span(self, class_name, method_name):
+        """
+        Method Name :   start_span
+        Description :   This method opens a span for the method as a child of the span open in the context, the
+                        stack is replaced rather than changed so that the contexts copied from it are not affected
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        stack = self.get_stack()
+
+        parent = stack[-1] if stack else None
+
+        span = {
+            "class_name": class_name,
+            "method_name": method_name,
+            "trace_id": "%032x" % random.getrandbits(128)
+            if parent is None
+            else parent["trace_id"],
+            "span_id": "%016x" % random.getrandbits(64),
+            "parent_span_id": None if parent is None else parent["span_id"],
+            "start_time": time.time_ns(),
+            "start": time.perf_counter(),
+            "error": None,
+        }
+
+        self.stack_var.set(stack + (span,))
+
+    def find_span(self, stack, class_name, method_name):
+        for idx in range(len(stack) - 1, -1, -1):
+            span = stack[idx]
+
+            if span["method_name"] == method_name and span["class_name"] == class_name:
+                return idx
+
+        return None
+
+    def set_error(self, class_name, method_name, error):
+        stack = self.get_stack()
+
+        idx = self.find_span(stack, class_name, method_name)
+
+        if idx is not None:
+            stack[idx]["error"] = str(error)
+
+    def end_span(self, class_name, method_name):
+        """
+        Method Name :   end_span
+        Description :   This method closes the latest open span of the method in the context, dropping the spans
+                        opened after it which were never closed, and adds its duration to the histogram of the
+                        method
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        end = time.perf_counter()
+
+        stack = self.get_stack()
+
+        idx = self.find_span(stack, class_name, method_name)
+
+        if idx is None:
+            return None
+
+        span = stack[idx]
+
+        self.stack_var.set(stack[:idx])
+
+        span["duration"] = end - span.pop("start")
+
+        with self.lock:
+            self.update_histogram(
+                class_name, method_name, span["duration"], span["error"]
+            )
+
+            self.spans.append(span)
+
+        return span
+
+    def update_histogram(self, class_name, method_name, duration, error):
+        key = (class_name, method_name)
+
+        histogram = self.histograms.get(key)
+
+        if histogram is None:
+            histogram = self.histograms[key] = {
+                "count": 0,
+                "sum": 0.0,
+                "min": duration,
+                "max": duration,
+                "errors": 0,
+                "bucket_counts": [0] * (len(self.buckets) + 1),
+            }
+
+        histogram["count"] += 1
+
+        histogram["sum"] += duration
+
+        histogram["min"] = min(histogram["min"], duration)
+
+        histogram["max"] = max(histogram["max"], duration)
+
+        histogram["bucket_counts"][bisect.bisect_left(self.buckets, duration)] += 1
+
+        if error is not None:
+            histogram["errors"] += 1
+
+    def record(self, class_name, method_name, duration, error=None):
+        """
+        Method Name :   record
+        Description :   This method adds the duration of a method call to its histogram without opening a span,
+                        used for the calls timed while spans are not recorded
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            self.update_histogram(class_name, method_name, duration, error)
+
+    def get_histograms(self):
+        """
+        Method Name :   get_histograms
+        Description :   This method returns the latency histogram of every traced method, slowest total first
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            histograms = [
+                dict(histogram, class_name=class_name, method_name=method_name)
+                for (class_name, method_name), histogram in self.histograms.items()
+            ]
+
+        for histogram in histograms:
+            histogram["avg"] = histogram["sum"] / histogram["count"]
+
+            histogram["buckets"] = self.buckets
+
+        return sorted(histograms, key=lambda h: h["sum"], reverse=True)
+
+    def get_attributes(self, class_name, method_name):
+        return [
+            {"key": "code.namespace", "value": {"stringValue": class_name}},
+            {"key": "code.function", "value": {"stringValue": method_name}},
+        ]
+
+    def to_otel(self):
+        """
+        Method Name :   to_otel
+        Description :   This method returns the finished spans and the method histograms in the opentelemetry
+                        protocol json layout
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        now = time.time_ns()
+
+        resource = {
+            "attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]
+        }
+
+        scope = {"name": self.class_name}
+
+        with self.lock:
+            spans = list(self.spans)
+
+        otel_spans = []
+
+        for span in spans:
+            otel_span = {
+                "traceId": span["trace_id"],
+                "spanId": span["span_id"],
+                "name": span["class_name"] + "." + span["method_name"],
+                "kind": 1,
+                "startTimeUnixNano": str(span["start_time"]),
+                "endTimeUnixNano": str(
+                    span["start_time"] + int(span["duration"] * 1e9)
+                ),
+                "attributes": self.get_attributes(
+                    span["class_name"], span["method_name"]
+                ),
+                "status": {"code": 1}
+                if span["error"] is None
+                else {"code": 2, "message": span["error"]},
+            }
+
+            if span["parent_span_id"] is not None:
+                otel_span["parentSpanId"] = span["parent_span_id"]
+
+            otel_spans.append(otel_span)
+
+        data_points = [
+            {
+                "attributes": self.get_attributes(h["class_name"], h["method_name"]),
+                "startTimeUnixNano": str(self.started_at),
+                "timeUnixNano": str(now),
+                "count": str(h["count"]),
+                "sum": h["sum"],
+                "min": h["min"],
+                "max": h["max"],
+                "bucketCounts": [str(count) for count in h["bucket_counts"]],
+                "explicitBounds": h["buckets"],
+            }
+            for h in self.get_histograms()
+        ]
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": resource,
+                    "scopeSpans": [{"scope": scope, "spans": otel_spans}],
+                }
+            ],
+            "resourceMetrics": [
+                {
+                    "resource": resource,
+                    "scopeMetrics": [
+                        {
+                            "scope": scope,
+                            "metrics": [
+                                {
+                                    "name": "method.duration",
+                                    "unit": "s",
+                                    "histogram": {
+                                        "dataPoints": data_points,
+                                        "aggregationTemporality": 2,
+                                    },
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+
+    def export(self, file_path=None):
+        """
+        Method Name :   export
+        Description :   This method writes the opentelemetry json of the process to the file, the configured
+                        export file by default, suffixed with the process id
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        file_path = file_path or self.export_file
+
+        if not file_path:
+            return None
+
+        root, ext = os.path.splitext(file_path)
+
+        file_path = f"{root}.{os.getpid()}{ext}"
+
+        with open(file_path, "w") as f:
+            json.dump(self.to_otel(), f)
+
+        return file_path
+
+
+_tracer = None
+
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """
+    Method Name :   get_tracer
+    Description :   This method returns the process wide span tracer
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _tracer
+
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Span_Tracer()
+
+        return _tracer
+
+
+def export_tracer():
+    if _tracer is not None and _tracer.enabled is True:
+        _tracer.export()
+
+
+def _reset_tracer_after_fork():
+    if _tracer is not None:
+        _tracer.lock = threading.Lock()
+
+        _tracer.reset()
+
+
+atexit.register(export_tracer)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_tracer_after_fork)